@@ -2,37 +2,50 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import pandas as pd
 import os
+import sys
 import pickle
-from transformers import AutoTokenizer, AutoModelForCausalLM
-import torch
 from pandas import Timestamp
 from datetime import timedelta
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "ml-backend"))
+from core import load_features, Components, MonthlySales, StoreIndex
+
 # === Initialize Flask App ===
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": ["http://localhost:3000"]}}, supports_credentials=True)
 
-# === Load features.csv ===
 FEATURES_PATH = os.path.join(os.path.dirname(__file__), "features.csv")
-try:
-    df = pd.read_csv(FEATURES_PATH)
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "model.pkl")
+
+
+# === Load features.csv ===
+def load_dataset():
+    store_index = StoreIndex(load_features(FEATURES_PATH))
+    df = store_index.df
     print(f"✅ Loaded features.csv with columns: {list(df.columns)}")
-except Exception as e:
-    print(f"❌ Could not load features.csv: {e}")
-    df = None
+    return {
+        "df": df,
+        "store_index": store_index,
+        "monthly_sales": MonthlySales(store_index, df),
+        "category_features": [
+            col for col in df.columns
+            if col.endswith("_Sales") and col != "Total_Sales"
+        ],
+    }
+
 
 # === Load model.pkl ===
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "model.pkl")
-try:
+def load_forecast_model():
     with open(MODEL_PATH, "rb") as f:
-        model = pickle.load(f)
-    print("✅ Model loaded successfully")
-except Exception as e:
-    print(f"❌ Could not load model.pkl: {e}")
-    model = None
+        return pickle.load(f)
+
 
 # === Load Phi-1.5 with memory-safe config ===
-try:
+def load_phi():
+    # Imported here so torch's import cost is paid in the loader thread too
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    import torch
+
     model_name = "microsoft/phi-1_5"
     tokenizer = AutoTokenizer.from_pretrained(model_name)
     tokenizer.pad_token = tokenizer.eos_token  # Set pad token for batching
@@ -51,12 +64,15 @@ try:
             low_cpu_mem_usage=True,
             device_map={"": "cpu"}  # Force CPU
         )
+    return {"tokenizer": tokenizer, "model": phi_model}
+
 
-    print("✅ Phi-1.5 model loaded with memory-safe config")
-except Exception as e:
-    print(f"❌ Failed to load Phi-1.5: {e}")
-    phi_model = None
-    tokenizer = None
+# === Start loading in the background so the port opens right away ===
+components = Components()
+components.add("data", load_dataset)
+components.add("model", load_forecast_model)
+components.add("llm", load_phi)
+components.start_all()
 
 model_features = [
     'Lag_1', 'Lag_2', 'Lag_3', 'Lag_12',
@@ -67,10 +83,29 @@ model_features = [
     'Profit_Margin', 'Is_Promotion_Month', 'Average_Price'
 ]
 
-category_features = [
-    col for col in df.columns
-    if col.endswith("_Sales") and col != "Total_Sales" and col in df.columns
-]
+
+def unavailable(*names):
+    """503 response listing the components a route needs that aren't ready yet, else None."""
+    pending = components.not_ready(*names)
+    if not pending:
+        return None
+    return jsonify({
+        "error": f"Not ready: {', '.join(pending)}",
+        "components": {name: components[name].describe() for name in pending},
+    }), 503
+
+
+@app.route("/healthz")
+def healthz():
+    # Liveness: the process is up and serving, whatever is still loading
+    return jsonify({"status": "ok", "components": components.describe()})
+
+
+@app.route("/readyz")
+def readyz():
+    pending = components.not_ready()
+    body = {"ready": not pending, "components": components.describe()}
+    return jsonify(body), 503 if pending else 200
 
 
 @app.route("/")
@@ -79,10 +114,12 @@ def home():
 
 @app.route("/api/stores", methods=["GET"])
 def get_stores():
+    busy = unavailable("data")
+    if busy:
+        return busy
+
     try:
-        if df is None:
-            print("❌ DataFrame is None")
-            return jsonify({"error": "features.csv not loaded"}), 500
+        df = components["data"].value["df"]
 
         print(f"✅ DataFrame loaded with columns: {list(df.columns)}")
 
@@ -128,33 +165,34 @@ def predict():
 
 
 
-        if df is None or model is None:
-            return jsonify({"error": "Model or dataset not available"}), 500
+        busy = unavailable("data", "model")
+        if busy:
+            return busy
 
-        store_df = df[df["Store Number"] == store].copy()
+        data_bundle = components["data"].value
+        store_index = data_bundle["store_index"]
+        monthly_sales = data_bundle["monthly_sales"]
+        category_features = data_bundle["category_features"]
+        model = components["model"].value
+
+        store_df = store_index.frame(store).copy()
         if store_df.empty:
             return jsonify({"error": f"No data found for store {store}"}), 404
 
         timeline = []
 
         # Historical sales (last 6 weeks)
-        # Convert date to datetime
-        store_df['Date'] = pd.to_datetime(store_df['Date'])
-
-        weekly_sales = store_df.groupby(pd.Grouper(key="Date", freq="MS"))["Total_Sales"].sum().reset_index()
-
-
+        # Monthly totals come from the store x month table built at load
+        month_starts, month_totals = monthly_sales.store_series(store) or ([], [])
 
         # Select last 6 weeks
-        history_rows = weekly_sales.tail(6)
-
-        for i, row in enumerate(history_rows.itertuples(), start=-6):
+        for i, (month_start, total) in enumerate(zip(month_starts[-6:], month_totals[-6:]), start=-6):
             timeline.append({
                 "week": i,
                 "type": "actual",
-                "value": round(float(row.Total_Sales)),
-                "month_start": row.Date.strftime("%Y-%m-%d"),
-                "label": row.Date.strftime("%B %Y")  # e.g., "January 2021"
+                "value": round(float(total)),
+                "month_start": month_start.strftime("%Y-%m-%d"),
+                "label": month_start.strftime("%B %Y")  # e.g., "January 2021"
             })
 
 
@@ -200,7 +238,7 @@ def predict():
             lag_values.append(y)
 
             category_breakdown = {
-                cat: round(share * y, 2)
+                cat: round(float(share * y), 2)
                 for cat, share in category_shares.items()
                 if share * y > 10 # optional filter to ignore tiny numbers 
             }
@@ -232,8 +270,13 @@ def predict():
 
 @app.route("/api/explain_forecast", methods=["POST"])
 def explain_forecast():
-    if not phi_model or not tokenizer:
-        return jsonify({"error": "Phi-1.5 model not available"}), 500
+    busy = unavailable("llm")
+    if busy:
+        return busy
+
+    import torch
+    tokenizer = components["llm"].value["tokenizer"]
+    phi_model = components["llm"].value["model"]
 
     try:
         data = request.get_json()
@@ -1,12 +1,17 @@
 import pandas as pd
 import numpy as np
+import os
+import sys
 import pickle
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ml-backend"))
+from core import load_features
+
 # Load model & data once here
 with open("model.pkl", "rb") as f:
     model = pickle.load(f)
 
-df = pd.read_csv("features.csv")
+df = load_features("features.csv")
 
 # Ensure Actionable Features Exist
 if 'Profit_Margin' not in df.columns:
@@ -0,0 +1,129 @@
+"""ASGI entry point: ``uvicorn asgi:app --host 0.0.0.0 --port 8000``.
+
+Under wsgi.py every /api/explain_forecast or /api/compare_store request holds
+a whole worker for as long as the LLM takes to answer (seconds), so a few
+slow LLM calls are enough to queue /api/predict behind them. Here the two
+LLM routes are coroutines: the request to the LLM is awaited on one shared
+httpx.AsyncClient, and a waiting call costs a socket, not a worker.
+
+Everything else is the Flask app from main.create_app, run through a2wsgi on
+a pool of ASGI_WSGI_THREADS threads, so forecast work (CPU-bound, and NumPy /
+XGBoost release the GIL) stays off the event loop. The pool threads are
+never tied up by LLM calls.
+
+LLM_MAX_CONNECTIONS caps concurrent connections to the LLM endpoint.
+"""
+import contextlib
+import logging
+import os
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Mount, Route
+
+from core.llm import LLMError, async_chat_completion, compare_payload, explain_payload
+from core.structured_log import REQUEST_ID_HEADER, bind_request
+from main import create_app, start_background_tasks
+
+log = logging.getLogger("asgi")
+
+flask_app = create_app()
+snapshots = flask_app.extensions["forecast"]["snapshots"]
+
+
+def bind(request: Request):
+    # Each request runs in its own task, so the binding ends with it
+    return bind_request(request.url.path, request.headers.get(REQUEST_ID_HEADER))
+
+
+def versioned(body, status=200, snapshot=None, request_id=None):
+    # Same X-Data-Version and X-Request-ID headers the Flask routes send
+    snapshot = snapshot or snapshots.current()
+    headers = {"X-Data-Version": snapshot.version}
+    if request_id:
+        headers[REQUEST_ID_HEADER] = request_id
+    return JSONResponse(body, status_code=status, headers=headers)
+
+
+async def explain_forecast(request: Request):
+    request_id = bind(request)
+    try:
+        data = await request.json()
+        timeline = data.get("timeline")
+        if not timeline:
+            return versioned({"error": "No forecast provided"}, 400, request_id=request_id)
+
+        payload = explain_payload(timeline)
+        if payload is None:
+            return versioned({"summary": "No forecast data available for explanation."}, request_id=request_id)
+
+        explanation = await async_chat_completion(request.app.state.llm_client, payload)
+        return versioned({"summary": explanation}, request_id=request_id)
+
+    except LLMError as e:
+        log.error("❌ Groq API error: %s", e.text)
+        return versioned({"error": "Groq model request failed"}, 500, request_id=request_id)
+    except Exception as e:
+        log.exception("❌ Forecast explanation error: %s", e)
+        return versioned({"error": "Failed to generate explanation"}, 500, request_id=request_id)
+
+
+async def compare_store(request: Request):
+    if request.method == "OPTIONS":
+        return Response(status_code=204)  # Preflight support
+
+    # 📌 Pinned once, like g.snapshot in the Flask routes
+    snapshot = snapshots.current()
+    request_id = bind(request)
+    try:
+        data = await request.json()
+        store_number = data.get("store")
+        forecast_avg = data.get("forecast_avg")
+        if not store_number or forecast_avg is None:
+            msg = f"⚠️ Missing required inputs: store={store_number}, forecast_avg={forecast_avg}"
+            return versioned({"error": msg}, 400, snapshot, request_id)
+
+        payload = compare_payload(store_number, forecast_avg, snapshot.monthly_sales.regional_average())
+        ai_output = await async_chat_completion(request.app.state.llm_client, payload)
+        return versioned({"summary": ai_output}, snapshot=snapshot, request_id=request_id)
+
+    except LLMError as e:
+        log.error("❌ Error from Groq API: %s", e.text)
+        return versioned({"error": e.text}, 500, snapshot, request_id)
+    except Exception as e:
+        log.exception("🔥 Exception in /api/compare_store: %s", e)
+        return versioned({"error": str(e)}, 500, snapshot, request_id)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    limits = httpx.Limits(max_connections=int(os.environ.get("LLM_MAX_CONNECTIONS", 100)))
+    async with httpx.AsyncClient(limits=limits) as client:
+        app.state.llm_client = client
+        start_background_tasks(flask_app)
+        yield
+
+
+# The Flask app handles CORS for everything it serves; only the native routes need it here
+cors = [Middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["X-Data-Version", REQUEST_ID_HEADER],
+)]
+
+app = Starlette(
+    routes=[
+        Route("/api/explain_forecast", explain_forecast, methods=["POST"], middleware=cors),
+        Route("/api/compare_store", compare_store, methods=["POST", "OPTIONS"], middleware=cors),
+        Mount("/", WSGIMiddleware(flask_app, workers=int(os.environ.get("ASGI_WSGI_THREADS", 8)))),
+    ],
+    lifespan=lifespan,
+)
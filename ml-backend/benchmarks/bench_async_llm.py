@@ -0,0 +1,153 @@
+"""Load test mixing /api/predict with slow LLM-backed /api/explain_forecast.
+
+Starts benchmarks/mock_llm_server.py (answers after --llm-delay seconds) and
+points the backend at it with LLM_API_URL. Each serving mode is then started
+and driven for --seconds by --predict-clients clients posting /api/predict
+in a loop, alongside --explain-clients clients posting /api/explain_forecast.
+Each mode also gets a predict-only run as a baseline.
+
+Serving modes:
+  wsgi-sync     gunicorn wsgi:app, --workers sync workers
+  wsgi-gthread  gunicorn wsgi:app, --workers gthread workers x --threads
+  asgi          uvicorn asgi:app, one process; LLM calls awaited, Flask on a
+                thread pool of ASGI_WSGI_THREADS
+
+Usage:
+    python benchmarks/bench_async_llm.py [--seconds 10] [--explain-clients 16] [--llm-delay 1.0]
+"""
+import argparse
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from bench_wsgi_workers import BACKEND_DIR, free_port, request, wait_ready
+
+TIMELINE = [
+    {"type": "actual", "label": "May 2024", "value": 18234.5},
+    {"type": "forecast", "label": "June 2024", "value": 18876.1},
+    {"type": "forecast", "label": "July 2024", "value": 19102.7},
+]
+
+
+def start(mode, port, args, llm_url):
+    env = {**os.environ, "LLM_API_URL": llm_url, "RESULT_CACHE_MB": "0"}
+    if mode == "asgi":
+        env["ASGI_WSGI_THREADS"] = str(args.workers * args.threads)
+        cmd = [sys.executable, "-m", "uvicorn", "asgi:app", "--host", "127.0.0.1", "--port", str(port),
+               "--log-level", "warning", "--no-access-log"]
+    else:
+        env.update({
+            "WEB_BIND": f"127.0.0.1:{port}",
+            "WEB_WORKERS": str(args.workers),
+            "WEB_WORKER_CLASS": "sync" if mode == "wsgi-sync" else "gthread",
+            "WEB_THREADS": str(args.threads),
+            "WEB_TIMEOUT": "120",
+        })
+        cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_ready(port, proc)
+    return proc
+
+
+def drive(port, stores, args, explain_clients):
+    stop = time.perf_counter() + args.seconds
+    predict_latencies, explain_done, failures = [], [0], [0]
+    lock = threading.Lock()
+
+    def predict_client(i):
+        rng = random.Random(i)
+        while time.perf_counter() < stop:
+            # Every fourth request asks for non-default intervals, so it is forecast live
+            body = {"store": rng.choice(stores), "months": rng.randint(1, 12)}
+            if rng.random() < 0.25:
+                body["paths"] = 200
+            t0 = time.perf_counter()
+            try:
+                status = request(port, "POST", "/api/predict", body)
+            except OSError:
+                status = 599  # timed out behind LLM calls
+            with lock:
+                predict_latencies.append(time.perf_counter() - t0)
+                failures[0] += status >= 500
+
+    def explain_client():
+        while time.perf_counter() < stop:
+            try:
+                status = request(port, "POST", "/api/explain_forecast", {"timeline": TIMELINE})
+            except OSError:
+                status = 599
+            with lock:
+                explain_done[0] += 1
+                failures[0] += status != 200
+
+    threads = [threading.Thread(target=predict_client, args=(i,)) for i in range(args.predict_clients)]
+    threads += [threading.Thread(target=explain_client) for _ in range(explain_clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    latencies = sorted(predict_latencies)
+    return {
+        "predict_rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1e3 if latencies else float("nan"),
+        "p99": latencies[int(len(latencies) * 0.99)] * 1e3 if latencies else float("nan"),
+        "explain_rps": explain_done[0] / elapsed,
+        "failures": failures[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default="wsgi-sync,wsgi-gthread,asgi")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--predict-clients", type=int, default=4)
+    parser.add_argument("--explain-clients", type=int, default=16)
+    parser.add_argument("--llm-delay", type=float, default=1.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    from core.snapshot import load_snapshot
+    snapshot = load_snapshot(os.path.join(BACKEND_DIR, "features.csv"), os.path.join(BACKEND_DIR, "model.pkl"))
+    stores = [int(s) for s in snapshot.store_index.stores]
+    del snapshot
+
+    llm_port = free_port()
+    llm = subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, "benchmarks", "mock_llm_server.py"),
+         "--port", str(llm_port), "--delay", str(args.llm_delay)],
+        stdout=subprocess.DEVNULL,
+    )
+    llm_url = f"http://127.0.0.1:{llm_port}/v1/chat/completions"
+    try:
+        print(f"📊 {args.predict_clients} predict clients, mock LLM answering in {args.llm_delay:g}s, "
+              f"{args.seconds:g}s per run, {os.cpu_count()} CPU(s)")
+        print(f"{'mode':<14}{'explain clients':>16}{'predict/s':>11}{'p50 ms':>9}{'p99 ms':>10}{'explain/s':>11}")
+        for mode in args.modes.split(","):
+            port = free_port()
+            proc = start(mode, port, args, llm_url)
+            try:
+                for explain_clients in (0, args.explain_clients):
+                    r = drive(port, stores, args, explain_clients)
+                    print(f"{mode:<14}{explain_clients:>16}{r['predict_rps']:>11.0f}{r['p50']:>9.1f}{r['p99']:>10.1f}"
+                          f"{r['explain_rps']:>11.1f}" + (f"  ({r['failures']} failed)" if r["failures"] else ""),
+                          flush=True)
+            finally:
+                proc.send_signal(signal.SIGTERM)
+                proc.wait(timeout=60)
+    finally:
+        llm.terminate()
+        llm.wait()
+
+
+if __name__ == "__main__":
+    main()
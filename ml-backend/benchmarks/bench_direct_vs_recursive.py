@@ -0,0 +1,127 @@
+"""Backtest and latency comparison of the forecasting strategies.
+
+The last --holdout months of features.csv are held out. A recursive model (the
+model.pkl setup: row features -> that row's Total_Sales) and the direct
+per-horizon models are both trained on the earlier rows with model.pkl's
+hyperparameters. Then every store is forecast from its last training row and
+scored against the held-out monthly totals. The recursive strategy is run
+both with rolling feature state (the default) and with the old frozen
+features. Latency is measured on the same snapshot for one store and for all
+stores.
+
+Usage:
+    python benchmarks/bench_direct_vs_recursive.py [--holdout 12]
+"""
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import ForecastEngine, MonthlySales, StoreIndex, load_features  # noqa: E402
+from core.direct_forecast import train_direct_models  # noqa: E402
+from core.forecast_engine import month_starts  # noqa: E402
+from core.schema import MODEL_FEATURES  # noqa: E402
+from core.snapshot import Snapshot  # noqa: E402
+
+
+def backtest_snapshot(train, params, horizons):
+    from xgboost import XGBRegressor
+
+    recursive = XGBRegressor(**params).fit(train[MODEL_FEATURES], train["Total_Sales"])
+    direct = train_direct_models(train, MODEL_FEATURES, horizons, params)
+    index = StoreIndex(train)
+    return Snapshot(
+        index.df, recursive, "backtest", "backtest",
+        store_index=index, monthly_sales=MonthlySales(index, index.df), direct_models=direct,
+    )
+
+
+def actual_totals(full_sales, batch, horizons):
+    """Held-out monthly Total_Sales aligned with the forecast months (NaN if missing)."""
+    actual = np.full((len(batch), horizons), np.nan)
+    for row, store in enumerate(batch.stores):
+        pos = full_sales.store_rows[store]
+        for h, month in enumerate(month_starts(batch.last_dates[row], horizons)):
+            col = full_sales.month_position(month)
+            if 0 <= col < full_sales.totals.shape[1] and full_sales.has_rows[pos, col]:
+                actual[row, h] = full_sales.totals[pos, col]
+    return actual
+
+
+def median_ms(fn, repeat):
+    fn()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--holdout", type=int, default=12, help="months held out and forecast")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    df = load_features(args.features)
+    with open(args.model, "rb") as f:
+        params = pickle.load(f).get_params()
+
+    last_month = df["Date"].max().replace(day=1)
+    cutoff = last_month - pd.DateOffset(months=args.holdout - 1)
+    snapshot = backtest_snapshot(df[df["Date"] < cutoff], params, args.holdout)
+    full_index = StoreIndex(df)
+    full_sales = MonthlySales(full_index, full_index.df)
+
+    engine = ForecastEngine(MODEL_FEATURES)
+    variants = {
+        "frozen": (ForecastEngine(MODEL_FEATURES, rolling_state=False), "recursive"),
+        "rolling": (engine, "recursive"),
+        "direct": (engine, "direct"),
+    }
+    stores = [int(s) for s in snapshot.store_index.stores]
+    results = {}
+    for name, (variant_engine, strategy) in variants.items():
+        batch, values = variant_engine.forecast(snapshot, stores, args.holdout, strategy)
+        results[name] = (values, actual_totals(full_sales, batch, args.holdout))
+
+    print(f"📊 Backtest: {len(stores)} stores, trained before {cutoff:%Y-%m}, forecasting {args.holdout} months")
+    print("   recursive with frozen features (old), recursive with rolling state, direct")
+    print(f"{'h':>3}" + "".join(f"{name + ' MAE':>14}" for name in variants) + "".join(f"{name + ' MAPE':>15}" for name in variants))
+    summary = {}
+    for h in range(args.holdout):
+        maes, mapes = [], []
+        for name in variants:
+            values, actual = results[name]
+            known = ~np.isnan(actual[:, h])
+            err = np.abs(values[known, h] - actual[known, h])
+            maes.append(err.mean())
+            mapes.append((err / np.abs(actual[known, h])).mean() * 100)
+            summary.setdefault(name, []).append((maes[-1], mapes[-1]))
+        print(f"{h + 1:>3}" + "".join(f"{mae:>14,.0f}" for mae in maes) + "".join(f"{mape:>14.1f}%" for mape in mapes))
+    for name, scores in summary.items():
+        print(f"{name:<10} mean MAE {np.mean([s[0] for s in scores]):,.0f}, mean MAPE {np.mean([s[1] for s in scores]):.1f}%")
+
+    print(f"\n⏱️ Latency, {args.holdout}-month forecast (median of {args.repeat})")
+    print(f"{'':<12}{'1 store ms':>12}{'all stores ms':>15}")
+    for name, (variant_engine, strategy) in variants.items():
+        def run(subset):
+            return variant_engine.forecast(snapshot, subset, args.holdout, strategy)
+        one = median_ms(lambda: run(stores[:1]), args.repeat)
+        every = median_ms(lambda: run(stores), max(args.repeat // 10, 3))
+        print(f"{name:<12}{one:>12.2f}{every:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
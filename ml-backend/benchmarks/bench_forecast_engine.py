@@ -0,0 +1,58 @@
+"""All-stores forecast: one engine call per store vs one batched engine call.
+
+Usage:
+    python benchmarks/bench_forecast_engine.py [--months 12]
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import ForecastEngine  # noqa: E402
+from core.schema import MODEL_FEATURES  # noqa: E402
+from core.snapshot import load_snapshot  # noqa: E402
+
+
+class CountingModel:
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return self.model.predict(X)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--months", type=int, default=12)
+    args = parser.parse_args()
+
+    snapshot = load_snapshot(args.features, args.model)
+    stores = [int(s) for s in snapshot.store_index.stores]
+    engine = ForecastEngine(MODEL_FEATURES)
+    model = CountingModel(snapshot.model)
+
+    t0 = time.perf_counter()
+    for store in stores:
+        engine.predict(model, engine.prepare(snapshot, [store]), args.months)
+    per_store_s, per_store_calls = time.perf_counter() - t0, model.calls
+
+    model.calls = 0
+    t0 = time.perf_counter()
+    engine.predict(model, engine.prepare(snapshot, stores), args.months)
+    batched_s, batched_calls = time.perf_counter() - t0, model.calls
+
+    print(f"📊 {len(stores):,} stores x {args.months} months")
+    print(f"{'mode':<12}{'seconds':>10}{'predict calls':>15}")
+    print(f"{'per store':<12}{per_store_s:>10.3f}{per_store_calls:>15,}")
+    print(f"{'batched':<12}{batched_s:>10.3f}{batched_calls:>15,}")
+
+
+if __name__ == "__main__":
+    main()
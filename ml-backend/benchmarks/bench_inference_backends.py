@@ -0,0 +1,86 @@
+"""Parity and latency of the INFERENCE_BACKEND choices.
+
+Every backend is first checked against ``model.predict`` on all rows of
+features.csv (with some values knocked out to NaN so missing-value routing is
+covered too); the script exits non-zero on any mismatch. Then predict latency
+is timed per backend at a few batch sizes: 1 row is one step of a single-store
+forecast, larger batches are all-stores steps.
+
+Usage:
+    python benchmarks/bench_inference_backends.py [--rows 1,16,300,5000] [--threads 1]
+"""
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import load_features  # noqa: E402
+from core.inference import INFERENCE_BACKENDS, CompiledEnsemble, array_predictor  # noqa: E402
+from core.schema import MODEL_FEATURES  # noqa: E402
+
+
+def time_us(fn, repeat):
+    fn()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--rows", default="1,16,300,5000", help="comma-separated batch sizes")
+    parser.add_argument("--threads", type=int, help="INFERENCE_THREADS for the native backend")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds of timing per backend and size")
+    args = parser.parse_args()
+
+    df = load_features(args.features)
+    with open(args.model, "rb") as f:
+        model = pickle.load(f)
+
+    X = np.array(df.reindex(columns=MODEL_FEATURES).fillna(0).to_numpy(dtype=np.float64))
+    X[::7, 0] = np.nan
+    X[::11, len(MODEL_FEATURES) // 2] = np.nan
+    expected = np.asarray(model.predict(pd.DataFrame(X, columns=MODEL_FEATURES)), dtype=np.float64)
+
+    predictors = {backend: array_predictor(model, MODEL_FEATURES, backend=backend, threads=args.threads)
+                  for backend in INFERENCE_BACKENDS}
+    # The compiled predictor hands large batches to inplace_predict, so check the
+    # evaluator itself on the whole matrix as well
+    checks = {**predictors, "compiled (evaluator only)": CompiledEnsemble.from_xgboost(model).predict}
+    for name, fn in checks.items():
+        got = fn(X)
+        diff = np.abs(got - expected).max()
+        print(f"🔎 {name:<26} parity on {len(X):,} rows: {'exact' if diff == 0 else f'max abs diff {diff:.3g}'}")
+        if not np.allclose(got, expected, rtol=1e-6):
+            sys.exit(f"❌ {name} disagrees with model.predict")
+
+    sizes = [int(n) for n in args.rows.split(",")]
+    print(f"\n⏱️ Median predict latency, us (threads={args.threads or 'default'})")
+    print(f"{'rows':>6}" + "".join(f"{backend:>12}" for backend in INFERENCE_BACKENDS))
+    for n in sizes:
+        batch = np.ascontiguousarray(X[:n])
+        cells = []
+        for backend in INFERENCE_BACKENDS:
+            fn = predictors[backend]
+            t0 = time.perf_counter()
+            fn(batch)
+            repeat = max(5, int(args.budget / max(time.perf_counter() - t0, 1e-6)))
+            cells.append(time_us(lambda: fn(batch), min(repeat, 5000)))
+        print(f"{n:>6}" + "".join(f"{us:>12.1f}" for us in cells))
+
+
+if __name__ == "__main__":
+    main()
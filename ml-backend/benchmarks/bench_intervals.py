@@ -0,0 +1,97 @@
+"""Latency of simulation-based prediction intervals.
+
+Times ForecastEngine.simulate for one store over a range of path counts, with
+all paths batched into one predict call per step, against running the same
+paths one recursion at a time. Also times the all-stores simulation the
+forecast table runs at build time. Needs residuals.npy (build_residuals.py);
+a placeholder residual store is used if it is missing. Exits non-zero if 1000
+paths go over --budget-ms.
+
+Usage:
+    python benchmarks/bench_intervals.py [--months 12] [--budget-ms 100]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import ForecastEngine  # noqa: E402
+from core.intervals import DEFAULT_PATHS, DEFAULT_QUANTILES, residual_draws  # noqa: E402
+from core.schema import MODEL_FEATURES  # noqa: E402
+from core.snapshot import load_snapshot  # noqa: E402
+
+
+def median_ms(fn, repeat):
+    fn()
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--paths", default="100,500,1000,5000", help="comma-separated path counts")
+    parser.add_argument("--budget-ms", type=float, default=100.0, help="latency budget for 1000 paths, one store")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    snapshot = load_snapshot(args.features, args.model)
+    residuals = snapshot.residuals
+    if residuals is None:
+        print("⚠️ No residuals.npy next to the model; timing with placeholder ratios")
+        residuals = np.random.default_rng(0).normal(1.0, 0.05, 1000)
+
+    engine = ForecastEngine(MODEL_FEATURES)
+    store = int(snapshot.store_index.stores[0])
+    batch = engine.prepare(snapshot, [store])
+    predict_fn = engine._predict_fn(snapshot.model)
+
+    def simulate(paths):
+        return engine.simulate(snapshot.model, batch, args.months, residuals, paths, DEFAULT_QUANTILES)
+
+    def path_by_path(paths):
+        # The same simulation with one recursion per path
+        ratios = residual_draws(store, residuals, paths, args.months)
+        runs = [engine._recurse(predict_fn, batch, args.months, ratios[p:p + 1]) for p in range(paths)]
+        return np.quantile(np.concatenate(runs), DEFAULT_QUANTILES, axis=0).T[None]
+
+    point = median_ms(lambda: engine.predict(snapshot.model, batch, args.months), args.repeat)
+    print(f"📊 store {store}, {args.months} months, quantiles {DEFAULT_QUANTILES}, median ms")
+    print(f"   point forecast (no intervals): {point:.2f}")
+    print(f"{'paths':>7}{'batched':>10}{'per path':>10}")
+    over_budget = False
+    for paths in (int(p) for p in args.paths.split(",")):
+        batched = median_ms(lambda: simulate(paths), args.repeat)
+        looped = ""
+        if paths <= 1000:
+            assert np.allclose(simulate(paths), path_by_path(paths))
+            looped = f"{median_ms(lambda: path_by_path(paths), 3):>10.1f}"
+        print(f"{paths:>7}{batched:>10.1f}{looped}")
+        if paths == 1000 and batched > args.budget_ms:
+            over_budget = True
+
+    stores = [int(s) for s in snapshot.store_index.stores]
+    every = engine.prepare(snapshot, stores)
+    t0 = time.perf_counter()
+    engine.simulate(snapshot.model, every, args.months, residuals, DEFAULT_PATHS, DEFAULT_QUANTILES)
+    print(f"\n🗂️ All {len(stores)} stores x {DEFAULT_PATHS} paths (an all-stores batch with intervals): "
+          f"{time.perf_counter() - t0:.2f}s")
+
+    if over_budget:
+        sys.exit(f"❌ 1000 paths took longer than the {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Response-building cost of a 200-store /api/predict/batch body.
+
+Forecasts --stores stores once (model time is not what is measured here),
+then times the two stages that turn the forecasts into response bytes:
+
+  build   actual_timeline + forecast_timeline for every store, as the batch
+          route does
+  encode  the {"forecasts": [...], "missing": []} body to JSON bytes
+
+Encoding is timed with each JSON_ENCODER (see core/json_codec.py). "legacy"
+is the old path for reference: every value converted with float()/round()
+and month labels built with pd.DateOffset, then encoded with the stdlib.
+The end-to-end route is timed too, asking for default intervals, through
+Flask's test client; above 50 stores its body is streamed.
+
+Usage:
+    python benchmarks/bench_json_encoding.py [--stores 200] [--months 12] [--repeat 20]
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import json_codec  # noqa: E402
+from core.forecast_engine import RECENT_START, actual_timeline, forecast_timeline  # noqa: E402
+
+
+def legacy_entries(snapshot, batch, values, row, intervals):
+    """The batch route's store entry as built before NumPy values went to the encoder."""
+    month_starts, month_totals = snapshot.monthly_sales.store_series(batch.stores[row], since=RECENT_START)
+    timeline = [
+        {"week": i, "type": "actual", "value": round(float(total)),
+         "month_start": start.strftime("%Y-%m-%d"), "label": start.strftime("%B %Y")}
+        for i, (start, total) in enumerate(zip(month_starts[-6:], month_totals[-6:]), start=-6)
+    ]
+    first = pd.Timestamp(batch.last_dates[row]).replace(day=1)
+    shares = batch.category_shares[row]
+    for i, y in enumerate(values[row], start=1):
+        start = (first + pd.DateOffset(months=i)).replace(day=1)
+        y = float(y)
+        lower, upper = float(intervals[row, i - 1, 0]), float(intervals[row, i - 1, -1])
+        timeline.append({
+            "month": i, "type": "forecast", "value": round(y, 2), "lower": round(lower, 2), "upper": round(upper, 2),
+            "category_breakdown": {
+                cat: round(float(share * y), 2) for cat, share in zip(batch.category_names, shares) if share * y > 10
+            },
+            "month_start": start.strftime("%Y-%m-%d"), "label": start.strftime("%B %Y"),
+        })
+    return {"store": batch.stores[row], "timeline": timeline}
+
+
+def entries(snapshot, batch, values, row, intervals):
+    month_starts, month_totals = snapshot.monthly_sales.store_series(batch.stores[row], since=RECENT_START)
+    timeline = actual_timeline(month_starts, month_totals)
+    timeline.extend(forecast_timeline(batch, values, row, intervals))
+    return {"store": batch.stores[row], "timeline": timeline}
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stores", type=int, default=200)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        import main as backend
+
+        app = backend.create_app()
+        context = app.extensions["forecast"]
+        snapshot = context["snapshots"].current()
+        engine = context["forecast_engine"]
+        stores = [int(s) for s in snapshot.store_index.stores][:args.stores]
+        batch, values = engine.forecast(snapshot, stores, args.months)
+        intervals = engine.intervals(snapshot, batch, args.months)
+        if intervals is None:
+            raise SystemExit("residuals.npy is needed for interval bounds (see build_residuals.py)")
+        rows = range(len(batch))
+
+        legacy_build, legacy_body = timed(
+            lambda: {"forecasts": [legacy_entries(snapshot, batch, values, r, intervals) for r in rows], "missing": []},
+            args.repeat,
+        )
+        build, body = timed(
+            lambda: {"forecasts": [entries(snapshot, batch, values, r, intervals) for r in rows], "missing": []},
+            args.repeat,
+        )
+        legacy_encode, legacy_bytes = timed(
+            lambda: json.dumps(legacy_body, sort_keys=True, separators=(",", ":")).encode(), args.repeat
+        )
+        encoders = [name for name in json_codec.ENCODERS if name != "orjson" or json_codec.orjson is not None]
+        encoded = {name: timed(lambda: json_codec.dumps(body, name), args.repeat) for name in encoders}
+        if any(json.loads(data) != json.loads(legacy_bytes) for _, data in encoded.values()):
+            raise SystemExit("encoded bodies differ from the legacy body")
+
+        client = app.test_client()
+        request = {"stores": stores, "months": args.months, "intervals": True}
+        route_ms, _ = timed(lambda: client.post("/api/predict/batch", json=request).get_data(), max(args.repeat // 4, 3))
+
+    print(f"📊 {len(batch)} stores x {args.months} months, {len(legacy_bytes):,} bytes, median of {args.repeat}")
+    print(f"{'path':<18}{'build ms':>10}{'encode ms':>11}{'total ms':>10}")
+    print(f"{'legacy + stdlib':<18}{legacy_build:>10.1f}{legacy_encode:>11.1f}{legacy_build + legacy_encode:>10.1f}")
+    for name, (encode_ms, _) in encoded.items():
+        print(f"{'numpy + ' + name:<18}{build:>10.1f}{encode_ms:>11.1f}{build + encode_ms:>10.1f}")
+    print(f"\n🌐 /api/predict/batch end to end ({json_codec.resolve_encoder()}): {route_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
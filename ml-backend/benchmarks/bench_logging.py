@@ -0,0 +1,104 @@
+"""Per-request cost of route logging on /api/predict.
+
+Each configuration runs in a fresh process whose stdout is a real file
+(log output goes wherever stdout does). The process replays --requests
+/api/predict calls through Flask's test client, a --live fraction of them
+forecast live (non-default paths, result cache off) and the rest served
+from the forecast table; both paths log. It reports the mean server time
+per request and the log bytes written per request.
+
+Configurations (environment of the child process):
+  info            LOG_LEVEL=INFO (the default)
+  debug           LOG_LEVEL=DEBUG, every request's dumps written
+  debug-sampled   LOG_LEVEL=DEBUG with LOG_SAMPLE_RATES=/api/predict=0.01
+  debug-text      LOG_LEVEL=DEBUG, LOG_FORMAT=text
+
+Usage:
+    python benchmarks/bench_logging.py [--requests 2000] [--live 0.2] [--configs info,debug,debug-sampled]
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CONFIGS = {
+    "info": {"LOG_LEVEL": "INFO"},
+    "debug": {"LOG_LEVEL": "DEBUG"},
+    "debug-sampled": {"LOG_LEVEL": "DEBUG", "LOG_SAMPLE_RATES": "/api/predict=0.01"},
+    "debug-text": {"LOG_LEVEL": "DEBUG", "LOG_FORMAT": "text"},
+}
+
+
+def child(requests, live, result_path):
+    sys.path.insert(0, BACKEND_DIR)
+    import main as backend
+
+    app = backend.create_app()
+    client = app.test_client()
+    stores = [int(s) for s in app.extensions["forecast"]["snapshots"].current().store_index.stores]
+    rng = random.Random(0)
+    bodies = []
+    for _ in range(requests):
+        body = {"store": rng.choice(stores), "months": rng.randint(1, 12)}
+        if rng.random() < live:
+            body["paths"] = 100
+        bodies.append(body)
+
+    sys.stdout.flush()
+    start_bytes = os.fstat(sys.stdout.fileno()).st_size
+    elapsed = 0.0
+    for body in bodies:
+        t0 = time.perf_counter()
+        resp = client.post("/api/predict", json=body)
+        resp.get_data()
+        elapsed += time.perf_counter() - t0
+        assert resp.status_code in (200, 400, 404), resp.status_code
+
+    # Let a background log writer catch up before counting bytes
+    for handler in __import__("logging").getLogger().handlers:
+        handler.close()
+    sys.stdout.flush()
+    with open(result_path, "w") as f:
+        json.dump({
+            "us_per_request": elapsed / requests * 1e6,
+            "log_bytes_per_request": (os.fstat(sys.stdout.fileno()).st_size - start_bytes) / requests,
+        }, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--live", type=float, default=0.2, help="fraction of requests forecast live")
+    parser.add_argument("--configs", default="info,debug,debug-sampled,debug-text")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.requests, args.live, args.child)
+        return
+
+    print(f"📊 /api/predict, {args.requests} requests per configuration ({args.live:.0%} live), stdout to a file")
+    print(f"{'config':<15}{'µs/request':>12}{'log bytes/request':>19}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.configs.split(","):
+            result_path = os.path.join(tmp, f"{name}.json")
+            with open(os.path.join(tmp, f"{name}.log"), "w") as out:
+                env = {**os.environ, "RESULT_CACHE_MB": "0", **CONFIGS[name]}
+                subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--requests", str(args.requests),
+                     "--live", str(args.live), "--child", result_path],
+                    cwd=BACKEND_DIR, env=env, stdout=out, check=True,
+                )
+            with open(result_path) as f:
+                r = json.load(f)
+            print(f"{name:<15}{r['us_per_request']:>12.0f}{r['log_bytes_per_request']:>19.0f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Throughput and latency of live single-store forecasts with micro-batching.
+
+--threads request threads each run 12-month single-store forecasts back to
+back through one ForecastEngine, as concurrent live /api/predict requests do.
+The run is repeated without a batcher and with one per --max-ms setting.
+Forecasts are checked to match the unbatched ones.
+
+Usage:
+    python benchmarks/bench_micro_batch.py [--threads 1,4,16,32] [--max-ms 1,2] [--seconds 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import ForecastEngine, MicroBatcher  # noqa: E402
+from core.schema import MODEL_FEATURES  # noqa: E402
+from core.snapshot import load_snapshot  # noqa: E402
+
+
+def run(engine, snapshot, stores, threads, seconds, months):
+    """Forecasts per second and per-forecast latencies with ``threads`` concurrent callers."""
+    latencies = [[] for _ in range(threads)]
+    stop = time.perf_counter() + seconds
+    start = threading.Barrier(threads)
+
+    def worker(i):
+        start.wait()
+        k = i
+        while time.perf_counter() < stop:
+            store = stores[k % len(stores)]
+            k += threads
+            t0 = time.perf_counter()
+            engine.forecast(snapshot, [store], months)
+            latencies[i].append(time.perf_counter() - t0)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - t0
+    flat = sorted(x for per_thread in latencies for x in per_thread)
+    return len(flat) / elapsed, statistics.median(flat) * 1e3, flat[int(len(flat) * 0.99)] * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--threads", default="1,4,16,32")
+    parser.add_argument("--max-ms", default="1,2", help="comma-separated MICRO_BATCH_MAX_MS values")
+    parser.add_argument("--max-rows", type=int, default=256)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    snapshot = load_snapshot(args.features, args.model)
+    stores = [int(s) for s in snapshot.store_index.stores]
+
+    plain = ForecastEngine(MODEL_FEATURES)
+    configs = [("off", plain, None)]
+    for ms in (float(x) for x in args.max_ms.split(",")):
+        batcher = MicroBatcher(max_latency_ms=ms, max_rows=args.max_rows)
+        configs.append((f"{ms:g} ms", ForecastEngine(MODEL_FEATURES, batcher=batcher), batcher))
+
+    # Batched forecasts must be the unbatched ones
+    expected = {store: plain.forecast(snapshot, [store], args.months)[1] for store in stores[:32]}
+    for _, engine, batcher in configs[1:]:
+        got = {}
+
+        def check(store, engine=engine, got=got):
+            got[store] = engine.forecast(snapshot, [store], args.months)[1]
+        checkers = [threading.Thread(target=check, args=(store,)) for store in expected]
+        for c in checkers:
+            c.start()
+        for c in checkers:
+            c.join()
+        assert all(np.array_equal(got[store], expected[store]) for store in expected)
+
+    print(f"📊 {args.months}-month single-store forecasts, {args.seconds:g}s per run, max_rows={args.max_rows}")
+    print(f"{'threads':>8}{'batching':>10}{'forecasts/s':>13}{'p50 ms':>9}{'p99 ms':>9}{'rows/call':>11}{'wait ms':>9}")
+    for threads in (int(t) for t in args.threads.split(",")):
+        for name, engine, batcher in configs:
+            if batcher is not None:
+                before = batcher.stats()
+            rate, p50, p99 = run(engine, snapshot, stores, threads, args.seconds, args.months)
+            rows_per_call = wait = ""
+            if batcher is not None:
+                after = batcher.stats()
+                calls = after["calls"] - before["calls"]
+                batches = after["batches"] - before["batches"]
+                solo = after["solo"] - before["solo"]
+                rows_per_call = f"{(after['rows'] - before['rows'] + solo) / max(batches + solo, 1):.1f}"
+                queued_ms = (after["mean_wait_ms"] or 0) * after["calls"] - (before["mean_wait_ms"] or 0) * before["calls"]
+                wait = f"{queued_ms / calls:.2f}" if calls else "-"
+            print(f"{threads:>8}{name:>10}{rate:>13.0f}{p50:>9.2f}{p99:>9.2f}{rows_per_call:>11}{wait:>9}")
+
+    for name, _, batcher in configs[1:]:
+        print(f"\n🧮 Batcher {name}: {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
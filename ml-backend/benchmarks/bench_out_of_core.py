@@ -0,0 +1,122 @@
+"""Peak memory of the in-memory loader vs the partitioned out-of-core build.
+
+Each mode runs in a fresh interpreter and reports its peak RSS (ru_maxrss)
+and the peak of live Python/NumPy allocations (tracemalloc, which excludes
+allocator slack). Run it on features.csv and on a 10x file from
+make_synthetic_features.py: the in-memory peak grows with the file, the
+partitioned peak stays around one chunk plus the store x month grid.
+
+Both modes also build the store directory behind /api/stores and the
+County/City filters (the partitioned one through Snapshot, as load_snapshot
+does), and the extra traced memory of that step is reported on its own. The
+run fails if, for any file, the partitioned mode's directory step needs more
+than --max-directory-share of the in-memory peak, or its overall traced peak
+is over --max-share of the in-memory one on the largest file.
+
+Usage:
+    python benchmarks/bench_out_of_core.py --csv features.csv --csv features_10x.csv [--chunksize 200000]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    # Same work main.py did before: full table, index and monthly aggregates
+    "in-memory": (
+        "from core import MonthlySales, StoreIndex\n"
+        "from core.schema import read_features_csv\n"
+        "index = StoreIndex(read_features_csv(CSV))\n"
+        "sales = MonthlySales(index, index.df)\n"
+        "recent = lambda df: df[df['Date'] >= '2020-01-01'][['Store Number', 'City', 'County']]\n"
+        "directory = measure(lambda: recent(index.df).dropna().drop_duplicates())\n"
+        "stores = index.stores\n"
+    ),
+    "partitioned": (
+        "from core.partitioned_store import PartitionedFeatureStore, build_partitioned_store\n"
+        "from core.snapshot import Snapshot\n"
+        "build_partitioned_store(CSV, OUT, chunksize=CHUNKSIZE)\n"
+        "store = PartitionedFeatureStore(OUT)\n"
+        "snapshot = Snapshot(store, None, '', '', store_index=store.store_index, monthly_sales=store.monthly_sales,\n"
+        "                    store_directory=store.store_directory)\n"
+        "directory = measure(lambda: snapshot.store_directory)\n"
+        "stores = store.store_index.stores\n"
+        "for s in stores[:: max(len(stores) // 50, 1)]:\n"
+        "    store.frame(int(s))\n"
+    ),
+}
+
+
+def run(mode, csv_path, chunksize):
+    with tempfile.TemporaryDirectory(prefix="partitioned_bench_") as tmp:
+        code = (
+            "import resource, sys, time\n"
+            f"sys.path.insert(0, {BACKEND_DIR!r})\n"
+            f"CSV, OUT, CHUNKSIZE = {csv_path!r}, {os.path.join(tmp, 'store')!r}, {chunksize}\n"
+            "import pandas, numpy\n"
+            "import tracemalloc\n"
+            "base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "tracemalloc.start()\n"
+            "peaks = []\n"
+            "def measure(step):\n"
+            "    # Extra traced memory of one step; the run's overall peak is kept in peaks\n"
+            "    current, peak = tracemalloc.get_traced_memory()\n"
+            "    tracemalloc.reset_peak()\n"
+            "    result = step()\n"
+            "    step_peak = tracemalloc.get_traced_memory()[1]\n"
+            "    peaks.extend([peak, step_peak])\n"
+            "    measure.mb = (step_peak - current) / 1e6\n"
+            "    return result\n"
+            "t0 = time.perf_counter()\n"
+            + SNIPPETS[mode]
+            + "seconds = time.perf_counter() - t0\n"
+            "peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+            "traced = max(peaks + [tracemalloc.get_traced_memory()[1]])\n"
+            "print(seconds, (peak - base) / 1024, traced / 1e6, measure.mb, len(stores))\n"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        seconds, peak_mb, traced_mb, directory_mb, stores = out.stdout.strip().splitlines()[-1].split()
+        return float(seconds), float(peak_mb), float(traced_mb), float(directory_mb), int(stores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", action="append", required=True)
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--max-share", type=float, default=0.5,
+                        help="partitioned traced peak allowed on the largest file, as a share of in-memory's")
+    parser.add_argument("--max-directory-share", type=float, default=0.05,
+                        help="partitioned directory step allowed, as a share of the in-memory traced peak")
+    args = parser.parse_args()
+
+    print(f"{'file':<22}{'MB':>7}{'mode':>13}{'stores':>8}{'seconds':>9}{'RSS MB':>8}{'traced MB':>11}"
+          f"{'directory MB':>14}")
+    failures = []
+    largest = max(args.csv, key=os.path.getsize)
+    for csv_path in args.csv:
+        size_mb = os.path.getsize(csv_path) / 1e6
+        results = {}
+        for mode in SNIPPETS:
+            seconds, peak_mb, traced_mb, directory_mb, stores = results[mode] = run(mode, csv_path, args.chunksize)
+            print(
+                f"{os.path.basename(csv_path):<22}{size_mb:>7.1f}{mode:>13}{stores:>8}"
+                f"{seconds:>9.2f}{peak_mb:>8.1f}{traced_mb:>11.1f}{directory_mb:>14.2f}"
+            )
+
+        in_memory_mb, (_, _, traced_mb, directory_mb, _) = results["in-memory"][2], results["partitioned"]
+        if directory_mb > args.max_directory_share * in_memory_mb:
+            failures.append(f"{os.path.basename(csv_path)}: store directory took {directory_mb:.1f} MB")
+        if csv_path == largest and traced_mb > args.max_share * in_memory_mb:
+            failures.append(f"{os.path.basename(csv_path)}: partitioned peak {traced_mb:.1f} MB "
+                            f"vs {in_memory_mb:.1f} MB in memory")
+
+    if failures:
+        sys.exit("❌ Partitioned memory not bounded: " + "; ".join(failures))
+    print("\n✅ Partitioned peak and store directory stay bounded")
+
+
+if __name__ == "__main__":
+    main()
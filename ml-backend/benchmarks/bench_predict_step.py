@@ -0,0 +1,92 @@
+"""Per-step latency of the single-store forecast hot path.
+
+Times one recursive forecast step for one store three ways:
+  dataframe-row  the original route loop: copy the latest-row DataFrame, assign
+                 the lags, add missing columns, reselect, model.predict(DataFrame)
+  buffer+frame   preallocated NumPy buffer, wrapped in a DataFrame for model.predict
+  buffer+native  preallocated NumPy buffer through the booster's array path
+                 (what ForecastEngine does now)
+and reports ForecastEngine.prepare for one store, which gathers the latest row.
+
+Usage:
+    python benchmarks/bench_predict_step.py [--steps 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import ForecastEngine  # noqa: E402
+from core.inference import array_predictor  # noqa: E402
+from core.schema import MODEL_FEATURES  # noqa: E402
+from core.snapshot import load_snapshot  # noqa: E402
+
+
+def time_us(fn, steps):
+    fn()
+    timings = []
+    for _ in range(steps):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    snapshot = load_snapshot(args.features, args.model)
+    model = snapshot.model
+    engine = ForecastEngine(MODEL_FEATURES)
+    store = int(snapshot.store_index.stores[0])
+    batch = engine.prepare(snapshot, [store])
+
+    latest_row = snapshot.store_index.frame(store).iloc[-1:].copy()
+    lag_values = list(batch.lags[0])
+
+    def dataframe_row():
+        temp = latest_row.copy()
+        temp["Lag_1"] = lag_values[-1]
+        temp["Lag_2"] = lag_values[-2]
+        temp["Lag_3"] = lag_values[-3]
+        temp["Lag_12"] = lag_values[0]
+        for col in MODEL_FEATURES:
+            if col not in temp.columns:
+                temp[col] = 0
+        temp = temp[MODEL_FEATURES]
+        return model.predict(temp)[0]
+
+    X = batch.features.copy()
+    slots = [MODEL_FEATURES.index(col) for col in ("Lag_1", "Lag_2", "Lag_3")]
+    native = array_predictor(model, MODEL_FEATURES, backend="native")
+
+    def buffer_frame():
+        X[0, slots] = lag_values[-1], lag_values[-2], lag_values[-3]
+        return model.predict(pd.DataFrame(X, columns=MODEL_FEATURES))[0]
+
+    def buffer_native():
+        X[0, slots] = lag_values[-1], lag_values[-2], lag_values[-3]
+        return native(X)[0]
+
+    assert np.isclose(dataframe_row(), buffer_frame()) and buffer_frame() == buffer_native()
+
+    print(f"📊 store {store}, median of {args.steps} steps")
+    print(f"{'path':<16}{'us/step':>10}")
+    for name, fn in (("dataframe-row", dataframe_row), ("buffer+frame", buffer_frame), ("buffer+native", buffer_native)):
+        print(f"{name:<16}{time_us(fn, args.steps):>10.1f}")
+    print(f"{'prepare (1 store)':<16}{time_us(lambda: engine.prepare(snapshot, [store]), args.steps):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
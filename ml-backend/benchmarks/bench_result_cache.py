@@ -0,0 +1,109 @@
+"""Result-cache benchmark for /api/predict under skewed traffic.
+
+The precomputed forecast table is switched off (PRECOMPUTE_FORECASTS=0) so
+every request goes through the live path. Store choice is Zipf-distributed
+over the store list, like our traffic, which concentrates on a few hundred
+high-volume stores. The same request sequence is replayed with the cache on
+and off. A final burst of identical concurrent requests checks that
+single-flight computes the forecast only once.
+
+Usage:
+    python benchmarks/bench_result_cache.py [--requests 2000] [--zipf 1.2] [--cache-mb 4]
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def replay(client, requests):
+    timings = []
+    for store, months in requests:
+        t0 = time.perf_counter()
+        resp = client.post("/api/predict", json={"store": store, "months": months})
+        timings.append(time.perf_counter() - t0)
+        assert resp.status_code in (200, 400), resp.status_code
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--zipf", type=float, default=1.2, help="Zipf exponent of store popularity")
+    parser.add_argument("--cache-mb", type=float, default=4)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ["PRECOMPUTE_FORECASTS"] = "0"
+    os.environ["RESULT_CACHE_MB"] = str(args.cache_mb)
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        import main as backend
+
+        app = backend.create_app()
+        context = app.extensions["forecast"]
+        client = app.test_client()
+        cache = context["result_cache"]
+        stores = [int(s) for s in context["snapshots"].current().store_index.stores]
+
+        rng = np.random.default_rng(args.seed)
+        ranks = np.arange(1, len(stores) + 1)
+        weights = 1.0 / ranks ** args.zipf
+        picks = rng.choice(len(stores), size=args.requests, p=weights / weights.sum())
+        requests = [(stores[i], int(rng.choice([4, 6, 12]))) for i in picks]
+
+        cached = replay(client, requests)
+        stats = cache.stats()
+
+        # A zero-byte budget stores nothing, so every request computes live
+        max_bytes, cache.max_bytes = cache.max_bytes, 0
+        cache.clear()
+        uncached = replay(client, requests)
+        cache.max_bytes = max_bytes
+
+        # Single-flight: a burst of identical misses should compute once
+        cache.clear()
+        calls = []
+        engine = context["forecast_engine"]
+        original = engine.forecast
+
+        def counting_forecast(*a, **kw):
+            calls.append(1)
+            time.sleep(0.05)  # widen the race window
+            return original(*a, **kw)
+
+        engine.forecast = counting_forecast
+        burst_store = stores[0]
+        barrier = threading.Barrier(args.threads)
+
+        def hit():
+            barrier.wait()
+            client.post("/api/predict", json={"store": burst_store, "months": 7})
+
+        threads = [threading.Thread(target=hit) for _ in range(args.threads)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        engine.forecast = original
+
+    print(f"📊 {args.requests} requests over {len(stores)} stores, Zipf s={args.zipf}, cache {args.cache_mb} MB")
+    print(f"{'':<10}{'p50 ms':>10}{'mean ms':>10}")
+    for name, timings in (("no cache", uncached), ("cache", cached)):
+        print(f"{name:<10}{statistics.median(timings) * 1e3:>10.2f}{statistics.mean(timings) * 1e3:>10.2f}")
+    print(f"hits={stats['hits']} misses={stats['misses']} evictions={stats['evictions']} "
+          f"hit_ratio={stats['hit_ratio']} bytes={stats['bytes']:,}")
+    print(f"🔁 {args.threads} concurrent identical requests -> {len(calls)} forecast computation(s)")
+
+
+if __name__ == "__main__":
+    main()
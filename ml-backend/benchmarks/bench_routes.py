@@ -0,0 +1,84 @@
+"""Latency benchmark for /api/stores, /api/predict and /api/predict/batch.
+
+Builds the app from main.py and replays requests through Flask's test
+client, so the numbers are pure server-side handling time (no network).
+The batch section times forecasting --batch-size stores with one
+/api/predict/batch call against the same stores one /api/predict at a time.
+Route logging is sent to /dev/null while timing.
+
+Usage:
+    python benchmarks/bench_routes.py [--requests 200] [--months 4] [--batch-size 50]
+"""
+import argparse
+import contextlib
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def summarize(name, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<14}{statistics.median(timings) * 1e3:>10.2f}{p95 * 1e3:>10.2f}{len(timings):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--months", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        import main as backend
+
+        app = backend.create_app()
+        client = app.test_client()
+        stores = [int(s) for s in app.extensions["forecast"]["snapshots"].current().store_index.stores]
+        rng = random.Random(args.seed)
+
+        results = {"/api/stores": [], "/api/predict": []}
+        for _ in range(args.requests):
+            t0 = time.perf_counter()
+            resp = client.get("/api/stores")
+            results["/api/stores"].append(time.perf_counter() - t0)
+            assert resp.status_code == 200, resp.status_code
+
+            store = rng.choice(stores)
+            t0 = time.perf_counter()
+            resp = client.post("/api/predict", json={"store": store, "months": args.months})
+            results["/api/predict"].append(time.perf_counter() - t0)
+            assert resp.status_code in (200, 400), resp.status_code
+
+        batch = rng.sample(stores, min(args.batch_size, len(stores)))
+        sequential, batched = [], []
+        for _ in range(5):
+            t0 = time.perf_counter()
+            for store in batch:
+                client.post("/api/predict", json={"store": store, "months": args.months})
+            sequential.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            resp = client.post("/api/predict/batch", json={"stores": batch, "months": args.months})
+            resp.get_data()  # drain a streamed body
+            batched.append(time.perf_counter() - t0)
+            assert resp.status_code == 200, resp.status_code
+
+    print(f"📊 {len(stores):,} stores, {args.months}-month forecasts")
+    print(f"{'route':<14}{'p50 ms':>10}{'p95 ms':>10}{'n':>8}")
+    for name, timings in results.items():
+        summarize(name, timings)
+
+    print(f"\n📦 {len(batch)} stores per dashboard load (median of 5)")
+    print(f"{'sequential /api/predict':<28}{statistics.median(sequential) * 1e3:>10.1f} ms")
+    print(f"{'one /api/predict/batch':<28}{statistics.median(batched) * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare per-worker cold-start time for loading features.csv.
+
+Each measurement runs in a fresh interpreter, like a newly forked gunicorn
+worker, and times only the load itself (pandas import excluded).
+
+Usage:
+    python benchmarks/bench_startup.py [--csv features.csv] [--repeats 5]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SNIPPETS = {
+    "read_csv": "import pandas as pd\nt0 = time.perf_counter()\npd.read_csv(CSV)\n",
+    "cache": "from core import load_features\nt0 = time.perf_counter()\nload_features(CSV, cache_dir=CACHE)\n",
+}
+
+
+def time_in_subprocess(kind, csv_path, cache_dir):
+    code = (
+        "import sys, time\n"
+        f"sys.path.insert(0, {BACKEND_DIR!r})\n"
+        f"CSV, CACHE = {csv_path!r}, {cache_dir!r}\n"
+        + SNIPPETS[kind]
+        + "print(time.perf_counter() - t0)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="feature_cache_bench_")
+    try:
+        rebuild = time_in_subprocess("cache", args.csv, cache_dir)
+        results = {
+            "read_csv": [time_in_subprocess("read_csv", args.csv, cache_dir) for _ in range(args.repeats)],
+            "cache (warm)": [time_in_subprocess("cache", args.csv, cache_dir) for _ in range(args.repeats)],
+        }
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    size_mb = os.path.getsize(args.csv) / 1e6
+    print(f"📊 {args.csv} ({size_mb:.1f} MB), {args.repeats} fresh interpreters each")
+    print(f"{'loader':<16}{'median s':>10}{'min s':>10}")
+    print(f"{'cache (rebuild)':<16}{rebuild:>10.3f}{rebuild:>10.3f}")
+    for name, times in results.items():
+        print(f"{name:<16}{statistics.median(times):>10.3f}{min(times):>10.3f}")
+    speedup = statistics.median(results["read_csv"]) / statistics.median(results["cache (warm)"])
+    print(f"⚡ Warm cache is {speedup:.1f}x faster per worker start")
+
+
+if __name__ == "__main__":
+    main()
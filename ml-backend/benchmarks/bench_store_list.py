@@ -0,0 +1,74 @@
+"""Response bytes and server CPU per request for GET /api/stores.
+
+Builds the app from main.py and replays /api/stores through Flask's test
+client as three kinds of client:
+
+  identity     no Accept-Encoding (curl, scripts)
+  gzip         a browser's first load (Accept-Encoding: gzip, deflate, br)
+  revalidate   a browser reload: same headers plus If-None-Match with the
+               ETag of the previous response, when the server sent one
+
+CPU is the handling thread's CPU time (time.thread_time), so it excludes
+any idle background threads. Bytes are the body as sent, before the client
+would decompress it. Route logging is sent to /dev/null while timing.
+
+Usage:
+    python benchmarks/bench_store_list.py [--requests 500]
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+BROWSER_ENCODINGS = "gzip, deflate, br"
+
+
+def measure(client, headers, requests):
+    cpu, sizes, statuses = [], [], set()
+    for _ in range(requests):
+        t0 = time.thread_time()
+        resp = client.get("/api/stores", headers=headers)
+        body = resp.get_data()
+        cpu.append(time.thread_time() - t0)
+        sizes.append(len(body))
+        statuses.add(resp.status_code)
+    return statistics.median(cpu), statistics.median(sizes), statuses, resp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        import main as backend
+
+        app = backend.create_app()
+        client = app.test_client()
+
+        rows = []
+        cpu, size, statuses, resp = measure(client, {}, args.requests)
+        rows.append(("identity", cpu, size, statuses, resp.headers.get("Content-Encoding", "-")))
+        cpu, size, statuses, resp = measure(client, {"Accept-Encoding": BROWSER_ENCODINGS}, args.requests)
+        rows.append(("gzip", cpu, size, statuses, resp.headers.get("Content-Encoding", "-")))
+
+        headers = {"Accept-Encoding": BROWSER_ENCODINGS}
+        if resp.headers.get("ETag"):
+            headers["If-None-Match"] = resp.headers["ETag"]
+        cpu, size, statuses, resp = measure(client, headers, args.requests)
+        rows.append(("revalidate", cpu, size, statuses, resp.headers.get("Content-Encoding", "-")))
+
+    print(f"📊 GET /api/stores, median of {args.requests} requests")
+    print(f"{'client':<12}{'status':>8}{'encoding':>10}{'bytes':>10}{'CPU µs':>10}")
+    for name, cpu, size, statuses, encoding in rows:
+        status = ",".join(str(s) for s in sorted(statuses))
+        print(f"{name:<12}{status:>8}{encoding:>10}{size:>10,.0f}{cpu * 1e6:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare per-request store lookup: boolean mask scan vs StoreIndex slice.
+
+Runs both lookups for every store ID in features.csv and reports the mean
+cost per request.
+
+Usage:
+    python benchmarks/bench_store_lookup.py [--csv features.csv]
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import load_features, StoreIndex  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=os.path.join(BACKEND_DIR, "features.csv"))
+    args = parser.parse_args()
+
+    df = load_features(args.csv)
+    t0 = time.perf_counter()
+    store_index = StoreIndex(df)
+    build_s = time.perf_counter() - t0
+    stores = [int(s) for s in store_index.stores]
+
+    t0 = time.perf_counter()
+    for store in stores:
+        df[df["Store Number"] == store].copy()
+    scan_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for store in stores:
+        store_index.frame(store).copy()
+    index_s = time.perf_counter() - t0
+
+    print(f"📊 {len(df):,} rows, {len(stores):,} stores (index built once in {build_s * 1e3:.1f} ms)")
+    print(f"{'lookup':<14}{'total s':>10}{'per request µs':>16}")
+    print(f"{'boolean scan':<14}{scan_s:>10.3f}{scan_s / len(stores) * 1e6:>16.1f}")
+    print(f"{'StoreIndex':<14}{index_s:>10.3f}{index_s / len(stores) * 1e6:>16.1f}")
+    print(f"⚡ {scan_s / index_s:.1f}x faster per request")
+
+
+if __name__ == "__main__":
+    main()
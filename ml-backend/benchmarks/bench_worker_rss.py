@@ -0,0 +1,94 @@
+"""Report per-worker memory for private DataFrames vs the shared feature store.
+
+Starts N worker processes that each load the dataset the way main.py does,
+touch every column (as serving all stores eventually would), and then report
+RSS, PSS and private memory from /proc/self/smaps_rollup while all of them are
+alive. PSS splits shared pages between the workers attached to them, so it is
+the number that shows the saving. Linux only.
+
+Usage:
+    python benchmarks/bench_worker_rss.py [--csv features.csv] [--workers 4]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def read_smaps_rollup():
+    fields = {}
+    with open("/proc/self/smaps_rollup", "r") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024  # kB -> MB
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "private": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def worker(mode, csv_path, ready, done, results):
+    from core import StoreIndex, load_features, open_shared_store
+
+    touched = 0.0
+    if mode == "dataframe":
+        df = StoreIndex(load_features(csv_path)).df
+        touched = sum(float(df[c].sum()) for c in df.columns if df[c].dtype.kind in "fi")
+    elif mode == "shared":
+        store = open_shared_store(csv_path)
+        touched = sum(
+            float(store.column(c).sum()) for c in store.columns
+            if getattr(store.column(c), "dtype", None) is not None and store.column(c).dtype.kind in "fi"
+        )
+
+    # Sample only once every worker is attached so PSS reflects the sharing
+    ready.wait()
+    results.put(read_smaps_rollup() | {"touched": touched})
+    done.wait()
+
+
+def measure(mode, csv_path, workers):
+    ready, done = mp.Barrier(workers + 1), mp.Barrier(workers + 1)
+    results = mp.Queue()
+    procs = [mp.Process(target=worker, args=(mode, csv_path, ready, done, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    ready.wait()
+    samples = [results.get() for _ in procs]
+    done.wait()
+    for p in procs:
+        p.join()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    mp.set_start_method("fork")
+    # Export once up front so the shared run measures attach cost, not the export
+    from core import open_shared_store
+    open_shared_store(args.csv)
+
+    # "idle" workers load nothing; the other modes are reported relative to it
+    averages = {}
+    for mode in ("idle", "dataframe", "shared"):
+        samples = measure(mode, args.csv, args.workers)
+        averages[mode] = {k: sum(s[k] for s in samples) / len(samples) for k in ("rss", "pss", "private")}
+
+    print(f"📊 {args.workers} workers, MB per worker above an idle worker")
+    print(f"{'mode':<12}{'RSS':>10}{'PSS':>10}{'private':>10}")
+    for mode in ("dataframe", "shared"):
+        row = {k: averages[mode][k] - averages["idle"][k] for k in ("rss", "pss", "private")}
+        print(f"{mode:<12}{row['rss']:>10.1f}{row['pss']:>10.1f}{row['private']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
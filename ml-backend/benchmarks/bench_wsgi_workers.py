@@ -0,0 +1,176 @@
+"""Per-worker memory and throughput of the gunicorn deployment (wsgi.py).
+
+For each worker class, worker count and loading mode, starts gunicorn with
+gunicorn.conf.py, drives it with --clients concurrent HTTP clients for
+--seconds (table-served /api/predict for random stores and horizons, plus
+/api/stores), and then reads RSS, PSS and private memory of every worker from
+/proc/<pid>/smaps_rollup. PSS splits shared pages between the processes
+mapping them, so it is the figure that shows copy-on-write sharing.
+
+Loading modes:
+  preload+freeze  the app is built in the master, heap frozen (the default)
+  preload         built in the master, no gc.freeze (WEB_GC_FREEZE=0)
+  per-worker      every worker builds its own app (WEB_PRELOAD=0)
+
+The load generator runs on the same machine, so absolute throughput is shared
+with it. Linux only.
+
+Usage:
+    python benchmarks/bench_wsgi_workers.py [--workers 1,2,4] [--classes sync,gthread] [--seconds 5]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "preload+freeze": {},
+    "preload": {"WEB_GC_FREEZE": "0"},
+    "per-worker": {"WEB_PRELOAD": "0"},
+}
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def request(port, method, path, body=None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        return resp.status
+    finally:
+        conn.close()
+
+
+def wait_ready(port, proc, timeout=180):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            if request(port, "GET", "/") == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+
+def worker_pids(master_pid):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def smaps_rollup(pid):
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024  # kB -> MB
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "private": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+    }
+
+
+def drive(port, stores, clients, seconds):
+    """Requests per second over ``seconds`` with ``clients`` concurrent connections."""
+    counts = [0] * clients
+    errors = [0] * clients
+    stop = time.perf_counter() + seconds
+
+    def client(i):
+        rng = random.Random(i)
+        while time.perf_counter() < stop:
+            if rng.random() < 0.1:
+                status = request(port, "GET", "/api/stores")
+            else:
+                status = request(port, "POST", "/api/predict", {"store": rng.choice(stores), "months": rng.randint(1, 12)})
+            counts[i] += 1
+            errors[i] += status >= 500
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if sum(errors):
+        raise RuntimeError(f"{sum(errors)} requests failed")
+    return sum(counts) / (time.perf_counter() - t0)
+
+
+def run(worker_class, workers, mode, args, stores):
+    port = free_port()
+    env = {
+        **os.environ,
+        "WEB_BIND": f"127.0.0.1:{port}",
+        "WEB_WORKERS": str(workers),
+        "WEB_WORKER_CLASS": worker_class,
+        "WEB_THREADS": str(args.threads),
+        **MODES[mode],
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port, proc)
+        # Every worker has to be up before measuring, not just the first to answer
+        while len(worker_pids(proc.pid)) < workers:
+            time.sleep(0.2)
+        rate = drive(port, stores, args.clients, args.seconds)
+        samples = [smaps_rollup(pid) for pid in worker_pids(proc.pid)]
+        master = smaps_rollup(proc.pid)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+    per_worker = {k: sum(s[k] for s in samples) / len(samples) for k in ("rss", "pss", "private")}
+    total_pss = sum(s["pss"] for s in samples) + master["pss"]
+    return rate, per_worker, total_pss
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--classes", default="sync,gthread")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--threads", type=int, default=4, help="threads per gthread worker")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, BACKEND_DIR)
+    from core.snapshot import load_snapshot
+    snapshot = load_snapshot(os.path.join(BACKEND_DIR, "features.csv"), os.path.join(BACKEND_DIR, "model.pkl"))
+    stores = [int(s) for s in snapshot.store_index.stores]
+    del snapshot
+
+    print(f"📊 {args.clients} clients, {args.seconds:g}s per run, {os.cpu_count()} CPU(s); MB per worker")
+    print(f"{'class':<9}{'workers':>8}  {'mode':<16}{'req/s':>8}{'RSS':>8}{'PSS':>8}{'private':>9}{'total PSS':>11}")
+    for worker_class in args.classes.split(","):
+        for workers in (int(w) for w in args.workers.split(",")):
+            for mode in args.modes.split(","):
+                rate, mem, total = run(worker_class, workers, mode, args, stores)
+                print(f"{worker_class:<9}{workers:>8}  {mode:<16}{rate:>8.0f}"
+                      f"{mem['rss']:>8.1f}{mem['pss']:>8.1f}{mem['private']:>9.1f}{total:>11.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Generate a larger synthetic features.csv by replicating an existing one.
+
+Each of the ``--scale`` copies gets its own block of store numbers and
+slightly scaled sales columns. The source is streamed chunk by chunk and the
+copies are interleaved, so stores are scattered across the output like in a
+date-ordered state export.
+
+Usage:
+    python benchmarks/make_synthetic_features.py --scale 10 --out features_10x.csv
+"""
+import argparse
+import math
+import os
+
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    max_store = int(pd.read_csv(args.source, usecols=["Store Number"])["Store Number"].max())
+    store_offset = 10 ** math.ceil(math.log10(max_store + 1))
+
+    rows = 0
+    with open(args.out, "w", encoding="utf-8", newline="") as out:
+        for i, chunk in enumerate(pd.read_csv(args.source, chunksize=args.chunksize)):
+            sales_cols = [c for c in chunk.columns if c.endswith("_Sales")]
+            for k in range(args.scale):
+                copy = chunk.copy()
+                copy["Store Number"] += k * store_offset
+                copy[sales_cols] *= 1 + 0.01 * k
+                copy.to_csv(out, header=(i == 0 and k == 0), index=False, lineterminator="\n")
+                rows += len(copy)
+
+    print(f"✅ Wrote {rows:,} rows ({os.path.getsize(args.out) / 1e6:,.1f} MB) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Local stand-in for the Groq chat-completions endpoint, for load tests.
+
+Answers every POST with an OpenAI-style completion after --delay seconds
+(plus up to --jitter), one thread per connection, so any number of calls can
+be in flight. Point the backend at it with
+LLM_API_URL=http://127.0.0.1:<port>/v1/chat/completions.
+
+Usage:
+    python benchmarks/mock_llm_server.py [--port 8099] [--delay 1.0]
+"""
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(delay, jitter):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            time.sleep(delay + random.uniform(0, jitter))
+            prompt = request.get("messages", [{}])[-1].get("content", "")
+            body = json.dumps({
+                "id": "mock",
+                "object": "chat.completion",
+                "model": request.get("model"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"Mock summary of {len(prompt)} prompt characters."},
+                    "finish_reason": "stop",
+                }],
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--delay", type=float, default=1.0, help="seconds before each answer")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.delay, args.jitter))
+    server.daemon_threads = True
+    print(f"🤖 Mock LLM on http://{args.host}:{args.port}/v1/chat/completions, {args.delay:g}s per answer", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
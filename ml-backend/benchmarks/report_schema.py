@@ -0,0 +1,69 @@
+"""Memory and prediction-parity report for the compact features.csv schema.
+
+Loads features.csv twice, once with pandas defaults and once through
+``core.schema``, prints ``df.memory_usage(deep=True)`` for both, and checks
+that ``model.predict`` on the model features stays within tolerance. Exits
+non-zero when it does not.
+
+Usage:
+    python benchmarks/report_schema.py [--csv features.csv] [--model model.pkl] [--rtol 1e-4]
+"""
+import argparse
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core.schema import MODEL_FEATURES, read_features_csv  # noqa: E402
+
+
+def model_input(df):
+    X = df.reindex(columns=MODEL_FEATURES)
+    return X.fillna(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--csv", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--rtol", type=float, default=1e-4)
+    parser.add_argument("--atol", type=float, default=0.01, help="absolute tolerance in dollars")
+    args = parser.parse_args()
+
+    default_df = pd.read_csv(args.csv)
+    typed_df = read_features_csv(args.csv)
+
+    before = default_df.memory_usage(deep=True)
+    after = typed_df.memory_usage(deep=True)
+    report = pd.DataFrame({
+        "before_dtype": default_df.dtypes.astype(str),
+        "after_dtype": typed_df.dtypes.astype(str),
+        "before_kb": before.drop("Index") / 1024,
+        "after_kb": after.drop("Index") / 1024,
+    }).sort_values("before_kb", ascending=False)
+    with pd.option_context("display.max_rows", None, "display.float_format", "{:,.1f}".format):
+        print(report)
+    print(f"\n📊 Total: {before.sum() / 1e6:,.2f} MB -> {after.sum() / 1e6:,.2f} MB "
+          f"({1 - after.sum() / before.sum():.0%} smaller)")
+
+    with open(args.model, "rb") as f:
+        model = pickle.load(f)
+    y_before = np.asarray(model.predict(model_input(default_df)), dtype=np.float64)
+    y_after = np.asarray(model.predict(model_input(typed_df)), dtype=np.float64)
+    abs_diff = np.abs(y_after - y_before)
+    print(f"🔍 model.predict over {len(y_before):,} rows: max abs diff {abs_diff.max():.6f}, "
+          f"max rel diff {(abs_diff / np.maximum(np.abs(y_before), 1e-9)).max():.2e}")
+
+    if not np.allclose(y_after, y_before, rtol=args.rtol, atol=args.atol):
+        print(f"❌ Predictions drift beyond rtol={args.rtol}, atol={args.atol}")
+        sys.exit(1)
+    print("✅ Predictions within tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Build the residual store used for simulated prediction intervals.
+
+Backtests the recursive model: a model with model.pkl's hyperparameters is
+trained on all but the last --holdout months of features.csv and predicts the
+held-out rows one month ahead. The actual / predicted ratios are written to
+residuals.npy next to model.pkl, where snapshots pick them up (see
+core/intervals.py). A running server loads the file on its next reload.
+
+Usage:
+    python build_residuals.py
+    python build_residuals.py --holdout 6
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from core import load_features
+from core.intervals import backtest_residuals
+from core.schema import MODEL_FEATURES
+from core.snapshot import residuals_path
+from train_direct_models import recursive_model_params
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holdout", type=int, default=12, help="months held out of training and predicted")
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--out", help="output path (default: residuals.npy next to --model)")
+    args = parser.parse_args()
+
+    df = load_features(args.features)
+    t0 = time.perf_counter()
+    residuals = backtest_residuals(df, MODEL_FEATURES, args.holdout, recursive_model_params(args.model))
+
+    out = args.out or residuals_path(args.model)
+    tmp_path = f"{out}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, residuals)
+    os.replace(tmp_path, out)
+    p10, p50, p90 = np.percentile(residuals, [10, 50, 90])
+    print(f"✅ {len(residuals):,} residual ratios from a {args.holdout}-month backtest in {time.perf_counter() - t0:.1f}s "
+          f"(p10 {p10:.3f}, median {p50:.3f}, p90 {p90:.3f}) -> {out}")
+
+
+if __name__ == "__main__":
+    main()
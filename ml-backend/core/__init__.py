@@ -0,0 +1,14 @@
+# core/__init__.py
+from .feature_cache import load_features
+from .store_index import StoreIndex
+from .shared_store import SharedFeatureStore, open_shared_store
+from .partitioned_store import PartitionedFeatureStore, open_partitioned_store
+from .aggregates import MonthlySales
+from .snapshot import Snapshot, SnapshotHolder
+from .readiness import Components
+from .forecast_engine import ForecastEngine
+from .direct_forecast import DirectModels, load_direct_models
+from .forecast_table import ForecastTable, open_forecast_table
+from .result_cache import ResultCache
+from .micro_batch import MicroBatcher
+from .encoded_payload import EncodedPayload
@@ -0,0 +1,95 @@
+"""Materialized store x month Total_Sales table.
+
+Built once at load so the predict timeline, store_info stats and regional
+averages become array lookups instead of per-request ``pd.Grouper`` groupbys.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _column(table, name):
+    if isinstance(table, pd.DataFrame):
+        return table[name].to_numpy()
+    return np.asarray(table.column(name))
+
+
+def _month_ordinal(dates):
+    return dates.astype("datetime64[M]").astype(np.int64)
+
+
+class MonthlySales:
+    """Dense (n_stores x n_months) monthly Total_Sales sums plus a month index.
+
+    ``table`` must be sorted the way ``store_index`` was built (a SharedFeatureStore
+    or ``StoreIndex.df``). Rows with an unparseable date are left out of the
+    monthly grid, matching ``pd.Grouper`` semantics.
+    """
+
+    def __init__(self, store_index, table):
+        self.stores = np.asarray(store_index.stores)
+        self.store_rows = {int(store): i for i, store in enumerate(self.stores)}
+
+        store_col = _column(table, "Store Number")
+        dates = _column(table, "Date").astype("datetime64[ns]")
+        sales = np.nan_to_num(_column(table, "Total_Sales").astype(np.float64))
+
+        # Table is grouped by store in index order, so positions come from block sizes
+        bounds = np.array([store_index.bounds(int(s)) for s in self.stores]).reshape(-1, 2)
+        store_pos = np.repeat(np.arange(len(self.stores)), bounds[:, 1] - bounds[:, 0])
+        if len(store_pos) != len(store_col):
+            raise ValueError("table is not sorted like store_index")
+
+        # Regional totals use every row, dated or not, like groupby("Store Number")
+        self.store_totals = np.bincount(store_pos, weights=sales, minlength=len(self.stores))
+
+        valid = ~np.isnat(dates)
+        ordinals = _month_ordinal(dates[valid])
+        first_ord = ordinals.min() if len(ordinals) else 0
+        n_months = int(ordinals.max() - first_ord + 1) if len(ordinals) else 0
+        self.months = pd.date_range(
+            pd.Timestamp(np.datetime64(int(first_ord), "M")), periods=n_months, freq="MS"
+        )
+
+        flat = store_pos[valid] * n_months + (ordinals - first_ord)
+        size = len(self.stores) * n_months
+        self.totals = np.bincount(flat, weights=sales[valid], minlength=size).reshape(len(self.stores), n_months)
+        self.has_rows = np.bincount(flat, minlength=size).reshape(len(self.stores), n_months) > 0
+
+    @classmethod
+    def from_arrays(cls, stores, months, totals, has_rows, store_totals):
+        """Wrap sums that were accumulated elsewhere, e.g. chunk by chunk."""
+        sales = cls.__new__(cls)
+        sales.stores = np.asarray(stores)
+        sales.store_rows = {int(store): i for i, store in enumerate(sales.stores)}
+        sales.months = months
+        sales.totals = totals
+        sales.has_rows = has_rows
+        sales.store_totals = store_totals
+        return sales
+
+    def month_position(self, when):
+        """Index of the month containing ``when`` on the grid (may be out of range)."""
+        ordinal = _month_ordinal(np.datetime64(pd.Timestamp(when), "ns"))
+        first = _month_ordinal(np.datetime64(self.months[0], "ns")) if len(self.months) else ordinal
+        return int(ordinal - first)
+
+    def store_series(self, store, since=None):
+        """Return ``(month_starts, totals)`` for ``store`` like a monthly ``pd.Grouper`` sum.
+
+        The range runs from the store's first month with rows (at or after
+        ``since``) to its last, with empty months in between summing to 0.
+        Returns None when the store has no rows in that range.
+        """
+        row = self.store_rows.get(store)
+        if row is None:
+            return None
+        start = 0 if since is None else max(self.month_position(since), 0)
+        present = np.flatnonzero(self.has_rows[row, start:])
+        if not len(present):
+            return None
+        first, last = start + present[0], start + present[-1] + 1
+        return self.months[first:last], self.totals[row, first:last]
+
+    def regional_average(self):
+        """Mean total sales per store across the whole table."""
+        return float(self.store_totals.mean()) if len(self.store_totals) else 0.0
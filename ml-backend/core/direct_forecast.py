@@ -0,0 +1,111 @@
+"""Direct multi-horizon forecasting: one model per horizon.
+
+The recursive engine feeds each prediction back in as a lag, so horizons run
+one after another and errors compound. The direct strategy trains model ``h``
+to map a store's row at month ``t`` straight to its Total_Sales at ``t + h``,
+using the same MODEL_FEATURES columns. Every horizon is then predicted from
+the latest row alone, so the calls are independent and run side by side.
+
+Models are trained offline by train_direct_models.py and stored next to
+model.pkl as direct_models.pkl; snapshots load them when that file exists.
+"""
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .inference import array_predictor
+
+DIRECT_MODELS_NAME = "direct_models.pkl"
+DIRECT_HORIZONS = 12
+
+
+def direct_targets(df, horizons=DIRECT_HORIZONS):
+    """Total_Sales ``h`` months after each row's month, per store (NaN if unknown).
+
+    Matched on calendar month rather than row position, so gaps in a store's
+    history never pair a row with the wrong month.
+    """
+    month = df["Date"].dt.year * 12 + df["Date"].dt.month
+    monthly = (
+        pd.DataFrame({"store": df["Store Number"].to_numpy(), "month": month.to_numpy(), "sales": df["Total_Sales"].to_numpy()})
+        .dropna(subset=["month"])
+        .groupby(["store", "month"])["sales"].sum()
+    )
+    targets = {}
+    for h in range(1, horizons + 1):
+        keys = pd.MultiIndex.from_arrays([df["Store Number"].to_numpy(), (month + h).to_numpy()])
+        targets[h] = monthly.reindex(keys).to_numpy()
+    return pd.DataFrame(targets, index=df.index)
+
+
+def train_direct_models(df, model_features, horizons=DIRECT_HORIZONS, params=None):
+    """Fit one XGBRegressor per horizon on the rows whose target month is known."""
+    from xgboost import XGBRegressor
+
+    X = df.reindex(columns=model_features, fill_value=0)
+    targets = direct_targets(df, horizons)
+    models = []
+    for h in range(1, horizons + 1):
+        known = targets[h].notna().to_numpy()
+        model = XGBRegressor(**(params or {}))
+        model.fit(X[known], targets[h][known])
+        models.append(model)
+        print(f"🏋️ Horizon {h}: trained on {int(known.sum()):,} rows")
+    return DirectModels(models, model_features)
+
+
+class DirectModels:
+    """``models[h - 1]`` predicts Total_Sales ``h`` months after the input row."""
+
+    def __init__(self, models, model_features):
+        self.models = list(models)
+        self.model_features = list(model_features)
+        self._predictors = [array_predictor(model, self.model_features) for model in self.models]
+        self._pool = None
+        self._pool_pid = None
+        self._pool_lock = threading.Lock()
+
+    @property
+    def horizons(self):
+        return len(self.models)
+
+    def _horizon_pool(self):
+        # Created on first use, and again in a forked worker: a pool built in the
+        # gunicorn master (e.g. by validate_snapshot) has no threads after the fork
+        if self._pool_pid != os.getpid():
+            with self._pool_lock:
+                if self._pool_pid != os.getpid():
+                    workers = min(len(self.models), os.cpu_count() or 1)
+                    self._pool = ThreadPoolExecutor(workers, thread_name_prefix="direct-horizon") if workers > 1 else None
+                    self._pool_pid = os.getpid()
+        return self._pool
+
+    def predict(self, X, months):
+        """(n x months) forecasts from the (n x n_features) matrix ``X``, one model per column."""
+        if months > self.horizons:
+            raise ValueError(f"direct models cover {self.horizons} months, {months} requested")
+        predictors = self._predictors[:months]
+        # The boosters release the GIL while predicting, so horizons overlap across threads
+        pool = self._horizon_pool()
+        if pool is None:
+            columns = [predict(X) for predict in predictors]
+        else:
+            columns = list(pool.map(lambda predict: predict(X), predictors))
+        return np.column_stack(columns) if columns else np.empty((len(X), 0))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump({"models": self.models, "model_features": self.model_features}, f)
+
+
+def load_direct_models(path):
+    """DirectModels from ``path``, or None when the file doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    return DirectModels(payload["models"], payload["model_features"])
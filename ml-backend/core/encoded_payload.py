@@ -0,0 +1,41 @@
+"""Response bodies encoded once and served as-is until the data changes.
+
+/api/stores returns the same list for every request against one dataset
+version, so the serialized body is kept together with its gzip (and, when
+the ``brotli`` package is installed, brotli) encoding. Each encoding gets its
+own strong ETag derived from the body's hash, as HTTP requires for
+byte-different representations, so a browser revalidating with
+If-None-Match gets a 304 without the body being rebuilt or recompressed.
+"""
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:  # optional; gzip alone is always available
+    brotli = None
+
+# Most preferred first; identity is the fallback for clients that accept neither
+ENCODINGS = ("br", "gzip")
+
+
+class EncodedPayload:
+    def __init__(self, body, mimetype="application/json"):
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(body).hexdigest()[:20]
+        self.bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=11)
+
+    def encoding_for(self, accept_encodings):
+        """Best stored encoding for a werkzeug ``request.accept_encodings``."""
+        for encoding in ENCODINGS:
+            if encoding in self.bodies and accept_encodings.quality(encoding) > 0:
+                return encoding
+        return "identity"
+
+    def etag(self, encoding):
+        return self.digest if encoding == "identity" else f"{self.digest}-{encoding}"
+
+    def sizes(self):
+        return {encoding: len(body) for encoding, body in self.bodies.items()}
@@ -0,0 +1,152 @@
+"""Columnar on-disk cache for features.csv.
+
+Parsing the CSV dominates cold start for every worker, so the first load
+converts it to an Arrow IPC (Feather) file next to the CSV and later loads
+read that instead. The cache is rebuilt only when the CSV's size, mtime and
+content hash no longer match the recorded fingerprint.
+"""
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from .schema import SCHEMA_VERSION, read_features_csv
+
+try:
+    import pyarrow  # noqa: F401 -- required by DataFrame.to_feather/read_feather
+    HAVE_ARROW = True
+except ImportError:
+    HAVE_ARROW = False
+
+CACHE_DIR_NAME = ".feature_cache"
+# Bump whenever the cached representation changes so old caches get rebuilt
+CACHE_FORMAT_VERSION = f"2.{SCHEMA_VERSION}"
+
+
+def _cache_paths(csv_path, cache_dir):
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return (
+        cache_dir,
+        os.path.join(cache_dir, f"{stem}.feather"),
+        os.path.join(cache_dir, f"{stem}.meta.json"),
+    )
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    # Several workers may rebuild at once; each writes its own temp file and
+    # the last os.replace wins, so readers never see a half-written cache.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_meta(meta_path, meta):
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    _write_atomic(meta_path, write)
+
+
+def cache_is_fresh(csv_path, cache_dir=None):
+    """Return True when the columnar cache can be used for ``csv_path``.
+
+    Size and mtime are checked first; only when they differ is the CSV hashed,
+    so touching the file without changing it does not force a rebuild.
+    """
+    _, data_path, meta_path = _cache_paths(csv_path, cache_dir)
+    meta = _read_meta(meta_path)
+    if not meta or not os.path.exists(data_path):
+        return False
+    if meta.get("format_version") != CACHE_FORMAT_VERSION:
+        return False
+
+    st = os.stat(csv_path)
+    if meta.get("size") == st.st_size and meta.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    if meta.get("size") != st.st_size:
+        return False
+
+    if meta.get("sha256") != file_sha256(csv_path):
+        return False
+
+    # Same content, new mtime: refresh the fingerprint so the next start skips hashing
+    meta["mtime_ns"] = st.st_mtime_ns
+    _write_meta(meta_path, meta)
+    return True
+
+
+def features_fingerprint(csv_path, cache_dir=None):
+    """Return the sha256 of ``csv_path``, reusing the cache fingerprint when fresh."""
+    if HAVE_ARROW:
+        try:
+            if cache_is_fresh(csv_path, cache_dir):
+                return _read_meta(_cache_paths(csv_path, cache_dir)[2])["sha256"]
+        except (OSError, KeyError, TypeError):
+            pass
+    return file_sha256(csv_path)
+
+
+def build_cache(csv_path, cache_dir=None):
+    """Parse ``csv_path`` and (re)write its columnar cache. Returns the DataFrame."""
+    cache_dir, data_path, meta_path = _cache_paths(csv_path, cache_dir)
+    st = os.stat(csv_path)
+    df = read_features_csv(csv_path)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    _write_atomic(data_path, lambda tmp_path: df.to_feather(tmp_path))
+    _write_meta(meta_path, {
+        "format_version": CACHE_FORMAT_VERSION,
+        "source": os.path.abspath(csv_path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": file_sha256(csv_path),
+    })
+    print(f"🗄️ Rebuilt feature cache {data_path}")
+    return df
+
+
+def load_features(csv_path, cache_dir=None):
+    """Load features.csv through the columnar cache, rebuilding it when stale.
+
+    Columns get the compact dtypes from ``core.schema``. Falls back to parsing
+    the CSV when pyarrow is not installed or the cache directory is not
+    writable.
+    """
+    if not HAVE_ARROW:
+        print("⚠️ pyarrow not installed, reading features CSV directly")
+        return read_features_csv(csv_path)
+
+    _, data_path, _ = _cache_paths(csv_path, cache_dir)
+    try:
+        if cache_is_fresh(csv_path, cache_dir):
+            try:
+                return pd.read_feather(data_path)
+            except Exception as e:
+                print(f"⚠️ Feature cache unreadable ({e}), rebuilding")
+        return build_cache(csv_path, cache_dir)
+    except OSError as e:
+        print(f"⚠️ Feature cache unavailable ({e}), reading CSV directly")
+        return read_features_csv(csv_path)
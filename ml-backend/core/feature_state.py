@@ -0,0 +1,264 @@
+"""Per-store rolling state for the lag and rolling-window feature columns.
+
+features.csv carries lag/rolling columns computed from each store's monthly
+Total_Sales. The conventions reproduced here: features for month t only use
+sales up to t-1, rolling std is the sample std (ddof=1), the trend is the
+3-month mean minus the 6-month mean, and months with no rows count as zero
+sales (the same zero-filled months MonthlySales reports).
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+WINDOW = 12
+
+DERIVED_COLUMNS = [
+    "Lag_1", "Lag_2", "Lag_3", "Lag_12",
+    "Rolling_3", "Rolling_6", "Rolling_12", "Rolling_Trend",
+    "rolling_mean_3", "rolling_std_3", "rolling_mean_6", "rolling_trend",
+    "store_mean_sales", "store_std_sales", "sales_to_avg_ratio",
+    "Month", "Quarter", "IsYearStart", "IsYearEnd", "IsHolidayMonth", "Is_Promotion_Month",
+    "Month_sin", "Month_cos",
+]
+
+
+def calendar_features(month_start):
+    month = month_start.month
+    holiday = int(month in (11, 12))
+    return {
+        "Month": month,
+        "Quarter": (month - 1) // 3 + 1,
+        "IsYearStart": int(month == 1),
+        "IsYearEnd": int(month == 12),
+        "IsHolidayMonth": holiday,
+        "Is_Promotion_Month": holiday,
+        "Month_sin": math.sin(2 * math.pi * month / 12),
+        "Month_cos": math.cos(2 * math.pi * month / 12),
+    }
+
+
+class StoreFeatureState:
+    """Last WINDOW monthly totals in a ring buffer plus expanding mean/std sums."""
+
+    __slots__ = ("history", "pos", "filled", "last_month", "count", "total", "total_sq", "carry")
+
+    def __init__(self):
+        self.history = np.zeros(WINDOW)
+        self.pos = 0            # slot the next value is written to
+        self.filled = 0         # how many slots hold real values
+        self.last_month = None  # month ordinal (year * 12 + month - 1) of the newest value
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.carry = {}         # columns copied forward from the latest row, e.g. City/County
+
+    @classmethod
+    def from_series(cls, values, last_month):
+        state = cls()
+        for value in values:
+            state.push(value)
+        state.last_month = last_month
+        return state
+
+    def push(self, value):
+        value = float(value)
+        self.history[self.pos] = value
+        self.pos = (self.pos + 1) % WINDOW
+        self.filled = min(self.filled + 1, WINDOW)
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        if self.last_month is not None:
+            self.last_month += 1
+
+    def advance_to(self, month):
+        """Push zero-sales months until the newest value is the month before ``month``."""
+        if self.last_month is None:
+            return
+        if month <= self.last_month:
+            raise ValueError(f"month {month} is not after the last ingested month {self.last_month}")
+        for _ in range(month - self.last_month - 1):
+            self.push(0.0)
+
+    def lag(self, k):
+        if k > self.filled:
+            return math.nan
+        return float(self.history[(self.pos - k) % WINDOW])
+
+    def window(self, k):
+        if k > self.filled:
+            return None
+        return self.history[(self.pos - np.arange(1, k + 1)) % WINDOW]
+
+    def rolling_mean(self, k):
+        values = self.window(k)
+        return math.nan if values is None else float(values.mean())
+
+    def rolling_std(self, k):
+        values = self.window(k)
+        return math.nan if values is None else float(values.std(ddof=1))
+
+    def store_mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def store_std(self):
+        if self.count < 2:
+            return math.nan
+        var = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(var, 0.0))
+
+    def features(self, month_start):
+        """Derived feature values for a new row dated ``month_start``."""
+        mean_3, mean_6 = self.rolling_mean(3), self.rolling_mean(6)
+        store_mean = self.store_mean()
+        lag_1 = self.lag(1)
+        row = {
+            "Lag_1": lag_1,
+            "Lag_2": self.lag(2),
+            "Lag_3": self.lag(3),
+            "Lag_12": self.lag(12),
+            "Rolling_3": mean_3,
+            "Rolling_6": mean_6,
+            "Rolling_12": self.rolling_mean(12),
+            "Rolling_Trend": mean_3 - mean_6,
+            "rolling_mean_3": mean_3,
+            "rolling_std_3": self.rolling_std(3),
+            "rolling_mean_6": mean_6,
+            "rolling_trend": mean_3 - mean_6,
+            "store_mean_sales": store_mean,
+            "store_std_sales": self.store_std(),
+            "sales_to_avg_ratio": lag_1 / store_mean if store_mean else math.nan,
+        }
+        row.update(calendar_features(month_start))
+        return row
+
+
+class RollingFeatureState:
+    """StoreFeatureState for many stores at once, with O(1) rolling updates.
+
+    The recursive forecast engine pushes each step's predictions for every
+    store in lockstep, so one ring position serves all rows. Window sums for
+    the 3/6/12-month means and the 3-month std are kept as running sums: a push
+    adds the new value and subtracts the one leaving each window instead of
+    re-reading the window. Slots never filled hold 0, so they drop out of the
+    sums for free; statistics over windows not yet full are NaN, as in
+    StoreFeatureState.
+    """
+
+    def __init__(self, history, filled, count, total, total_sq, next_month):
+        n = len(history)
+        self.history = np.zeros((n, WINDOW))
+        self.history[:, :] = history        # newest value in the last column
+        self.pos = 0                        # ring slot the next push overwrites
+        self.filled = np.asarray(filled, dtype=np.int64)
+        self.count = np.asarray(count, dtype=np.float64)
+        self.total = np.asarray(total, dtype=np.float64)
+        self.total_sq = np.asarray(total_sq, dtype=np.float64)
+        self.next_month = np.asarray(next_month, dtype=np.int64)  # calendar month (1-12) of the next row
+        self.sums = {k: self.history[:, WINDOW - k:].sum(axis=1) for k in (3, 6, 12)}
+        self.sum_sq_3 = (self.history[:, WINDOW - 3:] ** 2).sum(axis=1)
+
+    @classmethod
+    def from_monthly_sales(cls, monthly_sales, stores, last_dates):
+        """State after each store's month in ``last_dates``, from the monthly totals grid."""
+        n = len(stores)
+        history = np.zeros((n, WINDOW))
+        filled, count = np.zeros(n, dtype=np.int64), np.zeros(n)
+        total, total_sq = np.zeros(n), np.zeros(n)
+        for i, (store, last_date) in enumerate(zip(stores, last_dates)):
+            row = monthly_sales.store_rows[store]
+            end = monthly_sales.month_position(last_date) + 1
+            present = np.flatnonzero(monthly_sales.has_rows[row, :end])
+            if not len(present):
+                continue
+            months = monthly_sales.totals[row, present[0]:end]
+            recent = months[-WINDOW:]
+            history[i, WINDOW - len(recent):] = recent
+            filled[i], count[i] = len(recent), len(months)
+            total[i], total_sq[i] = months.sum(), (months ** 2).sum()
+        next_month = pd.DatetimeIndex(last_dates).month.to_numpy() % 12 + 1
+        return cls(history, filled, count, total, total_sq, next_month)
+
+    def copy(self):
+        state = self.__class__.__new__(self.__class__)
+        state.history = self.history.copy()
+        state.pos = self.pos
+        state.filled = self.filled.copy()
+        state.count, state.total, state.total_sq = self.count.copy(), self.total.copy(), self.total_sq.copy()
+        state.next_month = self.next_month.copy()
+        state.sums = {k: v.copy() for k, v in self.sums.items()}
+        state.sum_sq_3 = self.sum_sq_3.copy()
+        return state
+
+    def take(self, rows):
+        """State for the given row indices (repeats allowed), e.g. one row per simulated path."""
+        state = self.__class__.__new__(self.__class__)
+        state.history = self.history[rows]
+        state.pos = self.pos
+        state.filled = self.filled[rows]
+        state.count, state.total, state.total_sq = self.count[rows], self.total[rows], self.total_sq[rows]
+        state.next_month = self.next_month[rows]
+        state.sums = {k: v[rows] for k, v in self.sums.items()}
+        state.sum_sq_3 = self.sum_sq_3[rows]
+        return state
+
+    def _back(self, k):
+        # Value k pushes ago (1 = newest)
+        return self.history[:, (self.pos - k) % WINDOW]
+
+    def push(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        for k, total in self.sums.items():
+            total += values - self._back(k)
+        self.sum_sq_3 += values ** 2 - self._back(3) ** 2
+        self.history[:, self.pos] = values
+        self.pos = (self.pos + 1) % WINDOW
+        self.filled = np.minimum(self.filled + 1, WINDOW)
+        self.count += 1
+        self.total += values
+        self.total_sq += values ** 2
+        self.next_month = self.next_month % 12 + 1
+
+    def _where_filled(self, k, values):
+        return np.where(self.filled >= k, values, np.nan)
+
+    def features(self):
+        """``{column: (n,) array}`` of derived features for each store's next row."""
+        lag_1 = self._where_filled(1, self._back(1))
+        mean_3 = self._where_filled(3, self.sums[3] / 3)
+        mean_6 = self._where_filled(6, self.sums[6] / 6)
+        var_3 = np.maximum(self.sum_sq_3 - self.sums[3] ** 2 / 3, 0.0) / 2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            store_mean = np.where(self.count > 0, self.total / self.count, np.nan)
+            store_var = (self.total_sq - self.total ** 2 / self.count) / (self.count - 1)
+            store_std = np.where(self.count > 1, np.sqrt(np.maximum(store_var, 0.0)), np.nan)
+            ratio = np.where(store_mean != 0, lag_1 / store_mean, np.nan)
+
+        month = self.next_month
+        holiday = (month >= 11).astype(np.float64)
+        return {
+            "Lag_1": lag_1,
+            "Lag_2": self._where_filled(2, self._back(2)),
+            "Lag_3": self._where_filled(3, self._back(3)),
+            "Lag_12": self._where_filled(12, self._back(12)),
+            "Rolling_3": mean_3,
+            "Rolling_6": mean_6,
+            "Rolling_12": self._where_filled(12, self.sums[12] / 12),
+            "Rolling_Trend": mean_3 - mean_6,
+            "rolling_mean_3": mean_3,
+            "rolling_std_3": self._where_filled(3, np.sqrt(var_3)),
+            "rolling_mean_6": mean_6,
+            "rolling_trend": mean_3 - mean_6,
+            "store_mean_sales": store_mean,
+            "store_std_sales": store_std,
+            "sales_to_avg_ratio": ratio,
+            "Month": month.astype(np.float64),
+            "Quarter": ((month - 1) // 3 + 1).astype(np.float64),
+            "IsYearStart": (month == 1).astype(np.float64),
+            "IsYearEnd": (month == 12).astype(np.float64),
+            "IsHolidayMonth": holiday,
+            "Is_Promotion_Month": holiday,
+            "Month_sin": np.sin(2 * np.pi * month / 12),
+            "Month_cos": np.cos(2 * np.pi * month / 12),
+        }
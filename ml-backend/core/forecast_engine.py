@@ -0,0 +1,351 @@
+"""Vectorized recursive forecast engine.
+
+Instead of copying a one-row DataFrame and calling ``model.predict`` once per
+month per store, every requested store is advanced one horizon step at a time
+as one (n_stores x n_features) matrix, so an all-stores 12-month forecast costs
+12 predict calls regardless of the number of stores.
+
+By default each step recomputes every derived feature for the month being
+forecast (lags, rolling means/std/trend, store mean ratio, calendar columns)
+from a RollingFeatureState seeded with the store's last 12 monthly totals;
+the state updates in O(1) per step as forecasts are appended. Other columns
+(prices, margins, ...) carry over from the latest row.
+
+With ``rolling_state=False`` the original /api/predict loop is reproduced
+instead: every feature stays frozen at the latest row except the lags, taken
+from a window that starts as [Lag_1, Lag_2, Lag_3, Lag_12] and gets each
+prediction appended, with Lag_1/Lag_2/Lag_3/Lag_12 set to its last four
+entries.
+
+``simulate`` runs many noisy copies of each store through the same recursion
+to get prediction intervals (see core/intervals.py).
+
+The per-step path is pandas-free: batch inputs are gathered from the column
+arrays into one preallocated float buffer that the model predicts on through
+``inference.array_predictor`` (INFERENCE_BACKEND picks how).
+"""
+import functools
+
+import numpy as np
+import pandas as pd
+
+from .feature_state import DERIVED_COLUMNS, RollingFeatureState
+from .inference import array_predictor
+from .intervals import DEFAULT_PATHS, DEFAULT_QUANTILES, MAX_SIMULATED_ROWS, residual_draws
+
+RECENT_START = pd.Timestamp("2020-01-01")
+LAG_COLUMNS = ["Lag_1", "Lag_2", "Lag_3", "Lag_12"]
+STRATEGIES = ("recursive", "direct")
+MAX_MONTHS = 24  # longest horizon the predict routes accept
+
+
+class ForecastBatch:
+    """Starting state for a set of stores, one row per store."""
+
+    def __init__(self, stores, features, lags, last_dates, category_names, category_shares, rolling=None):
+        self.stores = stores                    # store numbers, row order of every array
+        self.features = features                # (n, n_features) latest-row model inputs
+        self.lags = lags                        # (n, 4) initial lag window
+        self.last_dates = last_dates            # latest dated row per store
+        self.category_names = category_names    # e.g. "Vodka" for Vodka_Sales
+        self.category_shares = category_shares  # (n, n_categories) share of the latest month
+        self.rolling = rolling                  # RollingFeatureState after the latest month, if used
+
+    def __len__(self):
+        return len(self.stores)
+
+    def row(self, store):
+        return self.stores.index(store)
+
+    def take(self, rows):
+        """Batch of the given row indices (repeats allowed), e.g. one row per simulated path."""
+        return ForecastBatch(
+            stores=[self.stores[i] for i in rows],
+            features=self.features[rows],
+            lags=self.lags[rows],
+            last_dates=self.last_dates[rows],
+            category_names=self.category_names,
+            category_shares=self.category_shares[rows],
+            rolling=self.rolling.take(rows) if self.rolling is not None else None,
+        )
+
+
+class ForecastEngine:
+    def __init__(self, model_features, since=RECENT_START, rolling_state=True, batcher=None):
+        self.model_features = list(model_features)
+        self.since = since
+        self.rolling_state = rolling_state
+        # Identifies how forecasts are produced, for anything persisted from them
+        self.mode = "rolling" if rolling_state else "frozen"
+        # Columns recomputed every step from the rolling state, name -> column
+        self._derived_slots = [
+            (col, j) for j, col in enumerate(self.model_features) if col in DERIVED_COLUMNS
+        ]
+        # Positions of the lag features the recursion overwrites, window offset -> column
+        self._lag_slots = [
+            (offset, self.model_features.index(col))
+            for offset, col in zip((1, 2, 3, 4), LAG_COLUMNS)
+            if col in self.model_features
+        ]
+        self._predictor = None  # (model, predict_fn) for the last model seen
+        # MicroBatcher shared by concurrent forecasts, if any
+        self.batcher = batcher
+
+    def prepare(self, snapshot, stores):
+        """Gather each store's latest row (dated at or after ``since``) into a batch.
+
+        Stores without such a row are left out of the batch. Values are read
+        straight from the column arrays; no DataFrame is built.
+        """
+        categories = snapshot.category_features
+        wanted = dict.fromkeys([*self.model_features, *LAG_COLUMNS, *categories, "Date"])
+        found, values = snapshot.store_index.latest_values(stores, wanted, since=self.since)
+        n = len(found)
+
+        # Features absent from the table stay 0, like DataFrame.reindex(fill_value=0)
+        features = np.zeros((n, len(self.model_features)))
+        for j, col in enumerate(self.model_features):
+            if col in values:
+                features[:, j] = values[col]
+
+        lags = np.zeros((n, len(LAG_COLUMNS)))
+        for j, col in enumerate(col for col in LAG_COLUMNS if col in values):
+            lags[:, j] = values[col]
+
+        totals_by_category = np.column_stack([values[cat] for cat in categories]) if categories else np.zeros((n, 0))
+        totals = totals_by_category.sum(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = np.where(totals > 0, totals_by_category / totals, 0)
+
+        last_dates = pd.DatetimeIndex(values["Date"]) if n else pd.DatetimeIndex([])
+        rolling = None
+        if self.rolling_state:
+            rolling = RollingFeatureState.from_monthly_sales(snapshot.monthly_sales, found, last_dates)
+
+        return ForecastBatch(
+            stores=list(found),
+            features=features,
+            lags=lags,
+            last_dates=last_dates,
+            category_names=[cat.replace("_Sales", "") for cat in categories],
+            category_shares=shares,
+            rolling=rolling,
+        )
+
+    def _predict_fn(self, model):
+        cached = self._predictor
+        if cached is None or cached[0] is not model:
+            predict_fn = array_predictor(model, self.model_features)
+            if self.batcher is not None:
+                predict_fn = self.batcher.wrap(predict_fn)
+            cached = self._predictor = (model, predict_fn)
+        return cached[1]
+
+    def predict(self, model, batch, months):
+        """Run the recursion; returns an (n_stores x months) array of forecasts."""
+        return self._recurse(self._predict_fn(model), batch, months)
+
+    def _recurse(self, predict_fn, batch, months, ratios=None):
+        # ``ratios`` (n x months), if given, scales each step's predictions before they feed back
+        n = len(batch)
+        if not n or months <= 0:
+            return np.empty((n, max(months, 0)))
+        out = np.empty((n, months))
+        if self.batcher is None:
+            return self._run_steps(predict_fn, batch, out, ratios)
+        # Concurrent recursions hand their steps to the batcher together
+        with self.batcher.session():
+            return self._run_steps(predict_fn, batch, out, ratios)
+
+    def _run_steps(self, predict_fn, batch, out, ratios):
+        n, months = out.shape
+        if batch.rolling is not None:
+            return self._predict_rolling(predict_fn, batch, out, ratios)
+
+        # Lag window grows by one column per step; the last four entries feed the next step
+        window = np.empty((n, len(LAG_COLUMNS) + months))
+        window[:, :len(LAG_COLUMNS)] = batch.lags
+        # One preallocated feature buffer; each step only rewrites the lag columns in place
+        X = batch.features.copy()
+        for step in range(months):
+            width = len(LAG_COLUMNS) + step
+            for offset, col in self._lag_slots:
+                X[:, col] = window[:, width - offset]
+            y = predict_fn(X)
+            if ratios is not None:
+                y *= ratios[:, step]
+            window[:, width] = y
+            out[:, step] = y
+        return out
+
+    def _predict_rolling(self, predict_fn, batch, out, ratios=None):
+        state = batch.rolling.copy()
+        # One preallocated feature buffer; each step rewrites the derived columns in place
+        X = batch.features.copy()
+        for step in range(out.shape[1]):
+            derived = state.features()
+            for col, j in self._derived_slots:
+                X[:, j] = derived[col]
+            y = predict_fn(X)
+            if ratios is not None:
+                y *= ratios[:, step]
+            state.push(y)
+            out[:, step] = y
+        return out
+
+    def simulate(self, model, batch, months, residuals, paths=DEFAULT_PATHS, quantiles=DEFAULT_QUANTILES):
+        """(n_stores x months x n_quantiles) quantiles of ``paths`` simulated recursions per store.
+
+        Each path multiplies every step's prediction by a ratio drawn from the
+        pooled residuals before feeding it back; see core/intervals.py.
+        """
+        n = len(batch)
+        if not n or months <= 0:
+            return np.empty((n, max(months, 0), len(quantiles)))
+        out = np.empty((n, months, len(quantiles)))
+        predict_fn = self._predict_fn(model)
+        stores_per_call = max(1, MAX_SIMULATED_ROWS // paths)
+        for start in range(0, n, stores_per_call):
+            rows = np.arange(start, min(start + stores_per_call, n))
+            ratios = np.concatenate([residual_draws(batch.stores[row], residuals, paths, months) for row in rows])
+            simulated = self._recurse(predict_fn, batch.take(np.repeat(rows, paths)), months, ratios)
+            out[rows] = np.moveaxis(np.quantile(simulated.reshape(len(rows), paths, months), quantiles, axis=1), 0, -1)
+        return out
+
+    def predict_direct(self, direct_models, batch, months):
+        """All horizons at once from the latest rows, one model per horizon."""
+        X = batch.features
+        if direct_models.model_features != self.model_features:
+            X = pd.DataFrame(X, columns=self.model_features).reindex(
+                columns=direct_models.model_features, fill_value=0
+            ).to_numpy()
+        return direct_models.predict(X, months)
+
+    def forecast(self, snapshot, stores, months, strategy="recursive"):
+        """``(batch, values)`` using the "recursive" or "direct" strategy."""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"unknown strategy {strategy!r}")
+        batch = self.prepare(snapshot, stores)
+        if strategy == "direct":
+            if snapshot.direct_models is None:
+                raise ValueError("no direct models are loaded")
+            return batch, self.predict_direct(snapshot.direct_models, batch, months)
+        return batch, self.predict(snapshot.model, batch, months)
+
+    def intervals(self, snapshot, batch, months, strategy="recursive", paths=DEFAULT_PATHS,
+                  quantiles=DEFAULT_QUANTILES):
+        """Simulated [lower, upper] per store and month, or None to keep the fixed band.
+
+        Only recursive forecasts are simulated, and only when the snapshot has
+        a residual store.
+        """
+        if strategy != "recursive" or snapshot.residuals is None:
+            return None
+        return self.simulate(snapshot.model, batch, months, snapshot.residuals, paths, quantiles)
+
+
+def strategy_error(snapshot, strategy, months):
+    """Why ``strategy`` can't serve ``months`` on ``snapshot``, or None if it can."""
+    if strategy not in STRATEGIES:
+        return f"'strategy' must be one of {', '.join(STRATEGIES)}"
+    if strategy == "direct":
+        direct_models = snapshot.direct_models
+        if direct_models is None:
+            return "Direct forecasts are not available: no direct models are loaded"
+        if not 1 <= months <= direct_models.horizons:
+            return f"Direct forecasts cover 1 to {direct_models.horizons} months"
+    return None
+
+
+def month_starts(last_date, months):
+    """The ``months`` month starts following ``last_date``'s month."""
+    first = np.datetime64(pd.Timestamp(last_date), "M")
+    return pd.DatetimeIndex((first + np.arange(1, months + 1)).astype("datetime64[ns]"))
+
+
+@functools.lru_cache(maxsize=1024)
+def _month_strings(month):
+    """``month_start`` and ``label`` of a month number (months since 1970-01)."""
+    start = pd.Timestamp(np.datetime64(month, "M"))
+    return start.strftime("%Y-%m-%d"), start.strftime("%B %Y")
+
+
+def _month_numbers(month_starts):
+    return np.asarray(month_starts, dtype="datetime64[M]").astype(np.int64).tolist()
+
+
+def actual_timeline(month_starts, month_totals, last=6):
+    """The last ``last`` monthly totals as "actual" timeline entries."""
+    # Whole-dollar values rounded as one array; the JSON encoder takes the int64s as they are
+    values = np.rint(month_totals[-last:]).astype(np.int64)
+    entries = []
+    for i, (month, value) in enumerate(zip(_month_numbers(month_starts[-last:]), values), start=-last):
+        month_start, label = _month_strings(month)
+        entries.append({
+            "week": i,
+            "type": "actual",
+            "value": value,
+            "month_start": month_start,
+            "label": label
+        })
+    return entries
+
+
+def forecast_timeline(batch, values, row, intervals=None):
+    """Timeline entries for one batch row, in the /api/predict response format.
+
+    ``intervals`` from ForecastEngine.intervals gives lower/upper; without it
+    they are a fixed +/-10% around the forecast. Values are rounded a whole
+    row at a time and left as NumPy scalars for the JSON encoder.
+    """
+    y = np.asarray(values[row], dtype=np.float64)
+    if intervals is None:
+        lower, upper = y * 0.9, y * 1.1
+    else:
+        lower, upper = intervals[row, :, 0], intervals[row, :, -1]
+    value, lower, upper = np.round(y, 2), np.round(lower, 2), np.round(upper, 2)
+
+    # Category amounts in the shares' precision, as the per-value loop computed them
+    shares = batch.category_shares[row]
+    amounts = y.astype(shares.dtype)[:, None] * shares
+    shown = amounts > 10
+    amounts = np.round(amounts.astype(np.float64), 2)
+    names = batch.category_names
+
+    entries = []
+    last_month = int(np.datetime64(pd.Timestamp(batch.last_dates[row]), "M").astype(np.int64))
+    for i in range(len(y)):
+        month_start, label = _month_strings(last_month + i + 1)
+        entries.append({
+            "month": i + 1,
+            "type": "forecast",
+            "value": value[i],
+            "lower": lower[i],
+            "upper": upper[i],
+            "category_breakdown": {names[j]: amounts[i, j] for j in np.flatnonzero(shown[i])},
+            "month_start": month_start,
+            "label": label
+        })
+    return entries
+
+
+def store_response(snapshot, batch, values, row, intervals=None):
+    """The full /api/predict body (timeline + store_info) for one batch row."""
+    store = batch.stores[row]
+    month_starts, month_totals = snapshot.monthly_sales.store_series(store, since=RECENT_START)
+    timeline = actual_timeline(month_starts, month_totals)
+    timeline.extend(forecast_timeline(batch, values, row, intervals))
+
+    info = snapshot.store_index.frame(store)[["City", "County"]].dropna().iloc[0]
+    peak_pos = int(month_totals.argmax())
+    return {
+        "timeline": timeline,
+        "store_info": {
+            "store_number": store,
+            "city": info["City"],
+            "county": info["County"],
+            "avg_sales": round(float(month_totals.mean()), 2),
+            "peak_month": month_starts[peak_pos].strftime("%B %Y"),
+            "peak_value": round(float(month_totals[peak_pos]), 2)
+        }
+    }
@@ -0,0 +1,129 @@
+"""Precomputed /api/predict responses for every store.
+
+Forecasts only change when features.csv or model.pkl does, so each snapshot
+version gets a table built once with one batched ForecastEngine run. For every
+store it holds the serialized response for the longest horizon, laid out as the
+JSON head (store_info plus actual history) followed by one fragment per
+forecast month. A recursive forecast for ``m`` months is the first ``m`` months
+of a longer one, so the body for any horizon up to ``TABLE_MONTHS`` is a single
+byte slice of that layout plus the closing ``]}``. The table holds the default
+response, with the fixed lower/upper band; requests for simulated intervals
+are computed live.
+
+Tables live in the features cache directory keyed by the source CSV, the
+snapshot version and the engine's recursion mode, are memory-mapped, and can be
+built ahead of time with precompute_forecasts.py. Attaching a table removes the
+same CSV's tables for other snapshot versions or table formats once no live
+process has them mapped (see core/store_dirs.py).
+"""
+import os
+import shutil
+import time
+
+import numpy as np
+
+from .feature_cache import CACHE_DIR_NAME
+from .forecast_engine import store_response
+from .json_codec import dumps
+from .store_dirs import hold, remove_superseded, source_key
+
+TABLE_MONTHS = 12
+TABLE_FORMAT = "3"
+TABLE_PREFIX = "forecasts-"
+
+
+def _table_source(features_path):
+    return f"{TABLE_PREFIX}{source_key(features_path)}-"
+
+
+def forecast_table_dir(features_path, snapshot, engine, months=TABLE_MONTHS):
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(features_path)), CACHE_DIR_NAME)
+    name = f"{_table_source(features_path)}{TABLE_FORMAT}-{snapshot.version}-{engine.mode}-h{months}"
+    return os.path.join(cache_dir, name)
+
+
+def build_forecast_table(snapshot, engine, table_dir, months=TABLE_MONTHS):
+    """Forecast every store ``months`` ahead and write the serialized responses."""
+    t0 = time.perf_counter()
+    stores = [int(s) for s in snapshot.store_index.stores]
+    batch, forecasts = engine.forecast(snapshot, stores, months)
+
+    chunks, offsets, built = [], [], []
+    position = 0
+    for row, store in enumerate(batch.stores):
+        try:
+            body = store_response(snapshot, batch, forecasts, row)
+        except (IndexError, KeyError, ValueError):
+            # Left to the live path, which reports the error for this store
+            continue
+
+        history = body["timeline"][:-months]
+        info = body["store_info"]
+        pieces = [b'{"store_info":' + dumps(info) + b',"timeline":[' + b",".join(dumps(e) for e in history)]
+        for i, entry in enumerate(body["timeline"][-months:]):
+            pieces.append((b"," if history or i else b"") + dumps(entry))
+
+        ends = []
+        for piece in pieces:
+            chunks.append(piece)
+            position += len(piece)
+            ends.append(position)
+        offsets.append([ends[0] - len(pieces[0])] + ends)
+        built.append(store)
+
+    tmp_dir = f"{table_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, "stores.npy"), np.asarray(built, dtype=np.int64))
+    np.save(os.path.join(tmp_dir, "offsets.npy"), np.asarray(offsets, dtype=np.int64).reshape(-1, months + 2))
+    np.save(os.path.join(tmp_dir, "bodies.npy"), np.frombuffer(b"".join(chunks), dtype=np.uint8))
+    try:
+        os.rename(tmp_dir, table_dir)
+    except OSError:
+        # Another worker finished the same table first; keep theirs
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.exists(os.path.join(table_dir, "bodies.npy")):
+            raise
+    print(f"🗂️ Precomputed {len(built)} stores x {months} months in {time.perf_counter() - t0:.2f}s -> {table_dir}")
+
+
+class ForecastTable:
+    """Read-only view over a built table; ``response`` returns JSON bytes or None."""
+
+    def __init__(self, table_dir):
+        self.table_dir = table_dir
+        hold(table_dir, self)
+        stores = np.load(os.path.join(table_dir, "stores.npy"))
+        self.rows = {int(store): i for i, store in enumerate(stores)}
+        self.offsets = np.load(os.path.join(table_dir, "offsets.npy"))
+        self.bodies = np.load(os.path.join(table_dir, "bodies.npy"), mmap_mode="r")
+        self.months = self.offsets.shape[1] - 2
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, store):
+        return store in self.rows
+
+    def response(self, store, months):
+        """The /api/predict body for ``store`` and ``months``, or None if not in the table."""
+        row = self.rows.get(store)
+        if row is None or not 1 <= months <= self.months:
+            return None
+        start, end = self.offsets[row, 0], self.offsets[row, months + 1]
+        return self.bodies[start:end].tobytes() + b"]}"
+
+
+def open_forecast_table(features_path, snapshot, engine, months=TABLE_MONTHS):
+    """Attach to the table for ``snapshot``, building it first if needed."""
+    table_dir = forecast_table_dir(features_path, snapshot, engine, months)
+    if not os.path.exists(os.path.join(table_dir, "bodies.npy")):
+        os.makedirs(os.path.dirname(table_dir), exist_ok=True)
+        build_forecast_table(snapshot, engine, table_dir, months)
+    table = ForecastTable(table_dir)
+
+    # Tables of this version in another mode or horizon stay; older versions go
+    source = _table_source(features_path)
+    for name in remove_superseded(os.path.dirname(table_dir), source, f"{source}{TABLE_FORMAT}-{snapshot.version}-"):
+        print(f"🧹 Removed superseded forecast table {name}")
+    return table
@@ -0,0 +1,177 @@
+"""Array-in, array-out predictors for the forecast model.
+
+``model.predict`` on an unpickled XGBRegressor builds a DataFrame check and a
+DMatrix on every call, which dominates 1-row forecasts. ``array_predictor``
+returns a plain ``predict(X)`` for float matrices whose columns follow
+``model_features``, using one of these backends (INFERENCE_BACKEND):
+
+``native``    Booster.inplace_predict on the array; INFERENCE_THREADS pins
+              the booster's thread count (1 avoids thread start-up per call
+              on small inputs). The default.
+``compiled``  The gbtree ensemble flattened into NumPy node arrays and
+              evaluated for all trees at once, level by level. Splits and leaf
+              sums use float32 exactly as XGBoost does, so results match
+              ``model.predict``. Needs no native toolchain. It wins on the
+              1-row inputs of single-store forecasts; batches above
+              COMPILED_MAX_ROWS rows go to inplace_predict, which is faster
+              there.
+``model``     ``model.predict`` on a DataFrame (any estimator).
+
+Non-XGBoost models always use ``model``. validate_snapshot checks the chosen
+backend against ``model.predict`` before a snapshot goes live.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+INFERENCE_BACKENDS = ("native", "compiled", "model")
+# Objectives whose prediction is the raw margin, so the leaf sum is the output
+IDENTITY_OBJECTIVES = ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror")
+COMPILED_MAX_ROWS = 32
+
+
+def _iteration_range(model):
+    # Same trees model.predict would use when the model was early-stopped
+    try:
+        return (0, model.best_iteration + 1)
+    except AttributeError:
+        return (0, 0)
+
+
+def _column_order(booster, model_features):
+    """Indices reordering ``model_features`` columns into the booster's order, or None."""
+    names = booster.feature_names
+    if names is None or list(names) == list(model_features):
+        return None
+    missing_features = [name for name in names if name not in model_features]
+    if missing_features:
+        raise ValueError(f"model expects features that are not provided: {missing_features}")
+    return [list(model_features).index(name) for name in names]
+
+
+class CompiledEnsemble:
+    """A gbtree regressor as flat node arrays over (n_trees x max_nodes) slots.
+
+    Node ``t * max_nodes + i`` is node ``i`` of tree ``t``; child arrays hold
+    flat indices, and leaves point at themselves so every tree can take the
+    same number of steps.
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, leaf_value, roots, depth, base_score):
+        self.feature = feature            # split feature per node (0 on leaves)
+        self.threshold = threshold        # float32 split condition
+        self.left = left                  # child for x < threshold
+        self.right = right
+        self.default_left = default_left  # where missing values go
+        self.leaf_value = leaf_value      # float32, 0 on inner nodes
+        self.roots = roots
+        self.depth = depth
+        self.base_score = np.float32(base_score)
+
+    @classmethod
+    def from_xgboost(cls, model):
+        booster = model.get_booster()
+        config = json.loads(booster.save_config())
+        learner = config["learner"]
+        objective = learner["objective"]["name"]
+        if learner["gradient_booster"]["name"] != "gbtree" or objective not in IDENTITY_OBJECTIVES:
+            raise ValueError(f"cannot compile {learner['gradient_booster']['name']}/{objective} models")
+        if int(learner["learner_model_param"].get("num_target", 1)) > 1:
+            raise ValueError("cannot compile multi-target models")
+        base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+
+        trees = json.loads(booster.save_raw(raw_format="json"))["learner"]["gradient_booster"]["model"]["trees"]
+        first, last = _iteration_range(model)
+        if last:
+            trees = trees[first:last]
+
+        width = max(len(tree["left_children"]) for tree in trees)
+        size = len(trees) * width
+        feature = np.zeros(size, dtype=np.int64)
+        threshold = np.zeros(size, dtype=np.float32)
+        left = np.arange(size)
+        right = left.copy()
+        default_left = np.zeros(size, dtype=bool)
+        leaf_value = np.zeros(size, dtype=np.float32)
+        depth = 0
+        for t, tree in enumerate(trees):
+            lc = np.asarray(tree["left_children"])
+            rc = np.asarray(tree["right_children"])
+            cond = np.asarray(tree["split_conditions"], dtype=np.float32)
+            inner = lc != -1
+            slots = slice(t * width, t * width + len(lc))
+            feature[slots] = np.where(inner, tree["split_indices"], 0)
+            threshold[slots] = np.where(inner, cond, 0)
+            left[slots] = np.where(inner, t * width + lc, left[slots])
+            right[slots] = np.where(inner, t * width + rc, right[slots])
+            default_left[slots] = np.asarray(tree["default_left"], dtype=bool)
+            leaf_value[slots] = np.where(inner, 0, cond)
+            depth = max(depth, _tree_depth(lc, rc))
+        roots = np.arange(len(trees)) * width
+        return cls(feature, threshold, left, right, default_left, leaf_value, roots, depth, base_score)
+
+    def predict(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n, n_features = X.shape
+        node = np.broadcast_to(self.roots, (n, len(self.roots))).copy()
+        row_base = (np.arange(n) * n_features)[:, None]
+        flat = X.ravel()
+        for _ in range(self.depth):
+            x = flat.take(row_base + self.feature.take(node))
+            go_left = np.where(np.isnan(x), self.default_left.take(node), x < self.threshold.take(node))
+            node = np.where(go_left, self.left.take(node), self.right.take(node))
+        # XGBoost adds tree outputs one at a time in float32 onto the base score
+        steps = np.concatenate([np.full((n, 1), self.base_score), self.leaf_value.take(node)], axis=1)
+        return np.cumsum(steps, axis=1, dtype=np.float32)[:, -1].astype(np.float64)
+
+
+def _tree_depth(left_children, right_children):
+    depth, frontier = 0, [0]
+    while True:
+        frontier = [c for n in frontier for c in (left_children[n], right_children[n]) if c != -1]
+        if not frontier:
+            return depth
+        depth += 1
+
+
+def array_predictor(model, model_features, backend=None, threads=None):
+    """Return ``predict(X) -> float64 array`` for matrices whose columns follow ``model_features``.
+
+    ``backend`` and ``threads`` default to INFERENCE_BACKEND / INFERENCE_THREADS.
+    """
+    backend = backend or os.environ.get("INFERENCE_BACKEND", "native")
+    if backend not in INFERENCE_BACKENDS:
+        raise ValueError(f"INFERENCE_BACKEND must be one of {', '.join(INFERENCE_BACKENDS)}, not {backend!r}")
+    if threads is None and os.environ.get("INFERENCE_THREADS"):
+        threads = int(os.environ["INFERENCE_THREADS"])
+
+    booster = model.get_booster() if hasattr(model, "get_booster") else None
+    if booster is None or backend == "model":
+        def predict(X):
+            return np.asarray(model.predict(pd.DataFrame(X, columns=model_features)), dtype=np.float64)
+        return predict
+
+    order = _column_order(booster, model_features)
+
+    if threads:
+        booster.set_param({"nthread": threads})
+    iteration_range = _iteration_range(model)
+    missing = getattr(model, "missing", np.nan)
+
+    def native(X):
+        return np.asarray(
+            booster.inplace_predict(X, iteration_range=iteration_range, missing=missing, validate_features=False),
+            dtype=np.float64,
+        )
+
+    ensemble = CompiledEnsemble.from_xgboost(model) if backend == "compiled" else None
+
+    def predict(X):
+        if order is not None:
+            X = X[:, order]
+        if ensemble is not None and len(X) <= COMPILED_MAX_ROWS:
+            return ensemble.predict(X)
+        return native(X)
+    return predict
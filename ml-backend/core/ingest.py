@@ -0,0 +1,165 @@
+"""Incremental monthly ingestion into features.csv.
+
+Appending a month used to mean regenerating the whole features file offline.
+Instead, ``ingest_month`` keeps a per-store StoreFeatureState (last 12 monthly
+totals plus expanding sums), derives the lag/rolling columns for just the new
+rows and appends them to the CSV, so a refresh costs O(new rows).
+
+The state is saved next to the feature cache together with the CSV's size and
+mtime after the last append. If the CSV was replaced by other means since, the
+state is rebuilt once from the full table.
+"""
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import MonthlySales
+from .feature_cache import CACHE_DIR_NAME, _write_atomic, load_features
+from .feature_state import DERIVED_COLUMNS, WINDOW, StoreFeatureState
+from .store_index import StoreIndex
+
+STATE_FILE_NAME = "ingest_state.pkl"
+CARRY_FORWARD_COLUMNS = ["City", "County"]
+REQUIRED_RAW_COLUMNS = ["Store Number", "Date", "Total_Sales"]
+
+
+def _month_ordinal(ts):
+    return ts.year * 12 + ts.month - 1
+
+
+def _state_path(features_path):
+    return os.path.join(os.path.dirname(os.path.abspath(features_path)), CACHE_DIR_NAME, STATE_FILE_NAME)
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def build_state(features_path):
+    """Rebuild every store's rolling state from the full features table."""
+    store_index = StoreIndex(load_features(features_path))
+    df = store_index.df
+    monthly_sales = MonthlySales(store_index, df)
+
+    states = {}
+    for store in store_index.offsets:
+        series = monthly_sales.store_series(store)
+        if series is None:
+            continue
+        month_starts, totals = series
+        state = StoreFeatureState.from_series(totals[-WINDOW:], _month_ordinal(month_starts[-1]))
+        # Expanding mean/std cover the whole history, not just the ring buffer
+        state.count = len(totals)
+        state.total = float(totals.sum())
+        state.total_sq = float(np.square(totals).sum())
+        last_row = store_index.frame(store).iloc[-1]
+        state.carry = {col: last_row[col] for col in CARRY_FORWARD_COLUMNS if col in df.columns}
+        states[store] = state
+    return states
+
+
+def load_state(features_path):
+    """Load the saved state if it still matches ``features_path``, else rebuild it."""
+    try:
+        with open(_state_path(features_path), "rb") as f:
+            saved = pickle.load(f)
+        if saved["stamp"] == _stamp(features_path):
+            return saved["states"]
+    except (OSError, KeyError, pickle.UnpicklingError, EOFError):
+        pass
+    print("🧮 Rebuilding ingestion state from the full features table")
+    return build_state(features_path)
+
+
+def save_state(features_path, states):
+    path = _state_path(features_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def write(tmp_path):
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"stamp": _stamp(features_path), "states": states}, f)
+
+    _write_atomic(path, write)
+
+
+def derive_rows(raw, states, columns):
+    """Build features.csv rows for one month of raw per-store sales.
+
+    ``raw`` needs Store Number, Date and a finite Total_Sales (a month with
+    no sales is 0, not blank); any other raw column that features.csv has
+    (category *_Sales, prices, ...) is passed through. ``states`` is updated
+    in place.
+    """
+    missing = [col for col in REQUIRED_RAW_COLUMNS if col not in raw.columns]
+    if missing:
+        raise ValueError(f"raw sales are missing columns: {missing}")
+
+    raw = raw.copy()
+    # Checked before any state changes: one NaN pushed would poison the store's
+    # expanding mean/std for good and its rolling windows for a year
+    raw["Total_Sales"] = pd.to_numeric(raw["Total_Sales"], errors="coerce")
+    bad = raw.loc[~np.isfinite(raw["Total_Sales"].to_numpy(dtype=np.float64)), "Store Number"]
+    if len(bad):
+        raise ValueError(f"raw sales have missing or non-finite Total_Sales for stores: {sorted(bad.unique().tolist())}")
+    raw["Date"] = pd.to_datetime(raw["Date"]).dt.to_period("M").dt.to_timestamp()
+    raw = raw.sort_values(["Store Number", "Date"])
+    if raw.duplicated(["Store Number", "Date"]).any():
+        raise ValueError("raw sales have more than one row per store and month")
+
+    rows = []
+    for record in raw.to_dict(orient="records"):
+        store = int(record["Store Number"])
+        month_start = record["Date"]
+        month = _month_ordinal(month_start)
+
+        state = states.get(store)
+        if state is None:
+            state = states[store] = StoreFeatureState()
+        state.advance_to(month)
+
+        row = dict(state.carry)
+        row.update(state.features(month_start))
+        row.update({col: value for col, value in record.items() if col in columns})
+        row["Date"] = month_start.strftime("%Y-%m-%d")
+        rows.append(row)
+
+        state.push(record["Total_Sales"])
+        if state.last_month is None:
+            state.last_month = month
+        state.carry.update({col: row[col] for col in CARRY_FORWARD_COLUMNS if col in row})
+
+    return pd.DataFrame(rows).reindex(columns=columns)
+
+
+def ingest_month(features_path, raw):
+    """Append one month of raw per-store sales to ``features_path``.
+
+    Returns the appended rows. Workers pick the new file up through the
+    snapshot watcher or POST /api/admin/reload.
+    """
+    columns = list(pd.read_csv(features_path, nrows=0).columns)
+    unknown = [col for col in DERIVED_COLUMNS if col in raw.columns]
+    if unknown:
+        raise ValueError(f"raw sales should not include derived columns: {unknown}")
+
+    states = load_state(features_path)
+    rows = derive_rows(raw, states, columns)
+
+    with open(features_path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+        else:
+            needs_newline = False
+    with open(features_path, "a", encoding="utf-8", newline="") as f:
+        if needs_newline:
+            f.write("\n")
+        rows.to_csv(f, header=False, index=False, lineterminator="\n")
+
+    save_state(features_path, states)
+    print(f"📥 Appended {len(rows)} rows to {features_path}")
+    return rows
@@ -0,0 +1,83 @@
+"""Simulation-based prediction intervals for recursive forecasts.
+
+A backtest of the recursive model (build_residuals.py) leaves a residual store:
+the one-month-ahead errors it made on months it was not trained on, kept as
+ratios actual / predicted, pooled over all stores. An interval is then
+simulated per store: ``paths`` copies of the store are forecast side by side,
+and at each step every copy's prediction is multiplied by a ratio drawn from
+that pool before it is fed back as the next step's lags and rolling features.
+Errors therefore compound over the horizon the way real ones do, and
+``lower``/``upper`` are quantiles of the simulated paths at each month.
+
+All paths of a store (and of as many stores as fit in MAX_SIMULATED_ROWS) are
+one (rows x n_features) matrix per step, so 1000 paths cost 12 predict calls
+for a 12-month forecast. Draws are seeded per store, so a store gets the same
+interval from /api/predict and /api/predict/batch.
+
+Simulation costs ``paths`` recursions per store, so it only runs for requests
+that ask for it (``"intervals": true``, or their own ``paths``/``quantiles``).
+Other requests, and every request when there is no residual store, get the
+old +/-10% band.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+RESIDUALS_NAME = "residuals.npy"
+DEFAULT_PATHS = 500
+MAX_PATHS = 5000
+DEFAULT_QUANTILES = (0.1, 0.9)
+INTERVAL_SEED = 20240101
+# Rows per predict call when simulating many stores at once
+MAX_SIMULATED_ROWS = 100_000
+
+
+def backtest_residuals(df, model_features, holdout_months, params=None):
+    """One-month-ahead actual / predicted ratios over the last ``holdout_months`` months.
+
+    A model with ``params`` is trained on the earlier rows and predicts each
+    held-out row from its own features, as the first recursive step would.
+    """
+    from xgboost import XGBRegressor
+
+    last_month = df["Date"].max().replace(day=1)
+    cutoff = last_month - pd.DateOffset(months=holdout_months - 1)
+    train, test = df[df["Date"] < cutoff], df[df["Date"] >= cutoff]
+    model = XGBRegressor(**(params or {}))
+    model.fit(train.reindex(columns=model_features, fill_value=0), train["Total_Sales"])
+
+    predicted = model.predict(test.reindex(columns=model_features, fill_value=0)).astype(np.float64)
+    actual = test["Total_Sales"].to_numpy(dtype=np.float64)
+    usable = (predicted > 0) & np.isfinite(actual)
+    return actual[usable] / predicted[usable]
+
+
+def load_residuals(path):
+    """The residual ratios saved at ``path``, or None when the file doesn't exist."""
+    if not os.path.exists(path):
+        return None
+    return np.load(path)
+
+
+def intervals_requested(data):
+    """True if the request body ``data`` asks for simulated intervals."""
+    return bool(data.get("intervals")) or "paths" in data or "quantiles" in data
+
+
+def interval_error(paths, quantiles):
+    """Why ``paths``/``quantiles`` can't be simulated, or None if they can."""
+    if not 1 <= paths <= MAX_PATHS:
+        return f"'paths' must be between 1 and {MAX_PATHS}"
+    if len(quantiles) != 2 or not 0 <= quantiles[0] < quantiles[1] <= 1:
+        return "'quantiles' must be [lower, upper] with 0 <= lower < upper <= 1"
+    return None
+
+
+def residual_draws(store, residuals, paths, months, seed=INTERVAL_SEED):
+    """(paths x months) ratios drawn from the pooled ``residuals``, the same on every call for ``store``.
+
+    Drawn month by month, so a shorter horizon gets a prefix of a longer one's draws.
+    """
+    rng = np.random.default_rng([seed, store])
+    return residuals[rng.integers(len(residuals), size=(months, paths))].T
@@ -0,0 +1,60 @@
+"""JSON encoding for API response bodies.
+
+The forecast helpers hand over NumPy values as they come out of the model
+(float64/int64 scalars, arrays), so nothing has to be converted value by
+value before serialization. ``dumps`` encodes them with orjson (listed in
+requirements.txt), which serializes NumPy natively in C. The stdlib encoder
+plus a NumPy ``default`` is kept as a fallback for environments without it,
+and create_app logs a warning when it has to be used. Output is compact with sorted keys
+either way, like Flask's jsonify, so precomputed bodies (the forecast table,
+NDJSON lines) match what a route would have sent.
+
+JSON_ENCODER picks the encoder: "orjson" (the default) or "stdlib".
+"""
+import json
+import os
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # required (requirements.txt); the stdlib encoder is only a fallback
+    orjson = None
+
+ENCODERS = ("orjson", "stdlib")
+
+
+def default(obj):
+    """NumPy values for encoders that don't know them; anything else is an error."""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def resolve_encoder(name=None):
+    name = name or os.environ.get("JSON_ENCODER") or ("orjson" if orjson is not None else "stdlib")
+    if name not in ENCODERS:
+        raise ValueError(f"JSON_ENCODER must be one of {ENCODERS}, got {name!r}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("JSON_ENCODER=orjson needs the orjson package")
+    return name
+
+
+def dumps(obj, encoder=None, indent=False, default=default):
+    """``obj`` as UTF-8 JSON bytes; ``default`` is called for types neither encoder knows."""
+    if resolve_encoder(encoder) == "orjson":
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    separators = None if indent else (",", ":")
+    return json.dumps(obj, sort_keys=True, indent=2 if indent else None, separators=separators,
+                      default=default).encode("utf-8")
+
+
+def loads(data, encoder=None):
+    if resolve_encoder(encoder) == "orjson":
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,114 @@
+"""Chat-completion requests for the LLM-backed routes.
+
+Prompts and payloads for /api/explain_forecast and /api/compare_store are
+built here once. The Flask routes send them with ``chat_completion``, which
+blocks the worker until the LLM answers; asgi.py awaits
+``async_chat_completion`` on one shared httpx.AsyncClient instead.
+
+LLM_API_URL points both at any OpenAI-compatible endpoint (Groq by default,
+benchmarks/mock_llm_server.py in load tests); LLM_TIMEOUT_SECONDS bounds a
+call.
+"""
+import os
+
+import requests
+
+DEFAULT_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+LLM_MODEL = "llama3-8b-8192"
+
+
+class LLMError(Exception):
+    """The LLM endpoint answered with a non-200 status."""
+
+    def __init__(self, status, text):
+        super().__init__(f"LLM request failed with {status}: {text}")
+        self.status = status
+        self.text = text
+
+
+def api_url():
+    return os.environ.get("LLM_API_URL", DEFAULT_API_URL)
+
+
+def request_timeout():
+    return float(os.environ.get("LLM_TIMEOUT_SECONDS", 30))
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {os.environ.get('GROQ_API_KEY')}",
+        "Content-Type": "application/json"
+    }
+
+
+def explain_payload(timeline):
+    """Payload explaining the forecast entries of ``timeline``, or None if it has none."""
+    forecast_part = [f for f in timeline if f["type"] == "forecast"]
+    if not forecast_part:
+        return None
+
+    forecast_lines = "\n".join([f"{f['label']}: ${f['value']}" for f in forecast_part])
+    user_prompt = (
+        "Provide a simple, concise explanation of the following liquor sales forecast "
+        "for a store manager with no data background:\n\n" + forecast_lines
+    )
+    return {
+        "model": LLM_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful retail analyst who explains forecast data clearly."
+            },
+            {
+                "role": "user",
+                "content": user_prompt
+            }
+        ],
+        "temperature": 0.7,
+        "max_tokens": 300
+    }
+
+
+def compare_payload(store_number, forecast_avg, region_avg):
+    prompt = f"""
+Compare this store's forecasted average monthly liquor sales to the average across all stores.
+
+Store ID: {store_number}
+Forecasted Monthly Average: ${forecast_avg:,.2f}
+Region-Wide Monthly Average: ${region_avg:,.2f}
+
+Explain how this store is performing relative to others.
+""".strip()
+    return {
+        "model": LLM_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a helpful retail analyst who compares store performance in plain language."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": 0.6,
+        "max_tokens": 200
+    }
+
+
+def _summary(status, text, body):
+    if status != 200:
+        raise LLMError(status, text)
+    return body()["choices"][0]["message"]["content"].strip()
+
+
+def chat_completion(payload):
+    """The model's reply to ``payload``, blocking until it arrives."""
+    response = requests.post(api_url(), headers=_headers(), json=payload, timeout=request_timeout())
+    return _summary(response.status_code, response.text, response.json)
+
+
+async def async_chat_completion(client, payload):
+    """``chat_completion`` on an httpx.AsyncClient; the event loop keeps serving while it waits."""
+    response = await client.post(api_url(), headers=_headers(), json=payload, timeout=request_timeout())
+    return _summary(response.status_code, response.text, response.json)
@@ -0,0 +1,171 @@
+"""Micro-batching of concurrent model calls.
+
+A live single-store forecast makes one predict call per month on a 1-row
+matrix, and almost all of that call's cost is fixed overhead. When several
+requests forecast at once, MicroBatcher stacks their rows into one call: each
+caller queues its rows and blocks, and a dispatcher thread runs whatever has
+queued once ``max_rows`` rows are waiting, ``max_latency`` has passed since
+the oldest arrived, or every forecast currently in progress (see
+``session``) has queued its rows. The last rule lets concurrent recursions
+step in lockstep; a forecast running alone calls the model directly.
+
+Rows are grouped by predict function, so requests pinned to different
+snapshots (models) never share a call. Calls with ``max_rows`` rows or more
+skip the queue. ``stats`` reports call, batch and row counts, a batch-size
+histogram and the mean time rows spent queued.
+"""
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class _Slot:
+    __slots__ = ("predict_fn", "X", "arrived", "done", "value", "error")
+
+    def __init__(self, predict_fn, X):
+        self.predict_fn = predict_fn
+        self.X = X
+        self.arrived = time.perf_counter()
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class MicroBatcher:
+    def __init__(self, max_latency_ms=2.0, max_rows=256):
+        self.max_latency = max_latency_ms / 1000
+        self.max_rows = max_rows
+        self._cond = threading.Condition()
+        self._pending = []
+        self._pending_rows = 0
+        self._active = 0  # forecasts inside session()
+        self._worker = None
+        self._worker_pid = None
+        # Metrics
+        self.calls = 0
+        self.batches = 0
+        self.rows = 0
+        self.bypassed = 0  # calls of max_rows rows or more
+        self.solo = 0      # calls made while no other forecast was running
+        self.max_batch_rows = 0
+        self.wait_seconds = 0.0
+        self.size_histogram = defaultdict(int)  # power-of-two row buckets -> batches
+
+    @contextmanager
+    def session(self):
+        """Mark a forecast as in progress, so the dispatcher knows to wait for its rows."""
+        with self._cond:
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                # One fewer caller to wait for
+                self._cond.notify_all()
+
+    def wrap(self, predict_fn):
+        """``predict_fn`` with its calls routed through the batcher."""
+        def predict(X):
+            return self.predict(predict_fn, X)
+        return predict
+
+    def predict(self, predict_fn, X):
+        with self._cond:
+            # Nothing to batch with: run on the caller's thread, skipping the hand-off
+            solo = not self._pending and self._active <= 1
+            if len(X) >= self.max_rows:
+                self.bypassed += 1
+            elif solo:
+                self.solo += 1
+        if solo or len(X) >= self.max_rows:
+            return predict_fn(X)
+
+        # The caller reuses its buffer for the next step, so queue a copy
+        slot = _Slot(predict_fn, np.array(X))
+        with self._cond:
+            # Started lazily, and again in a forked worker, where the parent's thread doesn't exist
+            if self._worker is None or self._worker_pid != os.getpid():
+                self._worker = threading.Thread(target=self._dispatch, name="micro-batcher", daemon=True)
+                self._worker_pid = os.getpid()
+                self._worker.start()
+            self._pending.append(slot)
+            self._pending_rows += len(X)
+            self.calls += 1
+            self._cond.notify_all()
+        slot.done.wait()
+        if slot.error is not None:
+            raise slot.error
+        return slot.value
+
+    def _ready(self):
+        return self._pending_rows >= self.max_rows or len(self._pending) >= self._active
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                deadline = self._pending[0].arrived + self.max_latency
+                while not self._ready():
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                taken, rows = [], 0
+                while self._pending and (not taken or rows + len(self._pending[0].X) <= self.max_rows):
+                    slot = self._pending.pop(0)
+                    taken.append(slot)
+                    rows += len(slot.X)
+                self._pending_rows -= rows
+
+            started = time.perf_counter()
+            groups = defaultdict(list)
+            for slot in taken:
+                groups[slot.predict_fn].append(slot)
+            sizes = [self._run(predict_fn, slots) for predict_fn, slots in groups.items()]
+
+            with self._cond:
+                for size in sizes:
+                    self.batches += 1
+                    self.rows += size
+                    self.max_batch_rows = max(self.max_batch_rows, size)
+                    self.size_histogram[1 << (size - 1).bit_length()] += 1
+                self.wait_seconds += sum(started - slot.arrived for slot in taken)
+
+    def _run(self, predict_fn, slots):
+        """One predict call for ``slots``; hands each its rows of the result and returns the row count."""
+        X = slots[0].X if len(slots) == 1 else np.concatenate([slot.X for slot in slots])
+        try:
+            y = predict_fn(X)
+            start = 0
+            for slot in slots:
+                slot.value = y[start:start + len(slot.X)]
+                start += len(slot.X)
+        except Exception as e:
+            for slot in slots:
+                slot.error = e
+        for slot in slots:
+            slot.done.set()
+        return len(X)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_latency_ms": self.max_latency * 1000,
+                "max_rows": self.max_rows,
+                "calls": self.calls,
+                "batches": self.batches,
+                "rows": self.rows,
+                "bypassed": self.bypassed,
+                "solo": self.solo,
+                "mean_batch_rows": round(self.rows / self.batches, 2) if self.batches else None,
+                "mean_calls_per_batch": round(self.calls / self.batches, 2) if self.batches else None,
+                "max_batch_rows": self.max_batch_rows,
+                "mean_wait_ms": round(self.wait_seconds / self.calls * 1000, 3) if self.calls else None,
+                "batch_rows_histogram": {f"<={size}": count for size, count in sorted(self.size_histogram.items())},
+            }
@@ -0,0 +1,341 @@
+"""Out-of-core features store: per-store partitions spilled to disk.
+
+For state-scale history the features table does not fit in RAM, so
+``build_partitioned_store`` streams the CSV in chunks and never holds more than
+one chunk: each chunk's rows are appended to one binary record file per store,
+and the store x month Total_Sales sums are accumulated on the side. Once every
+chunk is spilled, each store's partition (small on its own) is sorted by date.
+
+``PartitionedFeatureStore`` then memory-maps a store's partition only when a
+request asks for it, and serves the prebuilt index, monthly aggregates and
+store directory (the Store Number/City/County triples seen since 2020, also
+collected chunk by chunk), so no request or startup step needs the full table.
+Builds are keyed by the source CSV like shared stores, and older builds of the
+same CSV are removed once no live process has them open (see core/store_dirs.py).
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .aggregates import MonthlySales
+from .feature_cache import CACHE_DIR_NAME, CACHE_FORMAT_VERSION, features_fingerprint
+from .forecast_engine import RECENT_START
+from .schema import csv_dtypes, apply_schema
+from .store_dirs import hold, remove_superseded, source_key
+
+MANIFEST_NAME = "manifest.json"
+AGGREGATES_NAME = "monthly_sales.npz"
+PARTITION_DIR = "partitions"
+STORE_PREFIX = "partitioned-"
+# Bump whenever the partition layout or manifest changes so old builds get rebuilt
+PARTITION_FORMAT = "2"
+DIRECTORY_COLUMNS = ["Store Number", "City", "County"]
+NAT = np.iinfo(np.int64).min
+# store * MONTH_KEY + month ordinal packs a (store, month) cell into one int64
+MONTH_KEY = 1 << 20
+
+
+class _Dictionary:
+    """Grows a value -> int32 code mapping across chunks."""
+
+    def __init__(self):
+        self.categories = []
+        self._index = pd.Index([], dtype=object)
+
+    def encode(self, values):
+        values = pd.Series(values, dtype=object)
+        values = values.astype(str).where(values.notna())
+        new = pd.Index(values.dropna().unique()).difference(self._index)
+        if len(new):
+            self.categories.extend(new)
+            self._index = pd.Index(self.categories, dtype=object)
+        return self._index.get_indexer(values).astype(np.int32)
+
+
+class _SumAccumulator:
+    """Running (sum, count) per integer key, compacted after every chunk.
+
+    Memory stays proportional to the number of distinct keys (stores, or
+    store x month cells), not to the number of rows seen.
+    """
+
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.sums = np.empty(0)
+        self.counts = np.empty(0)
+
+    def add(self, keys, sums, counts):
+        keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        self.sums = np.bincount(inverse, weights=np.concatenate([self.sums, sums]), minlength=len(keys))
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]), minlength=len(keys))
+        self.keys = keys
+
+
+def _column_kind(col):
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return "datetime", "<i8"
+    if pd.api.types.is_numeric_dtype(col) and not isinstance(col.dtype, pd.CategoricalDtype):
+        return "numeric", col.dtype.str
+    return "dictionary", "<i4"
+
+
+def build_partitioned_store(csv_path, store_dir, chunksize=200_000):
+    """Stream ``csv_path`` into per-store record files under ``store_dir``."""
+    tmp_dir = f"{store_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    part_dir = os.path.join(tmp_dir, PARTITION_DIR)
+    os.makedirs(part_dir)
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in csv_dtypes().items() if col in header}
+
+    fields = None
+    record_dtype = None
+    dictionaries = {}
+    row_counts = {}
+    monthly = _SumAccumulator()
+    store_totals = _SumAccumulator()
+    # (store, city code, county code) -> first 2020+ date it was seen on
+    directory = {}
+    recent_start = np.datetime64(RECENT_START, "ns").astype(np.int64)
+
+    for chunk in pd.read_csv(csv_path, dtype=dtypes, chunksize=chunksize):
+        chunk = apply_schema(chunk)
+        if fields is None:
+            fields = []
+            for name in chunk.columns:
+                kind, dtype = _column_kind(chunk[name])
+                fields.append({"name": name, "kind": kind, "dtype": dtype})
+                if kind == "dictionary":
+                    dictionaries[name] = _Dictionary()
+            record_dtype = np.dtype([(f["name"], f["dtype"]) for f in fields])
+
+        records = np.empty(len(chunk), dtype=record_dtype)
+        for f in fields:
+            col = chunk[f["name"]]
+            if f["kind"] == "datetime":
+                records[f["name"]] = col.to_numpy().astype("datetime64[ns]").view("i8")
+            elif f["kind"] == "dictionary":
+                records[f["name"]] = dictionaries[f["name"]].encode(col)
+            else:
+                records[f["name"]] = col.to_numpy()
+
+        # Spill each store's rows to its partition file
+        stores = records["Store Number"]
+        order = np.argsort(stores, kind="stable")
+        sorted_stores = stores[order]
+        starts = np.flatnonzero(np.r_[True, sorted_stores[1:] != sorted_stores[:-1]])
+        for start, end in zip(starts, np.append(starts[1:], len(order))):
+            store = int(sorted_stores[start])
+            with open(os.path.join(part_dir, f"{store}.bin"), "ab") as f:
+                records[order[start:end]].tofile(f)
+            row_counts[store] = row_counts.get(store, 0) + int(end - start)
+
+        # Accumulate store x month sums; NaT rows only count toward store totals
+        sales = np.nan_to_num(records["Total_Sales"].astype(np.float64))
+        store_totals.add(stores.astype(np.int64), sales, np.ones(len(sales)))
+        dated = records["Date"] != NAT
+        month = records["Date"][dated].view("datetime64[ns]").astype("datetime64[M]").astype(np.int64)
+        monthly.add(stores[dated].astype(np.int64) * MONTH_KEY + month, sales[dated], np.ones(int(dated.sum())))
+        _collect_directory(directory, records, recent_start)
+
+    # Sort each partition by date, NaT last like StoreIndex
+    for store in row_counts:
+        path = os.path.join(part_dir, f"{store}.bin")
+        part = np.fromfile(path, dtype=record_dtype)
+        key = np.where(part["Date"] == NAT, np.iinfo(np.int64).max, part["Date"])
+        part[np.argsort(key, kind="stable")].tofile(path)
+
+    stores = np.array(sorted(row_counts), dtype=np.int64)
+    _save_aggregates(os.path.join(tmp_dir, AGGREGATES_NAME), stores, monthly, store_totals)
+    for f in fields:
+        if f["kind"] == "dictionary":
+            f["categories"] = dictionaries[f["name"]].categories
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({
+            "fields": fields,
+            "stores": {str(store): row_counts[store] for store in stores.tolist()},
+            "directory": _directory_entries(directory, dictionaries),
+        }, f)
+
+    try:
+        os.rename(tmp_dir, store_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.exists(os.path.join(store_dir, MANIFEST_NAME)):
+            raise
+
+
+def _collect_directory(directory, records, recent_start):
+    # Rows without a City/County (code -1) or from before 2020 (NaT included) don't count
+    keep = (records["Date"] >= recent_start) & (records["City"] >= 0) & (records["County"] >= 0)
+    if not keep.any():
+        return
+    first_seen = pd.DataFrame({
+        "store": records["Store Number"][keep].astype(np.int64),
+        "city": records["City"][keep],
+        "county": records["County"][keep],
+        "date": records["Date"][keep],
+    }).groupby(["store", "city", "county"])["date"].min()
+    for key, date in first_seen.items():
+        key = tuple(int(k) for k in key)
+        directory[key] = min(int(date), directory.get(key, int(date)))
+
+
+def _directory_entries(directory, dictionaries):
+    """Distinct [store, city, county] in store order, like Snapshot.store_directory."""
+    cities, counties = dictionaries["City"].categories, dictionaries["County"].categories
+    return [
+        [store, cities[city], counties[county]]
+        for (store, city, county) in sorted(directory, key=lambda key: (key[0], directory[key]))
+    ]
+
+
+def _save_aggregates(path, stores, monthly, store_totals):
+    store_pos = np.searchsorted(stores, monthly.keys // MONTH_KEY)
+    ordinals = monthly.keys % MONTH_KEY
+    first_ord = int(ordinals.min()) if len(ordinals) else 0
+    n_months = int(ordinals.max() - first_ord + 1) if len(ordinals) else 0
+
+    totals = np.zeros((len(stores), n_months))
+    has_rows = np.zeros((len(stores), n_months), dtype=bool)
+    totals[store_pos, ordinals - first_ord] = monthly.sums
+    has_rows[store_pos, ordinals - first_ord] = monthly.counts > 0
+
+    per_store = np.zeros(len(stores))
+    per_store[np.searchsorted(stores, store_totals.keys)] = store_totals.sums
+    np.savez(path, stores=stores, first_month=np.int64(first_ord), totals=totals,
+             has_rows=has_rows, store_totals=per_store)
+
+
+class PartitionIndex:
+    """StoreIndex look-alike whose frames come from memory-mapped partitions."""
+
+    def __init__(self, store):
+        self._store = store
+        self.stores = np.array(sorted(store.row_counts), dtype=np.int64)
+
+    def __contains__(self, store):
+        return store in self._store.row_counts
+
+    def __len__(self):
+        return len(self._store.row_counts)
+
+    def frame(self, store):
+        return self._store.frame(store)
+
+    def latest_values(self, stores, columns, since=None):
+        """Same contract as StoreIndex.latest_values, one partition at a time."""
+        since = None if since is None else np.datetime64(pd.Timestamp(since), "ns")
+        names = [name for name in columns if name in self._store.columns]
+        found, picked = [], []
+        for store in stores:
+            records = self._store.records(store)
+            dates = np.array(records["Date"]).view("datetime64[ns]")
+            valid = ~np.isnat(dates)
+            if since is not None:
+                valid &= dates >= since
+            hits = np.flatnonzero(valid)
+            if len(hits):
+                found.append(store)
+                picked.append(records[hits[-1]])
+        rows = np.array(picked, dtype=self._store.record_dtype)
+        return found, self._store.decode_columns(rows, names)
+
+
+class PartitionedFeatureStore:
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        # Partitions are mapped per request for as long as this object lives
+        hold(store_dir, self)
+        with open(os.path.join(store_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        self.fields = manifest["fields"]
+        self.columns = [f["name"] for f in self.fields]
+        self.record_dtype = np.dtype([(f["name"], f["dtype"]) for f in self.fields])
+        self.row_counts = {int(store): rows for store, rows in manifest["stores"].items()}
+        self._dtypes = {
+            f["name"]: pd.CategoricalDtype(f["categories"]) for f in self.fields if f["kind"] == "dictionary"
+        }
+
+        self.store_index = PartitionIndex(self)
+        self.monthly_sales = self._load_aggregates()
+        self.store_directory = pd.DataFrame(manifest["directory"], columns=DIRECTORY_COLUMNS)
+
+    def __len__(self):
+        return sum(self.row_counts.values())
+
+    def _load_aggregates(self):
+        with np.load(os.path.join(self.store_dir, AGGREGATES_NAME)) as data:
+            n_months = data["totals"].shape[1]
+            months = pd.date_range(
+                pd.Timestamp(np.datetime64(int(data["first_month"]), "M")), periods=n_months, freq="MS"
+            )
+            return MonthlySales.from_arrays(
+                data["stores"], months, data["totals"], data["has_rows"], data["store_totals"]
+            )
+
+    def decode_columns(self, records, columns=None):
+        """``{column: array}`` for ``records``; dictionary columns come back as Categoricals."""
+        out = {}
+        for f in self.fields:
+            name = f["name"]
+            if columns is not None and name not in columns:
+                continue
+            values = records[name]
+            if f["kind"] == "datetime":
+                out[name] = np.array(values).view("datetime64[ns]")
+            elif f["kind"] == "dictionary":
+                out[name] = pd.Categorical.from_codes(np.array(values), dtype=self._dtypes[name])
+            else:
+                out[name] = np.array(values)
+        return out
+
+    def _decode(self, records, columns):
+        return pd.DataFrame(self.decode_columns(records, columns), columns=[c for c in (columns or self.columns)])
+
+    def records(self, store):
+        """``store``'s memory-mapped partition as a record array (empty if unknown)."""
+        rows = self.row_counts.get(store)
+        if not rows:
+            return np.empty(0, dtype=self.record_dtype)
+        path = os.path.join(self.store_dir, PARTITION_DIR, f"{store}.bin")
+        return np.memmap(path, dtype=self.record_dtype, mode="r", shape=(rows,))
+
+    def frame(self, store, columns=None):
+        """Rows of ``store`` in date order, read from its memory-mapped partition."""
+        return self._decode(self.records(store), columns)
+
+    def column(self, name):
+        return self.to_frame([name])[name].to_numpy()
+
+    def to_frame(self, columns=None):
+        """Concatenate partitions; only the requested columns are materialized."""
+        frames = [self.frame(store, columns) for store in self.store_index.stores.tolist()]
+        if not frames:
+            return self._decode(np.empty(0, dtype=self.record_dtype), columns)
+        return pd.concat(frames, ignore_index=True)
+
+
+def open_partitioned_store(csv_path, store_root=None, chunksize=200_000):
+    """Attach to the partitioned store for ``csv_path``, building it on first use."""
+    store_root = store_root or os.environ.get("SHARED_STORE_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME
+    )
+    source = f"{STORE_PREFIX}{source_key(csv_path)}-"
+    store_name = f"{source}{CACHE_FORMAT_VERSION}.p{PARTITION_FORMAT}-{features_fingerprint(csv_path)[:16]}"
+    store_dir = os.path.join(store_root, store_name)
+
+    if not os.path.exists(os.path.join(store_dir, MANIFEST_NAME)):
+        os.makedirs(store_root, exist_ok=True)
+        build_partitioned_store(csv_path, store_dir, chunksize=chunksize)
+        print(f"🗄️ Built partitioned feature store {store_dir}")
+
+    store = PartitionedFeatureStore(store_dir)
+    for name in remove_superseded(store_root, source, store_name):
+        print(f"🧹 Removed superseded partitioned store {name}")
+    return store
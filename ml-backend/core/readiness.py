@@ -0,0 +1,79 @@
+"""Background loading of slow startup components with per-component readiness.
+
+Each Component runs its loader in a daemon thread so the server can open its
+port immediately. Routes check only the components they need and answer 503
+while those are still loading, instead of the whole app waiting on the
+slowest one (e.g. the LLM).
+"""
+import threading
+import time
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class Component:
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.state = PENDING
+        self.value = None
+        self.error = None
+        self.load_seconds = None
+        self._done = threading.Event()
+
+    def start(self):
+        threading.Thread(target=self._load, name=f"load-{self.name}", daemon=True).start()
+        return self
+
+    def _load(self):
+        self.state = LOADING
+        t0 = time.perf_counter()
+        try:
+            self.value = self.loader()
+            self.state = READY
+            print(f"✅ {self.name} ready in {time.perf_counter() - t0:.1f}s")
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            print(f"❌ {self.name} failed to load: {e}")
+        finally:
+            self.load_seconds = round(time.perf_counter() - t0, 3)
+            self._done.set()
+
+    @property
+    def ready(self):
+        return self.state == READY
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def describe(self):
+        return {"status": self.state, "load_seconds": self.load_seconds, "error": self.error}
+
+
+class Components:
+    """Named set of components started together."""
+
+    def __init__(self):
+        self._components = {}
+
+    def add(self, name, loader):
+        self._components[name] = Component(name, loader)
+        return self._components[name]
+
+    def __getitem__(self, name):
+        return self._components[name]
+
+    def start_all(self):
+        for component in self._components.values():
+            component.start()
+
+    def not_ready(self, *names):
+        """Names among ``names`` (default: all) that are not ready yet."""
+        return [name for name in (names or self._components) if not self._components[name].ready]
+
+    def describe(self):
+        return {name: component.describe() for name, component in self._components.items()}
@@ -0,0 +1,58 @@
+"""Column schema for features.csv.
+
+``pd.read_csv`` defaults to float64/int64/object for everything. The features
+table only needs float32 for model inputs (tree ensembles split on float32
+anyway), int32 store ids and categorical City/County, which roughly halves
+its footprint.
+"""
+import numpy as np
+import pandas as pd
+
+MODEL_FEATURES = [
+    'Lag_1', 'Lag_2', 'Lag_3', 'Rolling_3', 'Rolling_6', 'Rolling_12',
+    'Rolling_Trend', 'Month', 'Quarter', 'IsYearStart', 'IsYearEnd',
+    'AvgPricePerBottle', 'MarginRatio', 'UniqueProductsSold',
+    'Bottles Sold', 'IsHolidayMonth'
+]
+
+DATE_COLUMNS = ["Date"]
+CATEGORICAL_COLUMNS = ["City", "County"]
+INT32_COLUMNS = ["Store Number"]
+# Summed into monthly totals and reported to the dollar, so keep full precision
+FLOAT64_COLUMNS = ["Total_Sales"]
+
+# Bump when the dtypes change so cached copies of the table are rebuilt
+SCHEMA_VERSION = 2
+
+
+def csv_dtypes():
+    """dtype mapping for the columns whose type is known before parsing."""
+    dtypes = {col: "category" for col in CATEGORICAL_COLUMNS}
+    dtypes.update({col: np.int32 for col in INT32_COLUMNS})
+    dtypes.update({col: np.float64 for col in FLOAT64_COLUMNS})
+    return dtypes
+
+
+def apply_schema(df):
+    """Parse date columns and downcast every remaining numeric column to float32.
+
+    Dates are parsed here, once per load, so request handlers never call
+    ``pd.to_datetime``; unparseable values become NaT.
+    """
+    fixed = set(CATEGORICAL_COLUMNS) | set(INT32_COLUMNS) | set(FLOAT64_COLUMNS)
+    downcast = {
+        col: np.float32 for col in df.columns
+        if col not in fixed and pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col])
+    }
+    df = df.astype(downcast)
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+    return df
+
+
+def read_features_csv(csv_path):
+    """``pd.read_csv`` with the compact features.csv schema applied."""
+    header = pd.read_csv(csv_path, nrows=0).columns
+    dtypes = {col: dtype for col, dtype in csv_dtypes().items() if col in header}
+    return apply_schema(pd.read_csv(csv_path, dtype=dtypes))
@@ -0,0 +1,130 @@
+"""Read-only memory-mapped column store shared by all workers.
+
+The first worker to start exports the (Store Number, Date)-sorted features
+table as one ``.npy`` file per column; every worker then attaches with
+``np.load(mmap_mode="r")`` so the pages live once in the OS page cache instead
+of once per process. String columns (City, County, ...) are dictionary-encoded
+as int32 codes plus a category list kept in the manifest.
+
+Stores are keyed by the source CSV, the cache format and the CSV's sha256, so a
+changed features.csv or schema gets a fresh export; older exports of the same
+CSV are removed once no live process has them mapped (see core/store_dirs.py).
+Point ``SHARED_STORE_DIR`` at ``/dev/shm`` to keep them in RAM.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .feature_cache import CACHE_DIR_NAME, CACHE_FORMAT_VERSION, features_fingerprint, load_features
+from .store_dirs import hold, remove_superseded, source_key
+from .store_index import StoreIndex
+
+MANIFEST_NAME = "manifest.json"
+STORE_PREFIX = "shared-"
+
+
+def export_shared_store(df, store_dir):
+    """Write ``df`` (already sorted by StoreIndex) as memory-mappable columns."""
+    tmp_dir = f"{store_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    for i, name in enumerate(df.columns):
+        col = df[name]
+        entry = {"name": name, "file": f"{i}.npy"}
+        if pd.api.types.is_datetime64_any_dtype(col):
+            entry["kind"] = "datetime"
+            entry["unit"] = np.datetime_data(col.dtype)[0]
+            values = col.to_numpy().view("i8")
+        elif pd.api.types.is_numeric_dtype(col) and not isinstance(col.dtype, pd.CategoricalDtype):
+            entry["kind"] = "numeric"
+            values = col.to_numpy()
+        else:
+            entry["kind"] = "dictionary"
+            codes, categories = pd.factorize(col)
+            entry["categories"] = [str(c) for c in categories]
+            values = codes.astype(np.int32)
+        np.save(os.path.join(tmp_dir, entry["file"]), np.ascontiguousarray(values))
+        columns.append(entry)
+
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(df), "columns": columns}, f)
+
+    try:
+        os.rename(tmp_dir, store_dir)
+    except OSError:
+        # Another worker finished the same export first; keep theirs
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.exists(os.path.join(store_dir, MANIFEST_NAME)):
+            raise
+
+
+class SharedFeatureStore:
+    """Read-only view over an exported store; row ranges come back as DataFrames."""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        hold(store_dir, self)  # taken before mapping, so cleanup elsewhere leaves the store alone
+        with open(os.path.join(store_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        self.rows = manifest["rows"]
+        self.columns = [entry["name"] for entry in manifest["columns"]]
+        self._arrays = {}
+        self._dtypes = {}
+        for entry in manifest["columns"]:
+            arr = np.load(os.path.join(store_dir, entry["file"]), mmap_mode="r")
+            if entry["kind"] == "datetime":
+                arr = arr.view(f"datetime64[{entry['unit']}]")
+            elif entry["kind"] == "dictionary":
+                self._dtypes[entry["name"]] = pd.CategoricalDtype(entry["categories"])
+            self._arrays[entry["name"]] = arr
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name, start=0, end=None):
+        """Return rows ``start:end`` of one column; numeric columns stay memory-mapped."""
+        values = self._arrays[name][start:end]
+        dtype = self._dtypes.get(name)
+        if dtype is not None:
+            return pd.Categorical.from_codes(values, dtype=dtype)
+        return values
+
+    def slice(self, start, end, columns=None):
+        """Copy rows ``start:end`` into a regular DataFrame."""
+        return pd.DataFrame({
+            name: np.array(col) if isinstance(col, np.ndarray) else col
+            for name in (columns or self.columns)
+            for col in [self.column(name, start, end)]
+        })
+
+    def to_frame(self, columns=None):
+        return self.slice(0, self.rows, columns)
+
+
+def open_shared_store(csv_path, store_root=None):
+    """Attach to the shared store for ``csv_path``, exporting it on first use."""
+    store_root = store_root or os.environ.get("SHARED_STORE_DIR") or os.path.join(
+        os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME
+    )
+    source = f"{STORE_PREFIX}{source_key(csv_path)}-"
+    store_name = f"{source}{CACHE_FORMAT_VERSION}-{features_fingerprint(csv_path)[:16]}"
+    store_dir = os.path.join(store_root, store_name)
+
+    if not os.path.exists(os.path.join(store_dir, MANIFEST_NAME)):
+        os.makedirs(store_root, exist_ok=True)
+        df = StoreIndex(load_features(csv_path)).df
+        export_shared_store(df, store_dir)
+        del df
+        print(f"🗄️ Exported shared feature store {store_dir}")
+
+    store = SharedFeatureStore(store_dir)
+    # On every open, not just after an export: old stores may only now be unmapped everywhere
+    for name in remove_superseded(store_root, source, store_name):
+        print(f"🧹 Removed superseded shared store {name}")
+    return store
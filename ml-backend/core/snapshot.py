@@ -0,0 +1,283 @@
+"""Versioned dataset/model snapshots with atomic hot swap.
+
+A Snapshot bundles everything a request reads (feature store, store index,
+monthly aggregates, model). Handlers pin ``holder.current()`` once at the start
+of a request, so a reload that swaps in a new snapshot never changes data under
+an in-flight request; the old snapshot is released when its last request ends.
+
+Every worker process has its own holder. A reload asked for through
+``request_reload`` (POST /api/admin/reload) reloads the worker that got the
+request and bumps a reload request file in the feature cache; the other
+workers' watchers see the bump and reload too.
+"""
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+from .aggregates import MonthlySales
+from .direct_forecast import DIRECT_MODELS_NAME, load_direct_models
+from .feature_cache import CACHE_DIR_NAME, features_fingerprint, file_sha256
+from .forecast_engine import RECENT_START
+from .inference import array_predictor
+from .intervals import RESIDUALS_NAME, load_residuals
+from .schema import MODEL_FEATURES
+from .partitioned_store import open_partitioned_store
+from .shared_store import open_shared_store
+from .store_index import StoreIndex
+
+REQUIRED_COLUMNS = ["Store Number", "City", "County", "Date", "Total_Sales"]
+RELOAD_REQUEST_NAME = "reload.request"
+
+log = logging.getLogger(__name__)
+
+
+class Snapshot:
+    def __init__(self, feature_store, model, dataset_version, model_version, store_index=None, monthly_sales=None,
+                 direct_models=None, residuals=None, store_directory=None):
+        self.feature_store = feature_store
+        self.store_index = store_index or StoreIndex.from_table(feature_store)
+        self.monthly_sales = monthly_sales or MonthlySales(self.store_index, feature_store)
+        self.model = model
+        self.direct_models = direct_models
+        self.residuals = residuals  # backtest actual/predicted ratios for intervals, if any
+        self.category_features = [
+            col for col in feature_store.columns if col.endswith("_Sales") and col != "Total_Sales"
+        ]
+        self.dataset_version = dataset_version
+        self.model_version = model_version
+        self.version = f"{dataset_version}-{model_version}"
+        self.loaded_at = time.time()
+        self._store_directory = store_directory
+        self.forecast_table = None
+        self.store_list = None  # encoded /api/stores body (EncodedPayload), attached by prepare
+
+    @property
+    def store_directory(self):
+        """Distinct (Store Number, City, County) records of stores with 2020+ rows.
+
+        Built on first use and kept for the life of the snapshot, so store
+        filters don't rescan the table on every request. An out-of-core store
+        passes its own, collected while it was built, so the table is never
+        loaded whole.
+        """
+        if self._store_directory is None:
+            df = self.feature_store.to_frame(["Store Number", "City", "County", "Date"])
+            self._store_directory = (
+                df.loc[df["Date"] >= RECENT_START, ["Store Number", "City", "County"]]
+                .dropna()
+                .drop_duplicates()
+                .sort_values("Store Number")
+                .reset_index(drop=True)
+            )
+        return self._store_directory
+
+    def stores_where(self, county=None, city=None):
+        """Store numbers whose County/City match (case-insensitive), in store order."""
+        directory = self.store_directory
+        mask = np.ones(len(directory), dtype=bool)
+        for col, value in (("County", county), ("City", city)):
+            if value is not None:
+                mask &= directory[col].astype(str).str.casefold().to_numpy() == str(value).strip().casefold()
+        return [int(s) for s in directory.loc[mask, "Store Number"].unique()]
+
+
+def direct_models_path(model_path):
+    return os.path.join(os.path.dirname(os.path.abspath(model_path)), DIRECT_MODELS_NAME)
+
+
+def residuals_path(model_path):
+    return os.path.join(os.path.dirname(os.path.abspath(model_path)), RESIDUALS_NAME)
+
+
+def load_snapshot(features_path, model_path):
+    """Load a snapshot using the FEATURES_BACKEND store ("shared" or "partitioned").
+
+    Direct multi-horizon models (direct_models.pkl) and the interval residual
+    store (residuals.npy) are picked up next to model.pkl when present, and
+    then count towards the model version.
+    """
+    dataset_version = features_fingerprint(features_path)[:12]
+    model_version = file_sha256(model_path)[:12]
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+
+    direct_path = direct_models_path(model_path)
+    direct_models = load_direct_models(direct_path)
+    if direct_models is not None:
+        model_version = hashlib.sha256(f"{model_version}:{file_sha256(direct_path)}".encode()).hexdigest()[:12]
+
+    residual_path = residuals_path(model_path)
+    residuals = load_residuals(residual_path)
+    if residuals is not None:
+        model_version = hashlib.sha256(f"{model_version}:{file_sha256(residual_path)}".encode()).hexdigest()[:12]
+
+    if os.environ.get("FEATURES_BACKEND", "shared") == "partitioned":
+        # Out-of-core: the table is never fully in memory, partitions are mapped per request
+        store = open_partitioned_store(features_path)
+        return Snapshot(
+            store, model, dataset_version, model_version,
+            store_index=store.store_index, monthly_sales=store.monthly_sales, direct_models=direct_models,
+            residuals=residuals, store_directory=store.store_directory,
+        )
+    return Snapshot(open_shared_store(features_path), model, dataset_version, model_version,
+                    direct_models=direct_models, residuals=residuals)
+
+
+def validate_snapshot(snapshot, sample_rows=32):
+    """Raise ValueError if ``snapshot`` is not fit to serve traffic."""
+    columns = snapshot.feature_store.columns
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if missing:
+        raise ValueError(f"features table is missing columns: {missing}")
+    if not len(snapshot.store_index):
+        raise ValueError("features table has no stores")
+
+    sample = snapshot.store_index.frame(int(snapshot.store_index.stores[0])).head(sample_rows)
+    X = sample.reindex(columns=MODEL_FEATURES).fillna(0)
+    y = np.asarray(snapshot.model.predict(X), dtype=np.float64)
+    if y.shape != (len(X),) or not np.isfinite(y).all():
+        raise ValueError("model produced invalid predictions on sample rows")
+    # The forecast path predicts through INFERENCE_BACKEND, which must agree with model.predict
+    fast = array_predictor(snapshot.model, MODEL_FEATURES)(X.to_numpy(dtype=np.float64))
+    if not np.allclose(fast, y, rtol=1e-6):
+        raise ValueError("inference backend disagrees with model.predict on sample rows")
+
+    if snapshot.direct_models is not None:
+        X = sample.reindex(columns=snapshot.direct_models.model_features).fillna(0).to_numpy(dtype=np.float64)
+        y = snapshot.direct_models.predict(X, snapshot.direct_models.horizons)
+        if y.shape != (len(X), snapshot.direct_models.horizons) or not np.isfinite(y).all():
+            raise ValueError("direct models produced invalid predictions on sample rows")
+
+    residuals = snapshot.residuals
+    if residuals is not None and (residuals.ndim != 1 or not len(residuals) or not np.isfinite(residuals).all()):
+        raise ValueError("residual store must be a non-empty 1-D array of finite ratios")
+
+
+class SnapshotHolder:
+    """Holds the live snapshot and swaps in new ones built in the background."""
+
+    def __init__(self, features_path, model_path, prepare=None):
+        self.features_path = features_path
+        self.model_path = model_path
+        # Bumped by request_reload; watched like the source files, as the last stamp
+        self.request_path = os.path.join(
+            os.path.dirname(os.path.abspath(features_path)), CACHE_DIR_NAME, RELOAD_REQUEST_NAME
+        )
+        # Called with each new snapshot after validation and before it goes live
+        self.prepare = prepare
+        self._current = load_snapshot(features_path, model_path)
+        validate_snapshot(self._current)
+        if prepare:
+            prepare(self._current)
+        self._reload_lock = threading.Lock()
+        self.last_error = None
+        self._watched = self._file_stamps()
+
+    def current(self):
+        # A single attribute read is atomic, so readers need no lock
+        return self._current
+
+    def reload(self, background=True):
+        """Load, validate and swap in a new snapshot. Returns False if one is already loading."""
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        if background:
+            threading.Thread(target=self._reload_locked, name="snapshot-reload", daemon=True).start()
+        else:
+            self._reload_locked()
+        return True
+
+    def request_reload(self):
+        """Reload here and signal every other worker's watcher to reload too.
+
+        Returns False if this process is already loading; the other workers
+        are signalled either way.
+        """
+        os.makedirs(os.path.dirname(self.request_path), exist_ok=True)
+        with open(self.request_path, "w", encoding="utf-8") as f:
+            f.write(f"{time.time_ns()} {os.getpid()}\n")
+        return self.reload(background=True)
+
+    def _reload_locked(self):
+        # Remember what was attempted so the watcher does not retry a bad file in a loop
+        self._watched = self._file_stamps()
+        try:
+            snapshot = load_snapshot(self.features_path, self.model_path)
+            if snapshot.version == self._current.version:
+                log.info("ℹ️ Snapshot %s unchanged, keeping current", snapshot.version)
+            else:
+                validate_snapshot(snapshot)
+                if self.prepare:
+                    self.prepare(snapshot)
+                previous, self._current = self._current.version, snapshot
+                log.info("🔄 Swapped snapshot %s -> %s", previous, snapshot.version)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            log.error("❌ Snapshot reload failed, still serving %s: %s", self._current.version, e)
+        finally:
+            self._reload_lock.release()
+
+    def _file_stamps(self):
+        stamps = []
+        for path in (self.features_path, self.model_path, direct_models_path(self.model_path),
+                     residuals_path(self.model_path), self.request_path):
+            try:
+                st = os.stat(path)
+                stamps.append((st.st_size, st.st_mtime_ns))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def reload_if_changed(self, sources=True):
+        """Reload now if the watched files changed since the current snapshot was loaded.
+
+        A worker forked from the preloading master starts with the master's
+        snapshot; if other workers have reloaded since, this catches it up
+        before it serves (and before that snapshot's files may be removed).
+        """
+        watched = slice(None) if sources else slice(-1, None)
+        if self._file_stamps()[watched] != self._watched[watched]:
+            self.reload(background=False)
+
+    def watch(self, interval, sources=True):
+        """Poll the source files every ``interval`` seconds and reload when they change.
+
+        Each worker runs its own watcher, so all of them pick up a refresh
+        without a restart. A change is only acted on once the files have stopped
+        changing for one interval, so a CSV that is still being written is not
+        loaded half-way. With ``sources=False`` only the reload request file is
+        watched, so workers follow POST /api/admin/reload but not file edits.
+        """
+        watched = slice(None) if sources else slice(-1, None)
+
+        def poll():
+            pending = None
+            while True:
+                time.sleep(interval)
+                stamps = self._file_stamps()[watched]
+                if stamps == self._watched[watched]:
+                    pending = None
+                elif stamps != pending:
+                    pending = stamps
+                else:
+                    self.reload(background=False)
+                    pending = None
+
+        threading.Thread(target=poll, name="snapshot-watcher", daemon=True).start()
+
+    def status(self):
+        snapshot = self._current
+        return {
+            "version": snapshot.version,
+            "dataset_version": snapshot.dataset_version,
+            "model_version": snapshot.model_version,
+            "loaded_at": snapshot.loaded_at,
+            "reloading": self._reload_lock.locked(),
+            "last_error": self.last_error,
+        }
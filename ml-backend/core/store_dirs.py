@@ -0,0 +1,128 @@
+"""Naming and cleanup of the on-disk stores and tables built from features.csv.
+
+Shared stores, partitioned stores and forecast tables are directories named
+``{prefix}{source key}-...``. The source key (the CSV's stem plus a hash of its
+absolute path) keeps directories built from different CSVs apart, even when
+they share SHARED_STORE_DIR, so attaching a new version only ever removes older
+versions of the same source.
+
+Each object that maps a directory leaves a ``.attached-<pid>.<n>`` lease in it,
+released when that object is garbage collected. A directory
+is not removed while a live process holds a lease on it, or within
+ATTACH_GRACE seconds of being touched (a process may be about to attach).
+
+Under gunicorn preload the master maps the first snapshot and forks; each
+worker calls ``adopt_inherited`` to lease what it inherited under its own pid,
+and the master calls ``release_held``, since it serves nothing and never
+reloads. Otherwise the master's lease would pin that first snapshot forever.
+"""
+import hashlib
+import itertools
+import os
+import shutil
+import time
+import weakref
+
+LEASE_PREFIX = ".attached-"
+ATTACH_GRACE = 60
+
+# (directory, weakref to owner, pid, finalizer) for every lease taken here or
+# inherited from the parent process
+_held = []
+# One lease per owner: a reloaded snapshot re-attaches the same store while the old one is still alive
+_lease_ids = itertools.count()
+
+
+def source_key(path):
+    """``{stem}-{hash of the absolute path}`` for the file at ``path``."""
+    path = os.path.abspath(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"{stem}-{hashlib.sha256(path.encode('utf-8')).hexdigest()[:8]}"
+
+
+def hold(directory, owner):
+    """Lease ``directory`` for this process until ``owner`` is garbage collected."""
+    pid = os.getpid()
+    lease = os.path.join(directory, f"{LEASE_PREFIX}{pid}.{next(_lease_ids)}")
+    with open(lease, "a"):
+        pass
+    _held[:] = [entry for entry in _held if entry[1]() is not None]
+    _held.append((directory, weakref.ref(owner), pid, weakref.finalize(owner, _release, lease, pid)))
+
+
+def adopt_inherited():
+    """In a forked child, lease under this pid what the parent held and is still alive here."""
+    pid = os.getpid()
+    mine = {(directory, id(ref())) for directory, ref, owner_pid, _ in _held if owner_pid == pid}
+    for directory, ref, owner_pid, _ in list(_held):
+        owner = ref()
+        if owner is not None and owner_pid != pid and (directory, id(owner)) not in mine:
+            try:
+                hold(directory, owner)
+            except FileNotFoundError:
+                continue  # already superseded and removed; the worker reloads before serving
+            mine.add((directory, id(owner)))
+
+
+def release_held():
+    """Give up this process's leases now; the owners stay usable."""
+    pid = os.getpid()
+    for _, _, owner_pid, finalizer in _held:
+        if owner_pid == pid:
+            finalizer()
+
+
+def _release(lease, pid):
+    # A forked worker inherits the owner but not the lease; only the process that took it gives it up
+    if os.getpid() != pid:
+        return
+    try:
+        os.remove(lease)
+    except OSError:
+        pass
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def in_use(directory):
+    """True if ``directory`` was touched recently or a live process holds a lease on it."""
+    try:
+        if time.time() - os.stat(directory).st_mtime < ATTACH_GRACE:
+            return True
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return False
+    for name in names:
+        if name.startswith(LEASE_PREFIX):
+            try:
+                pid = int(name[len(LEASE_PREFIX):].split(".")[0])
+            except ValueError:
+                continue
+            if _pid_alive(pid):
+                return True
+    return False
+
+
+def remove_superseded(root, prefix, current):
+    """Remove directories in ``root`` named ``prefix...`` except ``current...`` ones and those in use."""
+    try:
+        names = os.listdir(root)
+    except FileNotFoundError:
+        return []
+    removed = []
+    for name in names:
+        if not name.startswith(prefix) or name.startswith(current) or name.endswith(".tmp"):
+            continue
+        path = os.path.join(root, name)
+        if os.path.isdir(path) and not in_use(path):
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(name)
+    return removed
@@ -0,0 +1,85 @@
+"""Per-store row index over the features table.
+
+The table is sorted by (Store Number, Date) once at load, so each store's rows
+form one contiguous block. Requests then slice their store by offsets instead
+of scanning every row with a boolean mask.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _date_sort_key(col):
+    if col.name == "Date" and not pd.api.types.is_datetime64_any_dtype(col):
+        return pd.to_datetime(col, errors="coerce")
+    return col
+
+
+class StoreIndex:
+    def __init__(self, df):
+        sort_cols = [c for c in ("Store Number", "Date") if c in df.columns]
+        # Multi-column sorts are stable, so rows sharing a date keep file order
+        self.df = df.sort_values(sort_cols, key=_date_sort_key).reset_index(drop=True)
+        self._slice = lambda start, end: self.df.iloc[start:end]
+        self.columns = list(self.df.columns)
+        self._column = lambda name: self.df[name].to_numpy()
+        self._dates = self.df["Date"].to_numpy() if "Date" in self.df.columns else None
+        self._build(self.df["Store Number"].to_numpy())
+
+    @classmethod
+    def from_table(cls, table):
+        """Index a table that is already sorted, e.g. a SharedFeatureStore."""
+        index = cls.__new__(cls)
+        index.df = None
+        index._slice = table.slice
+        index.columns = list(table.columns)
+        index._column = lambda name: np.asarray(table.column(name))
+        index._dates = np.asarray(table.column("Date")) if "Date" in table.columns else None
+        index._build(np.asarray(table.column("Store Number")))
+        return index
+
+    def _build(self, store_col):
+        # Rows are grouped by store, so block boundaries are where the value changes
+        starts = np.flatnonzero(np.r_[True, store_col[1:] != store_col[:-1]])
+        ends = np.append(starts[1:], len(store_col))
+        self.stores = store_col[starts]
+        self.offsets = {
+            int(store_col[start]): (int(start), int(end))
+            for start, end in zip(starts, ends)
+        }
+
+    def __contains__(self, store):
+        return store in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def bounds(self, store):
+        """Return the (start, end) row offsets of ``store``, or None if unknown."""
+        return self.offsets.get(store)
+
+    def frame(self, store):
+        """Return ``store``'s rows in date order; empty if the store is unknown."""
+        start, end = self.offsets.get(store, (0, 0))
+        return self._slice(start, end)
+
+    def latest_values(self, stores, columns, since=None):
+        """Last row of each store dated at or after ``since`` (NaT rows never count).
+
+        Returns ``(found, values)``: the stores that have such a row, in the
+        order given, and ``{column: array}`` with one entry per found store for
+        each of ``columns`` present in the table. No DataFrame is built.
+        """
+        since = None if since is None else np.datetime64(pd.Timestamp(since))
+        found, positions = [], []
+        for store in stores:
+            start, end = self.offsets.get(store, (0, 0))
+            dates = self._dates[start:end]
+            valid = ~np.isnat(dates)
+            if since is not None:
+                valid &= dates >= since
+            hits = np.flatnonzero(valid)
+            if len(hits):
+                found.append(store)
+                positions.append(start + hits[-1])
+        positions = np.asarray(positions, dtype=np.int64)
+        return found, {name: self._column(name)[positions] for name in columns if name in self.columns}
@@ -0,0 +1,232 @@
+"""Structured, sampled logging for the serving processes.
+
+``configure_logging`` (called from main.create_app) puts one QueueHandler on
+the root logger: the thread that logs only enqueues the record, and a
+listener thread formats it and writes it to stdout, so a slow terminal or
+log collector never holds up a request. Each line is one JSON object
+(LOG_FORMAT=text gives plain lines for development) with the request ID
+and route of the request that logged it. The queue holds LOG_QUEUE_SIZE
+records; when it is full, new records are dropped and counted rather than
+blocking.
+
+Flask binds every request with ``bind_request`` in before_request, and
+asgi.py does the same in its native routes. The ID is taken from an
+X-Request-ID header or generated, and is sent back in the response.
+LOG_SAMPLE_RATES keeps below-WARNING records for only a fraction of a
+route's requests, e.g. "/api/predict=0.01,/api/stores=0". Warnings and
+errors are always kept. Dumps that are expensive to build are guarded with
+``debug_enabled``, so they cost nothing unless DEBUG is on and the request
+is sampled.
+
+LOG_LEVEL sets the level (default INFO).
+"""
+import atexit
+import contextvars
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+
+from . import json_codec
+
+REQUEST_ID_HEADER = "X-Request-ID"
+MAX_REQUEST_ID = 128  # longer client-supplied IDs are truncated
+
+_request = contextvars.ContextVar("request_log", default=None)
+_sample_rates = {}
+_handler = None
+
+# Attributes every LogRecord has; anything else was passed with extra={...}
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id", "route"}
+
+
+class RequestLog:
+    __slots__ = ("request_id", "route", "sampled")
+
+    def __init__(self, request_id, route, sampled):
+        self.request_id = request_id
+        self.route = route
+        self.sampled = sampled
+
+
+def parse_sample_rates(spec):
+    """``"route=rate,..."`` as ``{route: rate}``."""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        route, _, rate = item.rpartition("=")
+        if not route or not 0 <= float(rate) <= 1:
+            raise ValueError(f"LOG_SAMPLE_RATES entries must look like /api/route=0.1, got {item!r}")
+        rates[route] = float(rate)
+    return rates
+
+
+def bind_request(route, request_id=None):
+    """Tag what this context logs with a request ID and ``route``; returns the ID."""
+    rate = _sample_rates.get(route, 1.0)
+    request_id = (request_id or "")[:MAX_REQUEST_ID] or uuid.uuid4().hex
+    _request.set(RequestLog(request_id, route, rate >= 1 or random.random() < rate))
+    return request_id
+
+
+def unbind_request():
+    _request.set(None)
+
+
+def current_request_id():
+    bound = _request.get()
+    return bound.request_id if bound is not None else None
+
+
+def debug_enabled(logger):
+    """True if a DEBUG record from ``logger`` would be written for the current request."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    bound = _request.get()
+    return bound is None or bound.sampled
+
+
+class RequestFilter(logging.Filter):
+    """Adds request_id/route to records and drops unsampled requests' records below WARNING."""
+
+    def filter(self, record):
+        bound = _request.get()
+        if bound is None:
+            record.request_id = record.route = None
+            return True
+        if not bound.sampled and record.levelno < logging.WARNING:
+            return False
+        record.request_id, record.route = bound.request_id, bound.route
+        return True
+
+
+def _json_default(obj):
+    # extra={...} values are logged whatever they are; NumPy as numbers, the rest as repr
+    try:
+        return json_codec.default(obj)
+    except TypeError:
+        return repr(obj)
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "request_id", None) is not None:
+            entry["request_id"], entry["route"] = record.request_id, record.route
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        try:
+            return json_codec.dumps(entry, default=_json_default).decode("utf-8")
+        except (TypeError, ValueError):
+            # orjson refuses lone surrogates (e.g. from a badly decoded request); the stdlib escapes them
+            return json_codec.dumps(entry, "stdlib", default=_json_default).decode("utf-8")
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record):
+        record.request_id = getattr(record, "request_id", None) or "-"
+        return super().format(record)
+
+
+class StdoutHandler(logging.StreamHandler):
+    """Writes to whatever sys.stdout is at the time, so redirect_stdout still applies."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class AsyncHandler(QueueHandler):
+    """QueueHandler that never blocks and restarts its listener in forked workers."""
+
+    def __init__(self, target, maxsize):
+        super().__init__(queue.Queue(maxsize))
+        self.target = target
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._listener = None
+        self._listener_pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_listener(self):
+        # Started lazily, and again in a forked worker, where the parent's thread doesn't exist
+        if self._listener_pid == os.getpid():
+            return
+        with self._lock:
+            if self._listener_pid != os.getpid():
+                self.queue = queue.Queue(self.maxsize)  # records queued before the fork belong to the parent
+                self._listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+                self._listener.start()
+                self._listener_pid = os.getpid()
+
+    def prepare(self, record):
+        # Only the message is rendered here, since its arguments may change after
+        # the call returns; JSON formatting happens on the listener thread
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def emit(self, record):
+        self._ensure_listener()
+        super().emit(record)
+
+    def close(self):
+        # Drains what is queued; only the process that started the listener can stop it
+        if self._listener is not None and self._listener_pid == os.getpid():
+            self._listener.stop()
+            self._listener_pid = None
+        super().close()
+
+
+def configure_logging():
+    """Route all logging through the queue handler; safe to call more than once."""
+    global _handler, _sample_rates
+    _sample_rates = parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES", ""))
+    root = logging.getLogger()
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    # httpx logs every LLM call at INFO; keep those lines for DEBUG
+    logging.getLogger("httpx").setLevel(logging.NOTSET if root.level <= logging.DEBUG else logging.WARNING)
+    if _handler is not None:
+        return _handler
+
+    target = StdoutHandler()
+    target.setFormatter(TextFormatter() if os.environ.get("LOG_FORMAT", "json") == "text" else JSONFormatter())
+    _handler = AsyncHandler(target, int(os.environ.get("LOG_QUEUE_SIZE", 10000)))
+    _handler.addFilter(RequestFilter())
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    atexit.register(_handler.close)
+    return _handler
+
+
+def stats():
+    return {
+        "level": logging.getLevelName(logging.getLogger().level),
+        "sample_rates": dict(_sample_rates),
+        "queued": _handler.queue.qsize() if _handler is not None else 0,
+        "dropped": _handler.dropped if _handler is not None else 0,
+    }
@@ -0,0 +1,47 @@
+"""gunicorn settings for wsgi.py, overridable through the environment.
+
+WEB_BIND         address to listen on (default 0.0.0.0:8000)
+WEB_WORKERS      worker processes (default: CPU count)
+WEB_WORKER_CLASS "sync" (one request at a time per worker) or "gthread"
+                 (WEB_THREADS requests per worker, which lets live forecasts
+                 share model calls through the micro-batcher); default sync
+WEB_THREADS      threads per gthread worker (default 4)
+WEB_TIMEOUT      seconds before a stuck worker is restarted (default 60)
+WEB_PRELOAD      0 loads the app in every worker instead of once in the master
+WEB_GC_FREEZE    0 skips gc.freeze() of the preloaded heap (see wsgi.py)
+"""
+import gc
+import os
+
+bind = os.environ.get("WEB_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_WORKERS", os.cpu_count() or 1))
+worker_class = os.environ.get("WEB_WORKER_CLASS", "sync")
+threads = int(os.environ.get("WEB_THREADS", 4)) if worker_class == "gthread" else 1
+timeout = int(os.environ.get("WEB_TIMEOUT", 60))
+preload_app = os.environ.get("WEB_PRELOAD", "1") != "0"
+
+if worker_class not in ("sync", "gthread"):
+    raise ValueError(f"WEB_WORKER_CLASS must be sync or gthread, not {worker_class!r}")
+
+
+def when_ready(server):
+    # The preloaded snapshot's files were leased by this master, which never
+    # serves or reloads; workers lease what they inherit (post_fork) instead,
+    # so the files can be cleaned up once every worker has moved on
+    if preload_app:
+        from core import store_dirs
+        store_dirs.release_held()
+
+
+def post_fork(server, worker):
+    from core import store_dirs
+    store_dirs.adopt_inherited()
+
+
+def post_worker_init(worker):
+    # wsgi.py froze the preloaded heap; objects this worker allocates are collected as usual
+    gc.enable()
+    from main import start_background_tasks
+    from wsgi import app
+    start_background_tasks(app)
+    worker.log.info("Worker %s ready (%s, %d thread(s), preload=%s)", worker.pid, worker_class, threads, preload_app)
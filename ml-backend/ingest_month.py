@@ -0,0 +1,29 @@
+"""Append one month of raw per-store sales to features.csv.
+
+Usage:
+    python ingest_month.py raw_sales_2025_01.csv [--features features.csv]
+
+The raw CSV needs one row per store with Store Number, Date and Total_Sales
+(a number; 0 for a store without sales that month), plus any pass-through
+columns features.csv has (category *_Sales, prices...).
+Lag and rolling columns are derived from the saved per-store state.
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from core.ingest import ingest_month
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("raw", help="CSV of raw per-store sales for the new month")
+    parser.add_argument("--features", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "features.csv"))
+    args = parser.parse_args()
+
+    ingest_month(args.features, pd.read_csv(args.raw))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Flask JSON provider backed by core.json_codec.
+
+Installed by main.create_app, so ``jsonify``, ``request.get_json`` and
+returning a dict from a route all go through the JSON_ENCODER encoder
+(orjson by default) and accept NumPy scalars and arrays as they are.
+"""
+from flask.json.provider import DefaultJSONProvider
+
+from core import json_codec
+
+
+class CodecJSONProvider(DefaultJSONProvider):
+    def __init__(self, app, encoder=None):
+        super().__init__(app)
+        self.encoder = json_codec.resolve_encoder(encoder)
+
+    def _default(self, obj):
+        # NumPy first, then Flask's own fallbacks (dates, decimals, dataclasses, ...)
+        try:
+            return json_codec.default(obj)
+        except TypeError:
+            return DefaultJSONProvider.default(obj)
+
+    def dumps(self, obj, **kwargs):
+        return json_codec.dumps(obj, self.encoder, default=self._default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return json_codec.loads(s, self.encoder)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Pretty-printed under the debug server, like Flask's default provider
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = json_codec.dumps(obj, self.encoder, indent=indent, default=self._default)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -1,51 +1,176 @@
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify, request
 from flask_cors import CORS
-import pandas as pd
+import logging
 import os
-import pickle
 from routes import register_routes
+from core import EncodedPayload, ForecastEngine, MicroBatcher, ResultCache, SnapshotHolder, open_forecast_table
+from core import json_codec
+from core.forecast_table import TABLE_MONTHS
+from core.schema import MODEL_FEATURES
+from core.structured_log import REQUEST_ID_HEADER, bind_request, configure_logging, unbind_request
 from dotenv import load_dotenv
+from json_provider import CodecJSONProvider
 
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app, resources={r"/*": {"origins": ["http://localhost:3000"]}}, supports_credentials=True)
-
 # === Load Core Data ===
 base_path = os.path.dirname(__file__)
 df_path = os.path.join(base_path, "features.csv")
 model_path = os.path.join(base_path, "model.pkl")
 
-df = pd.read_csv(df_path)
-with open(model_path, "rb") as f:
-    model = pickle.load(f)
-
-model_features = [
-    'Lag_1', 'Lag_2', 'Lag_3', 'Rolling_3', 'Rolling_6', 'Rolling_12',
-    'Rolling_Trend', 'Month', 'Quarter', 'IsYearStart', 'IsYearEnd',
-    'AvgPricePerBottle', 'MarginRatio', 'UniqueProductsSold',
-    'Bottles Sold', 'IsHolidayMonth'
-]
-
-category_features = [
-    col for col in df.columns if col.endswith("_Sales") and col != "Total_Sales"
-]
-
-shared_context = {
-    "df": df,
-    "model": model,
-    "model_features": model_features,
-    "category_features": category_features,
-}
-
-# ✅ All routes now included here
-register_routes(app, shared_context)
-for rule in app.url_map.iter_rules():
-    print(f"🔗 Registered route: {rule} --> methods: {rule.methods}")
-
-@app.route("/")
-def home():
-    return jsonify({"message": "🟢 ML Forecast API is modular and running!"})
+log = logging.getLogger(__name__)
+
+
+def create_app():
+    """Build the Flask app and load the dataset, model and forecast table.
+
+    Everything loaded here is reachable from ``app.extensions["forecast"]``.
+    wsgi.py calls this once in the gunicorn master so workers share it; the
+    development server below calls it directly. Threads don't survive a
+    fork: long-running ones (the reload watcher) are left to
+    start_background_tasks, and the worker threads that loading may already
+    start in the master (the micro-batcher's dispatcher, the direct-horizon
+    pool, the log writer) are recreated on first use in each worker.
+    """
+    # JSON log lines through a background writer; LOG_LEVEL, LOG_FORMAT and
+    # LOG_SAMPLE_RATES are described in core/structured_log.py
+    configure_logging()
+
+    app = Flask(__name__)
+    # Responses are encoded with orjson (JSON_ENCODER=stdlib to opt out);
+    # NumPy values from the forecast helpers serialize as they are
+    app.json = CodecJSONProvider(app)
+    if json_codec.orjson is None:
+        log.warning("⚠️ orjson is not installed, encoding responses with the stdlib (pip install -r requirements.txt)")
+    CORS(
+        app,
+        resources={r"/*": {"origins": ["http://localhost:3000"]}},
+        supports_credentials=True,
+        expose_headers=["X-Data-Version", REQUEST_ID_HEADER],
+    )
+
+    model_features = MODEL_FEATURES
+    # Concurrent live forecasts share model calls through a micro-batcher, which
+    # waits up to MICRO_BATCH_MAX_MS for other requests' rows and caps a call at
+    # MICRO_BATCH_MAX_ROWS rows; MICRO_BATCH_MAX_MS=0 turns it off
+    batch_ms = float(os.environ.get("MICRO_BATCH_MAX_MS", 2))
+    batcher = MicroBatcher(
+        max_latency_ms=batch_ms, max_rows=int(os.environ.get("MICRO_BATCH_MAX_ROWS", 256))
+    ) if batch_ms > 0 else None
+    # Recursive forecasts roll lags, rolling stats and calendar columns forward each
+    # step; FORECAST_ROLLING_STATE=0 restores the old frozen-features recursion.
+    # INFERENCE_BACKEND picks how the model runs (native | compiled | model, see
+    # core/inference.py) and INFERENCE_THREADS pins XGBoost's thread count
+    forecast_engine = ForecastEngine(
+        model_features, rolling_state=os.environ.get("FORECAST_ROLLING_STATE", "1") != "0", batcher=batcher
+    )
+
+    def attach_forecast_table(snapshot):
+        # Every store's /api/predict body is precomputed per snapshot version;
+        # PRECOMPUTE_FORECASTS=0 serves everything live instead, and longer
+        # horizons than FORECAST_TABLE_MONTHS always fall back to live compute
+        if os.environ.get("PRECOMPUTE_FORECASTS", "1") == "0":
+            return
+        try:
+            snapshot.forecast_table = open_forecast_table(
+                df_path, snapshot, forecast_engine,
+                months=int(os.environ.get("FORECAST_TABLE_MONTHS", TABLE_MONTHS)),
+            )
+        except Exception as e:
+            log.warning("⚠️ Forecast table unavailable, serving live forecasts: %s", e)
+
+    # The /api/stores list only depends on the dataset, so its encoded body is
+    # built once per dataset version and reused across model-only reloads
+    store_lists = {}
+
+    def attach_store_list(snapshot):
+        payload = store_lists.get(snapshot.dataset_version)
+        if payload is None:
+            records = snapshot.store_directory.to_dict(orient="records")
+            payload = EncodedPayload(app.json.response({"stores": records}).get_data())
+            store_lists.clear()
+            store_lists[snapshot.dataset_version] = payload
+            log.info("✅ Encoded %d store records: %s bytes", len(records), payload.sizes())
+        snapshot.store_list = payload
+
+    def prepare_snapshot(snapshot):
+        attach_store_list(snapshot)
+        attach_forecast_table(snapshot)
+
+    # Numeric columns are memory-mapped and shared by every worker on the box.
+    # The snapshot holder lets a refreshed features.csv / model.pkl be swapped in
+    # without restarting: POST /api/admin/reload, or set RELOAD_POLL_SECONDS.
+    snapshots = SnapshotHolder(df_path, model_path, prepare=prepare_snapshot)
+
+    # Live forecasts the table doesn't cover are cached per worker;
+    # RESULT_CACHE_MB=0 turns the cache off
+    cache_mb = float(os.environ.get("RESULT_CACHE_MB", 64))
+    result_cache = ResultCache(
+        max_bytes=int(cache_mb * 1024 * 1024),
+        ttl=float(os.environ.get("RESULT_CACHE_TTL_SECONDS", 3600)) or None,
+    ) if cache_mb > 0 else None
+
+    shared_context = {
+        "snapshots": snapshots,
+        "model_features": model_features,
+        "forecast_engine": forecast_engine,
+        "result_cache": result_cache,
+        "batcher": batcher,
+    }
+    app.extensions["forecast"] = shared_context
+
+    @app.before_request
+    def pin_snapshot():
+        # Every handler reads this one snapshot even if a reload lands mid-request
+        g.snapshot = snapshots.current()
+        # 🏷️ Log records carry this request's ID and route, which also picks its sampling rate
+        rule = request.url_rule.rule if request.url_rule is not None else request.path
+        g.request_id = bind_request(rule, request.headers.get(REQUEST_ID_HEADER))
+
+    @app.after_request
+    def add_version_header(response):
+        snapshot = g.get("snapshot") or snapshots.current()
+        response.headers["X-Data-Version"] = snapshot.version
+        if g.get("request_id"):
+            response.headers[REQUEST_ID_HEADER] = g.request_id
+        return response
+
+    @app.teardown_request
+    def release_request_log(error=None):
+        unbind_request()
+
+    # ✅ All routes now included here
+    register_routes(app, shared_context)
+    for rule in app.url_map.iter_rules():
+        log.debug("🔗 Registered route: %s --> methods: %s", rule, sorted(rule.methods))
+
+    @app.route("/")
+    def home():
+        return jsonify({"message": "🟢 ML Forecast API is modular and running!"})
+
+    return app
+
+
+def start_background_tasks(app):
+    """Start the per-process threads: the snapshot watcher.
+
+    With RELOAD_POLL_SECONDS it watches the source files; otherwise it only
+    watches for POST /api/admin/reload requests, every
+    RELOAD_REQUEST_POLL_SECONDS (default 2), so a reload received by one
+    worker reaches every worker.
+    """
+    snapshots = app.extensions["forecast"]["snapshots"]
+    sources = bool(os.environ.get("RELOAD_POLL_SECONDS"))
+    # A worker respawned by gunicorn forks from the master's first snapshot; catch up with the others
+    snapshots.reload_if_changed(sources=sources)
+    if sources:
+        snapshots.watch(float(os.environ["RELOAD_POLL_SECONDS"]))
+    else:
+        snapshots.watch(float(os.environ.get("RELOAD_REQUEST_POLL_SECONDS", 2)), sources=False)
+
 
 if __name__ == "__main__":
+    # Development server; production runs wsgi.py under gunicorn
+    app = create_app()
+    start_background_tasks(app)
     app.run(debug=True, host="0.0.0.0", port=8000)
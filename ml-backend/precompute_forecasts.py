@@ -0,0 +1,37 @@
+"""Build the precomputed /api/predict table ahead of deployment.
+
+The server builds the table for a new features.csv / model.pkl on its own at
+startup or reload; running this first means no worker pays for it.
+
+Usage:
+    python precompute_forecasts.py
+    FORECAST_TABLE_MONTHS=24 python precompute_forecasts.py --features /data/features.csv
+"""
+import argparse
+import os
+
+from core import ForecastEngine, open_forecast_table
+from core.forecast_table import TABLE_MONTHS
+from core.schema import MODEL_FEATURES
+from core.snapshot import load_snapshot
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--months", type=int, default=int(os.environ.get("FORECAST_TABLE_MONTHS", TABLE_MONTHS)),
+                        help="longest horizon to store (match the server's FORECAST_TABLE_MONTHS)")
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    args = parser.parse_args()
+
+    snapshot = load_snapshot(args.features, args.model)
+    # Same recursion mode as the server, so it finds this table
+    engine = ForecastEngine(MODEL_FEATURES, rolling_state=os.environ.get("FORECAST_ROLLING_STATE", "1") != "0")
+    table = open_forecast_table(args.features, snapshot, engine, months=args.months)
+    print(f"✅ Forecast table for {snapshot.version}: {len(table)} stores, horizons 1-{table.months} ({table.table_dir})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 # routes/__init__.py
 from .predict import register_predict_route
+from .predict_batch import register_predict_batch_route
 from .explain_forecast import register_explain_route
+from .compare_store import register_compare_route
 from .get_stores import register_get_stores_route
+from .admin import register_admin_routes
 
 def register_routes(app, context):
     register_predict_route(app, context)
+    register_predict_batch_route(app, context)
     register_explain_route(app, context)
+    register_compare_route(app, context)
     register_get_stores_route(app, context)
+    register_admin_routes(app, context)
@@ -0,0 +1,58 @@
+from flask import request, jsonify
+import hmac
+import logging
+import os
+
+from core import structured_log
+
+log = logging.getLogger(__name__)
+
+
+def register_admin_routes(app, context):
+    snapshots = context["snapshots"]
+    result_cache = context.get("result_cache")
+    batcher = context.get("batcher")
+
+    def authorized():
+        # Admin routes stay closed unless ADMIN_TOKEN is configured
+        token = os.environ.get("ADMIN_TOKEN")
+        supplied = request.headers.get("X-Admin-Token", "")
+        return bool(token) and hmac.compare_digest(supplied, token)
+
+    @app.route("/api/admin/reload", methods=["POST"])
+    def reload_snapshot():
+        if not authorized():
+            return jsonify({"error": "Forbidden"}), 403
+
+        # 📣 Reloads this worker and signals the others through the reload request file
+        started = snapshots.request_reload()
+        log.info("🔄 Reload requested, started=%s", started)
+        return jsonify({"started": started, **snapshots.status()}), 202 if started else 409
+
+    @app.route("/api/admin/version", methods=["GET"])
+    def snapshot_version():
+        if not authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        return jsonify(snapshots.status())
+
+    @app.route("/api/admin/cache", methods=["GET"])
+    def cache_stats():
+        if not authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        if result_cache is None:
+            return jsonify({"enabled": False})
+        return jsonify({"enabled": True, **result_cache.stats()})
+
+    @app.route("/api/admin/batching", methods=["GET"])
+    def batching_stats():
+        if not authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        if batcher is None:
+            return jsonify({"enabled": False})
+        return jsonify({"enabled": True, **batcher.stats()})
+
+    @app.route("/api/admin/logging", methods=["GET"])
+    def logging_stats():
+        if not authorized():
+            return jsonify({"error": "Forbidden"}), 403
+        return jsonify(structured_log.stats())
@@ -1,14 +1,16 @@
-from flask import request, jsonify
-import os
-import requests
+from flask import g, request, jsonify
 from flask_cors import cross_origin
+import logging
+
+from core.llm import LLMError, chat_completion, compare_payload
+
+log = logging.getLogger(__name__)
 
 def register_compare_route(app, context):
-    print("📦 register_compare_route() is executing...")
+    log.debug("📦 register_compare_route() is executing...")
 
-    df = context.get("df")
-    if df is None:
-        raise ValueError("❌ DataFrame not found in context!")
+    if context.get("snapshots") is None:
+        raise ValueError("❌ Snapshot holder not found in context!")
 
     @app.route("/api/compare_store", methods=["POST", "OPTIONS"])
     @cross_origin()
@@ -18,66 +20,33 @@ def register_compare_route(app, context):
 
         try:
             data = request.get_json()
-            print("📥 Incoming /compare_store data:", data)
+            log.debug("📥 Incoming /compare_store data: %s", data)
 
             store_number = data.get("store")
             forecast_avg = data.get("forecast_avg")
 
             if not store_number or forecast_avg is None:
                 msg = f"⚠️ Missing required inputs: store={store_number}, forecast_avg={forecast_avg}"
-                print(msg)
+                log.info(msg)
                 return jsonify({"error": msg}), 400
 
             # Calculate regional average sales
-            all_stores_avg = df.groupby("Store Number")["Total_Sales"].sum().mean()
-            print(f"🧮 Store #{store_number} vs Region Avg: {forecast_avg} vs {all_stores_avg:.2f}")
+            all_stores_avg = g.snapshot.monthly_sales.regional_average()
+            log.debug("🧮 Store #%s vs Region Avg: %s vs %.2f", store_number, forecast_avg, all_stores_avg)
 
             # Create natural language prompt
-            prompt = f"""
-Compare this store's forecasted average monthly liquor sales to the average across all stores.
-
-Store ID: {store_number}
-Forecasted Monthly Average: ${forecast_avg:,.2f}
-Region-Wide Monthly Average: ${all_stores_avg:,.2f}
-
-Explain how this store is performing relative to others.
-""".strip()
-
-            # Prepare AI request
-            payload = {
-                "model": "llama3-8b-8192",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a helpful retail analyst who compares store performance in plain language."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.6,
-                "max_tokens": 200
-            }
-
-            headers = {
-                "Authorization": f"Bearer {os.environ.get('GROQ_API_KEY')}",
-                "Content-Type": "application/json"
-            }
-
-            print("🚀 Sending prompt to Groq AI API...")
-            response = requests.post("https://api.groq.com/openai/v1/chat/completions", headers=headers, json=payload)
-            print(f"🔁 Groq response status: {response.status_code}")
-
-            if response.status_code != 200:
-                print("❌ Error from Groq API:", response.text)
-                return jsonify({"error": response.text}), 500
+            payload = compare_payload(store_number, forecast_avg, all_stores_avg)
 
-            ai_output = response.json()["choices"][0]["message"]["content"]
-            print("✅ Groq AI Summary:", ai_output.strip())
+            # ⏳ Blocks this worker until the LLM answers; asgi.py serves this route without blocking
+            log.debug("🚀 Sending prompt to Groq AI API...")
+            ai_output = chat_completion(payload)
+            log.debug("✅ Groq AI Summary: %s", ai_output)
 
-            return jsonify({"summary": ai_output.strip()})
+            return jsonify({"summary": ai_output})
 
+        except LLMError as e:
+            log.error("❌ Error from Groq API: %s", e.text)
+            return jsonify({"error": e.text}), 500
         except Exception as e:
-            print("🔥 Exception in /api/compare_store:", str(e))
+            log.exception("🔥 Exception in /api/compare_store: %s", e)
             return jsonify({"error": str(e)}), 500
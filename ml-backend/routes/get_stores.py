@@ -1,40 +1,38 @@
-from flask import jsonify
-import pandas as pd  # ✅ Ensure this is imported
+from flask import Response, g, jsonify, request
+import logging
+import os
+
+log = logging.getLogger(__name__)
 
 def register_get_stores_route(app, context):
-    df = context["df"]
+    # Browsers may reuse the list for STORES_MAX_AGE seconds, then revalidate
+    # with If-None-Match and get a 304 unless the dataset changed
+    max_age = int(os.environ.get("STORES_MAX_AGE", 60))
 
     @app.route("/api/stores", methods=["GET"])
     def get_stores():
         try:
-            if df is None:
-                print("❌ DataFrame is None")
+            # ✅ Serialized and compressed once per dataset version (see main.attach_store_list)
+            payload = g.snapshot.store_list
+            if payload is None:
+                log.error("❌ Store list not prepared")
                 return jsonify({"error": "features.csv not loaded"}), 500
 
-            required_columns = ["Store Number", "City", "County", "Date"]
-            missing_columns = [col for col in required_columns if col not in df.columns]
-
-            if missing_columns:
-                print(f"❌ Missing required columns: {missing_columns}")
-                return jsonify({"error": f"Missing columns: {missing_columns}"}), 500
-
-            # ✅ Ensure Date is datetime
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-
-            # ✅ Filter to only include stores with data from 2020+
-            recent_data = df[df["Date"].dt.year >= 2020]
-
-            store_info = (
-                recent_data[["Store Number", "City", "County"]]
-                .dropna()
-                .drop_duplicates()
-                .sort_values("Store Number")
-                .to_dict(orient="records")
-            )
-
-            print(f"✅ Extracted {len(store_info)} unique store records (2020+).")
-            return jsonify({"stores": store_info})
+            encoding = payload.encoding_for(request.accept_encodings)
+            etag = payload.etag(encoding)
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = Response(payload.bodies[encoding], mimetype=payload.mimetype)
+                if encoding != "identity":
+                    response.headers["Content-Encoding"] = encoding
+
+            response.set_etag(etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+            response.vary.add("Accept-Encoding")
+            return response
 
         except Exception as e:
-            print(f"❌ Exception in /api/stores: {e}")
+            log.exception("❌ Exception in /api/stores: %s", e)
             return jsonify({"error": "Internal server error"}), 500
@@ -0,0 +1,100 @@
+from flask import Response, g, request, jsonify
+import logging
+
+from core.forecast_engine import MAX_MONTHS, RECENT_START, actual_timeline, forecast_timeline, strategy_error
+from core.intervals import DEFAULT_PATHS, DEFAULT_QUANTILES, interval_error, intervals_requested
+from core.json_codec import dumps
+
+# Above this many stores the JSON body is streamed a store at a time instead of built whole;
+# clients that send Accept: application/x-ndjson get one line per store at any size
+STREAM_THRESHOLD = 50
+
+log = logging.getLogger(__name__)
+
+
+def register_predict_batch_route(app, context):
+    forecast_engine = context["forecast_engine"]
+
+    def store_entry(snapshot, batch, forecasts, row, intervals):
+        store = batch.stores[row]
+        month_starts, month_totals = snapshot.monthly_sales.store_series(store, since=RECENT_START)
+        timeline = actual_timeline(month_starts, month_totals)
+        timeline.extend(forecast_timeline(batch, forecasts, row, intervals))
+        return {"store": store, "timeline": timeline}
+
+    @app.route("/api/predict/batch", methods=["POST"])
+    def predict_batch():
+        try:
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({"error": "Request body must be a JSON object"}), 400
+            months = int(data.get("months", 4))
+            if not 1 <= months <= MAX_MONTHS:
+                return jsonify({"error": f"'months' must be between 1 and {MAX_MONTHS}"}), 400
+
+            strategy = data.get("strategy", "recursive")
+            paths = int(data.get("paths", DEFAULT_PATHS))
+            quantiles = tuple(float(q) for q in data.get("quantiles", DEFAULT_QUANTILES))
+
+            # 📌 Snapshot pinned for this request; a streamed body keeps using it too
+            snapshot = g.snapshot
+
+            error = strategy_error(snapshot, strategy, months) or interval_error(paths, quantiles)
+            if error:
+                return jsonify({"error": error}), 400
+
+            # 🏪 Stores come from an explicit list or a County/City filter
+            if "stores" in data:
+                stores = data["stores"]
+                # A string would iterate as digits, and bools/floats would coerce silently
+                if not isinstance(stores, list) or not all(type(s) is int for s in stores):
+                    return jsonify({"error": "'stores' must be a list of store numbers"}), 400
+                stores = list(dict.fromkeys(stores))
+            elif data.get("county") or data.get("city"):
+                stores = snapshot.stores_where(county=data.get("county"), city=data.get("city"))
+            else:
+                return jsonify({"error": "Provide 'stores' or a 'county'/'city' filter"}), 400
+
+            if not stores:
+                return jsonify({"error": "No stores matched the request"}), 404
+
+            # 🔮 One predict call per horizon (step) for the whole batch
+            batch, forecasts = forecast_engine.forecast(snapshot, stores, months, strategy)
+            # 🎲 Simulated lower/upper only when asked for: each store costs `paths` recursions
+            intervals = None
+            if intervals_requested(data):
+                intervals = forecast_engine.intervals(snapshot, batch, months, strategy, paths, quantiles)
+            found = set(batch.stores)
+            missing = [store for store in stores if store not in found]
+            log.info("📦 Batch forecast: %d stores x %d months, %d without 2020+ data", len(batch), months, len(missing))
+
+            if "application/x-ndjson" in request.headers.get("Accept", ""):
+                def generate_lines():
+                    # One JSON object per line: each store, then a summary line
+                    for row in range(len(batch)):
+                        yield dumps(store_entry(snapshot, batch, forecasts, row, intervals)) + b"\n"
+                    yield dumps({"missing": missing, "count": len(batch)}) + b"\n"
+
+                return Response(generate_lines(), mimetype="application/x-ndjson")
+
+            if len(batch) <= STREAM_THRESHOLD:
+                return jsonify({
+                    "forecasts": [store_entry(snapshot, batch, forecasts, row, intervals) for row in range(len(batch))],
+                    "missing": missing,
+                })
+
+            def generate_document():
+                # The same {"forecasts": [...], "missing": [...]} body, sent a store at a time
+                yield b'{"forecasts":['
+                for row in range(len(batch)):
+                    yield (b"," if row else b"") + dumps(store_entry(snapshot, batch, forecasts, row, intervals))
+                yield b'],"missing":' + dumps(missing) + b"}\n"
+
+            return Response(generate_document(), mimetype="application/json")
+
+        except (TypeError, ValueError) as e:
+            log.warning("⚠️ Bad /api/predict/batch request: %s", e)
+            return jsonify({"error": "'stores' must be store numbers, 'months'/'paths' integers and 'quantiles' numbers"}), 400
+        except Exception as e:
+            log.exception("❌ Exception in /api/predict/batch: %s", e)
+            return jsonify({"error": "Internal server error"}), 500
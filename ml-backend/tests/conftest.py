@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The backend runs from ml-backend/, with core and routes as top-level packages
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
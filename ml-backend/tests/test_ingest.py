@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.feature_state import DERIVED_COLUMNS, StoreFeatureState
+from core.ingest import derive_rows
+
+COLUMNS = ["Store Number", "City", "Date", "Total_Sales", *DERIVED_COLUMNS]
+
+
+def seeded_state():
+    state = StoreFeatureState.from_series(np.arange(1.0, 13.0) * 100, 2024 * 12 + 11)
+    state.carry = {"City": "AMES"}
+    return state
+
+
+def raw_month(sales):
+    return pd.DataFrame({
+        "Store Number": [2001, 2002],
+        "Date": ["2025-01-15", "2025-01-20"],
+        "Total_Sales": sales,
+    })
+
+
+@pytest.mark.parametrize("bad", [np.nan, None, np.inf, "n/a"])
+def test_non_finite_sales_are_rejected_before_any_state_changes(bad):
+    states = {2001: seeded_state(), 2002: seeded_state()}
+    before = {store: (state.total, state.total_sq, state.count, state.history.copy()) for store, state in states.items()}
+
+    with pytest.raises(ValueError, match=r"non-finite Total_Sales for stores: \[2002\]"):
+        derive_rows(raw_month([1500.0, bad]), states, COLUMNS)
+
+    for store, state in states.items():
+        total, total_sq, count, history = before[store]
+        assert (state.total, state.total_sq, state.count) == (total, total_sq, count)
+        assert np.array_equal(state.history, history)
+
+
+def test_finite_month_keeps_expanding_stats_finite():
+    states = {2001: seeded_state(), 2002: seeded_state()}
+    rows = derive_rows(raw_month([1500.0, 0.0]), states, COLUMNS)
+
+    assert len(rows) == 2
+    for state in states.values():
+        assert math.isfinite(state.total) and math.isfinite(state.total_sq)
+        assert np.isfinite(state.history).all()
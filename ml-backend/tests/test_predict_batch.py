@@ -0,0 +1,31 @@
+import pytest
+from flask import Flask, g
+
+from routes.predict_batch import register_predict_batch_route
+
+
+@pytest.fixture
+def client():
+    # Bodies rejected before forecasting never touch the snapshot or the engine
+    app = Flask(__name__)
+
+    @app.before_request
+    def pin_snapshot():
+        g.snapshot = None
+
+    register_predict_batch_route(app, {"forecast_engine": None})
+    return app.test_client()
+
+
+@pytest.mark.parametrize("body", [[2633, 2634], 5, "2633"])
+def test_non_object_body_is_rejected(client, body):
+    resp = client.post("/api/predict/batch", json=body)
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "Request body must be a JSON object"}
+
+
+@pytest.mark.parametrize("stores", ["2633", 2633, [2633, "2634"], [2633.0], [True]])
+def test_stores_must_be_a_list_of_ints(client, stores):
+    resp = client.post("/api/predict/batch", json={"stores": stores})
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "'stores' must be a list of store numbers"}
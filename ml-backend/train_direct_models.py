@@ -0,0 +1,60 @@
+"""Train the direct multi-horizon models used by "strategy": "direct".
+
+Fits one model per horizon (1..--horizons months ahead) on the MODEL_FEATURES
+columns of features.csv, reusing model.pkl's hyperparameters, and writes
+direct_models.pkl next to model.pkl. A running server picks the file up on
+its next reload (POST /api/admin/reload, or the RELOAD_POLL_SECONDS watcher).
+
+Usage:
+    python train_direct_models.py
+    python train_direct_models.py --horizons 6 --until 2024-01-01
+"""
+import argparse
+import os
+import pickle
+import time
+
+import pandas as pd
+
+from core import load_features
+from core.direct_forecast import DIRECT_HORIZONS, train_direct_models
+from core.schema import MODEL_FEATURES
+from core.snapshot import direct_models_path
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def recursive_model_params(model_path):
+    """Hyperparameters of the recursive model, so both strategies are tuned alike."""
+    if not os.path.exists(model_path):
+        return {}
+    with open(model_path, "rb") as f:
+        model = pickle.load(f)
+    return model.get_params() if hasattr(model, "get_params") else {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--horizons", type=int, default=DIRECT_HORIZONS)
+    parser.add_argument("--features", default=os.path.join(BACKEND_DIR, "features.csv"))
+    parser.add_argument("--model", default=os.path.join(BACKEND_DIR, "model.pkl"))
+    parser.add_argument("--until", help="only train on rows dated before this date (for backtests)")
+    parser.add_argument("--out", help="output path (default: direct_models.pkl next to --model)")
+    args = parser.parse_args()
+
+    df = load_features(args.features)
+    if args.until:
+        df = df[df["Date"] < pd.Timestamp(args.until)]
+
+    t0 = time.perf_counter()
+    direct_models = train_direct_models(df, MODEL_FEATURES, args.horizons, recursive_model_params(args.model))
+
+    out = args.out or direct_models_path(args.model)
+    tmp_path = f"{out}.{os.getpid()}.tmp"
+    direct_models.save(tmp_path)
+    os.replace(tmp_path, out)
+    print(f"✅ Trained {args.horizons} direct models on {len(df):,} rows in {time.perf_counter() - t0:.1f}s -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Production entry point: ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+The app is built once, in the gunicorn master (gunicorn.conf.py preloads
+this module), so the dataset, model and forecast table are loaded before the
+workers fork and shared with them copy-on-write instead of loaded once per
+worker.
+
+Pages stay shared only while nothing writes to them. CPython's cyclic GC
+writes into the header of every object it scans, so a collection in a worker
+would copy every page holding the loaded objects. Following the gc.freeze
+recipe, the master collects nothing while loading (no freed holes scattered
+through the heap), then moves every object it built into the permanent
+generation right before the fork; workers re-enable the GC in
+post_worker_init and only ever scan what they allocate themselves.
+Reference counts are still written when an object is used, but that touches
+only the objects a request reads, not the whole heap. WEB_GC_FREEZE=0 skips
+the freeze (for comparison).
+
+Loading in the master also runs validate_snapshot, which predicts with the
+model and direct models and logs, and so can start their helper threads.
+None of those threads exist in a worker after the fork. Each helper records
+the pid that created its threads and builds them again when it is first
+used in another process, so nothing started here is relied on in a worker.
+"""
+import gc
+import os
+
+gc.disable()
+
+from main import create_app  # noqa: E402
+
+app = create_app()
+
+if os.environ.get("WEB_GC_FREEZE", "1") != "0":
+    gc.freeze()